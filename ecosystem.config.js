@@ -2,7 +2,8 @@ module.exports = {
   apps: [
     {
       name: 'menu-api',
-      script: './menu_crawler/src/api_server.js',
+      script: './menu_crawler/src/api_server.py',
+      interpreter: 'python3',
       instances: 1,
       autorestart: true,
       watch: false,
@@ -11,6 +12,16 @@ module.exports = {
         NODE_ENV: 'production',
       },
     },
+    {
+      name: 'menu-scheduler',
+      script: './menu_crawler/src/scheduler.py',
+      interpreter: 'python3',
+      cwd: './menu_crawler/src',
+      instances: 1,
+      autorestart: true,
+      watch: false,
+      max_memory_restart: '512M',
+    },
     {
       name: 'menu-frontend',
       script: 'npm',
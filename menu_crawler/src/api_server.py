@@ -0,0 +1,390 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+from dotenv import load_dotenv
+from pathlib import Path
+from db_manager import MenuDatabase
+from day_menu import week_dates, DEFAULT_LANGUAGE
+from dish_tags import parse_tags
+from metrics import METRICS
+from snapshots import render_day
+
+# Load environment variables
+env_path = Path(__file__).parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+# 캐시에 보관할 (날짜, 언어) 응답 수
+DEFAULT_CACHE_SIZE = 512
+
+# 요청을 처리할 워커 스레드 수 (스레드별 DB 연결이 재사용되도록 고정 풀 사용)
+DEFAULT_WORKERS = 8
+
+DAY_MENU_PATH = re.compile(r'^/api/menu/(?P<date>[0-9-]+)/?$')
+WEEK_MENU_PATH = re.compile(r'^/api/menu/week/(?P<date>[0-9-]+)/?$')
+METRICS_PATH = '/metrics'
+SEARCH_PATH = '/api/search'
+
+# 검색 결과 최대 개수
+SEARCH_LIMIT = 50
+
+
+class CachedResponse:
+    """직렬화된 응답 본문과 검증용 헤더 값"""
+
+    __slots__ = ('version', 'body', 'etag', 'last_modified')
+
+    def __init__(self, version: Tuple, body: bytes, last_modified: float):
+        self.version = version
+        self.body = body
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self.last_modified = last_modified
+
+
+class MenuResponseCache:
+    """
+    (날짜, 언어, 사업장)별 응답을 보관하는 LRU 캐시
+    각 항목은 만들어질 때의 데이터베이스 버전을 기억하며,
+    크롤러나 번역 서비스가 데이터베이스를 바꾸면 버전이 달라져 자동으로 무효화됨
+    """
+
+    def __init__(self, db_path: str, max_size: int = DEFAULT_CACHE_SIZE):
+        self.db_path = db_path
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Tuple, CachedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def source_version(self) -> Tuple[Tuple[int, int], ...]:
+        """
+        데이터베이스 파일(WAL 포함)의 수정 시각과 크기
+        SQLite를 열지 않고도 다른 프로세스의 쓰기를 감지할 수 있음
+        """
+        version = []
+        for path in (self.db_path, self.db_path + '-wal'):
+            try:
+                stat = os.stat(path)
+                version.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                version.append((0, 0))
+        return tuple(version)
+
+    def last_modified(self, version: Tuple[Tuple[int, int], ...]) -> float:
+        """버전에 해당하는 마지막 수정 시각(초)"""
+        return max(mtime for mtime, _ in version) / 1e9
+
+    def get(self, key: Tuple, version: Tuple) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != version:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Tuple, entry: CachedResponse):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """모든 캐시 항목 삭제"""
+        with self._lock:
+            self._entries.clear()
+
+
+class MenuApiHandler(BaseHTTPRequestHandler):
+    """
+    /api/menu/{date}?lang=xx&site=yy, /api/menu/week/{start}?lang=xx&site=yy 요청 처리
+    exclude=pork,nuts / require=vegetarian으로 식단 조건에 맞는 코너만 받을 수 있음
+    /api/search?q=검색어&lang=xx는 메뉴 이름으로 메뉴가 나오는 날짜를 검색
+    /metrics는 프로세스의 계측 값을 Prometheus 텍스트 형식으로 반환
+    """
+
+    server_version = 'MenuApi/1.0'
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self._send_cors_headers()
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def do_GET(self):
+        with METRICS.span('api_request') as span:
+            self._status = None
+            span['route'] = self._handle_get()
+            span['status'] = self._status
+
+    def _handle_get(self) -> str:
+        """요청을 처리하고 계측용 경로 이름을 반환"""
+        parsed = urlparse(self.path)
+        if parsed.path == METRICS_PATH:
+            self._send_metrics()
+            return 'metrics'
+
+        params = parse_qs(parsed.query)
+        lang = params.get('lang', [DEFAULT_LANGUAGE])[0]
+        if parsed.path.rstrip('/') == SEARCH_PATH:
+            self._send_search(params, lang)
+            return 'search'
+        # 사업장을 지정하지 않으면 모든 사업장의 메뉴
+        site = params.get('site', [None])[0]
+        # 식단 조건: exclude=pork,nuts (하나라도 있으면 제외), require=vegetarian (모두 있어야 포함)
+        try:
+            exclude = parse_tags(params.get('exclude', [None])[0])
+            require = parse_tags(params.get('require', [None])[0])
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return 'invalid_filter'
+
+        week_match = WEEK_MENU_PATH.match(parsed.path)
+        match = week_match or DAY_MENU_PATH.match(parsed.path)
+        route = 'week' if week_match else 'day'
+        if not match:
+            self._send_json(404, {'error': 'Not found'})
+            return 'not_found'
+
+        date = match.group('date')
+        if not re.fullmatch(r'\d{8}', date.replace('-', '')):
+            self._send_json(400, {'error': 'Invalid date'})
+            return route
+
+        try:
+            if week_match:
+                entry = self.server.get_week_menu(date, lang, site, exclude, require)
+            else:
+                entry = self.server.get_day_menu(date, lang, site, exclude, require)
+        except ValueError:
+            self._send_json(400, {'error': 'Invalid date'})
+            return route
+        except Exception as e:
+            print(f"Error fetching menu: {str(e)}")
+            self._send_json(500, {'error': 'Internal server error'})
+            return route
+
+        self._send_cached(entry)
+        return route
+
+    def _send_search(self, params: Dict[str, list], lang: str):
+        """/api/search?q=검색어&lang=en&from=YYYYMMDD&to=YYYYMMDD"""
+        query = params.get('q', [''])[0]
+        dates = [params.get(name, [None])[0] for name in ('from', 'to')]
+        dates = [date.replace('-', '') if date else None for date in dates]
+        if not query.strip() or any(date and not re.fullmatch(r'\d{8}', date) for date in dates):
+            self._send_json(400, {'error': 'Invalid search'})
+            return
+        date_range = (dates[0] or '', dates[1] or '99999999') if any(dates) else None
+        try:
+            results = self.server.db.search(query, None if lang == DEFAULT_LANGUAGE else lang,
+                                            date_range, limit=SEARCH_LIMIT)
+        except Exception as e:
+            print(f"Error searching menus: {str(e)}")
+            self._send_json(500, {'error': 'Internal server error'})
+            return
+        self._send_json(200, {'query': query, 'results': results})
+
+    def _send_metrics(self):
+        body = METRICS.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_cached(self, entry: CachedResponse):
+        """ETag/Last-Modified를 확인해 304 또는 본문 전송"""
+        if self._is_not_modified(entry):
+            self.send_response(304)
+            self._send_validators(entry)
+            self._send_cors_headers()
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(entry.body)))
+        self._send_validators(entry)
+        self._send_cors_headers()
+        self.end_headers()
+        self.wfile.write(entry.body)
+
+    def _is_not_modified(self, entry: CachedResponse) -> bool:
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or entry.etag in tags
+
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(entry.last_modified) <= since
+        return False
+
+    def _send_validators(self, entry: CachedResponse):
+        self.send_header('ETag', entry.etag)
+        self.send_header('Last-Modified', formatdate(entry.last_modified, usegmt=True))
+        self.send_header('Cache-Control', 'no-cache')
+
+    def _send_cors_headers(self):
+        origin = self.headers.get('Origin')
+        allowed = self.server.cors_origins
+        if origin and ('*' in allowed or origin in allowed):
+            self.send_header('Access-Control-Allow-Origin', origin)
+            self.send_header('Vary', 'Origin')
+            self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+            self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, If-None-Match')
+            self.send_header('Access-Control-Expose-Headers', 'ETag, Last-Modified')
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self._send_cors_headers()
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MenuApiServer(HTTPServer):
+    """
+    MenuDatabase 기반 메뉴 API 서버
+    고정 크기 스레드 풀에서 요청을 처리해 스레드별 DB 연결을 재사용함
+    """
+
+    def __init__(self, address: Tuple[str, int], db: MenuDatabase,
+                 cors_origins=None, cache_size: int = DEFAULT_CACHE_SIZE, workers: int = DEFAULT_WORKERS):
+        super().__init__(address, MenuApiHandler)
+        self.db = db
+        self.cache = MenuResponseCache(db.db_path, cache_size)
+        self.cors_origins = set(cors_origins or [])
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='menu-api')
+
+    def process_request(self, request, client_address):
+        self._executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+    def get_day_menu(self, date: str, lang: str, site: Optional[str] = None,
+                     exclude: int = 0, require: int = 0) -> CachedResponse:
+        """캐시된 응답을 반환하고, 없거나 오래된 경우에만 스냅샷 또는 SQLite를 조회"""
+        key = (date, lang, site, exclude, require)
+        version = self.cache.source_version()
+        entry = self.cache.get(key, version)
+        METRICS.inc('api_cache', route='day', result='miss' if entry is None else 'hit')
+        if entry is not None:
+            return entry
+
+        compact = date.replace('-', '')
+        body = None
+        # 스냅샷 본문의 날짜는 YYYYMMDD 형식이므로 같은 형식의 요청에만 사용
+        if date == compact:
+            body = self._snapshot_bodies([date], lang, site, exclude or require).get(date)
+        if body is None:
+            body = render_day(date, self.db.get_menu_by_date(
+                compact,
+                lang=None if lang == DEFAULT_LANGUAGE else lang,
+                site=site,
+                exclude_tags=exclude,
+                require_tags=require
+            ), lang)
+        entry = CachedResponse(version, body, self.cache.last_modified(version))
+        self.cache.put(key, entry)
+        return entry
+
+    def get_week_menu(self, start: str, lang: str, site: Optional[str] = None,
+                      exclude: int = 0, require: int = 0) -> CachedResponse:
+        """start부터 평일 5일치 메뉴를 스냅샷 또는 한 번의 범위 쿼리로 구성 (캐시 사용)"""
+        key = ('week:' + start, lang, site, exclude, require)
+        version = self.cache.source_version()
+        entry = self.cache.get(key, version)
+        METRICS.inc('api_cache', route='week', result='miss' if entry is None else 'hit')
+        if entry is not None:
+            return entry
+
+        dates = week_dates(start.replace('-', ''))
+        bodies = self._snapshot_bodies(dates, lang, site, exclude or require)
+        missing = [date for date in dates if date not in bodies]
+        if missing:
+            menus = self.db.get_menu_by_range(
+                missing[0], missing[-1],
+                lang=None if lang == DEFAULT_LANGUAGE else lang,
+                site=site,
+                exclude_tags=exclude,
+                require_tags=require
+            )
+            for date in missing:
+                bodies[date] = render_day(date, menus.get(date, {}), lang)
+        # json.dumps({'days': [...]})와 같은 형식으로 하루 본문을 이어 붙임
+        body = b'{"days": [' + b', '.join(bodies[date] for date in dates) + b']}'
+        entry = CachedResponse(version, body, self.cache.last_modified(version))
+        self.cache.put(key, entry)
+        return entry
+
+    def _snapshot_bodies(self, dates: List[str], lang: str, site: Optional[str],
+                         filtered: int = 0) -> Dict[str, bytes]:
+        """
+        미리 만든 날짜별 응답 본문
+        스냅샷은 모든 사업장, 모든 코너 기준이므로 사업장이나 식단 조건을 지정한 요청은 사용하지 않음
+        """
+        if site is not None or filtered:
+            return {}
+        bodies = {date: body for date, (_, body) in self.db.get_snapshots(dates, lang).items()}
+        METRICS.inc('api_snapshot', len(bodies), result='hit')
+        METRICS.inc('api_snapshot', len(dates) - len(bodies), result='miss')
+        return bodies
+
+
+def create_server(host: str = '0.0.0.0', port: int = None, db_path: str = None) -> MenuApiServer:
+    """환경 변수 설정으로 API 서버 생성"""
+    port = int(port if port is not None else os.getenv('API_PORT', '8888'))
+    cors_origins = [origin.strip() for origin in os.getenv('CORS_ORIGINS', '').split(',') if origin.strip()]
+    return MenuApiServer(
+        (host, port),
+        MenuDatabase(db_path),
+        cors_origins=cors_origins,
+        cache_size=int(os.getenv('API_CACHE_SIZE', str(DEFAULT_CACHE_SIZE))),
+        workers=int(os.getenv('API_WORKERS', str(DEFAULT_WORKERS)))
+    )
+
+
+def main():
+    server = create_server()
+    print(f"Server is running on port {server.server_address[1]}")
+    print(f"Database path: {server.db.db_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
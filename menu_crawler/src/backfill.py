@@ -0,0 +1,221 @@
+"""
+기간 백필
+
+MenuInfo API는 FR_DT부터 한 구간(보통 한 주)의 메뉴만 돌려주므로,
+시작일부터 구간 크기만큼 FR_DT를 옮겨 가며 여러 구간을 동시에 요청해 과거 메뉴를 채운다.
+저장이 끝난 구간은 crawl_windows 테이블에 기록되어 중단 후 다시 실행하면 이어서 진행한다.
+
+    python backfill.py 20240101 20241231 --concurrency 4 --rate 2
+"""
+import argparse
+import datetime
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
+from db_manager import MenuDatabase
+from ourhome_client import OurHomeClient
+from crawl import load_sites, response_hash
+
+# 응답으로 구간 크기를 알 수 없을 때 사용할 일 수
+DEFAULT_WINDOW_DAYS = 7
+
+# 동시 요청 수와 초당 최대 요청 수 (업스트림 보호)
+BACKFILL_CONCURRENCY = int(os.getenv('BACKFILL_CONCURRENCY', '4'))
+BACKFILL_RATE = float(os.getenv('BACKFILL_RATE', '2'))
+
+# 이만큼의 구간이 모이면 한 번에 저장하고 체크포인트 기록
+WRITE_CHUNK_WINDOWS = 8
+
+DATE_FORMAT = "%Y%m%d"
+
+
+class RateLimiter:
+    """여러 스레드의 요청 시작 간격을 1/rate초 이상으로 유지"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _shift(date: str, days: int) -> str:
+    return (datetime.datetime.strptime(date, DATE_FORMAT) + datetime.timedelta(days=days)).strftime(DATE_FORMAT)
+
+
+def window_span(menus: List[Dict[str, Any]]) -> Optional[Tuple[str, str]]:
+    """응답에 포함된 첫/마지막 날짜 (메뉴가 없으면 None)"""
+    dates = [menu['OFFERDT'] for menu in menus if menu.get('OFFERDT')]
+    if not dates:
+        return None
+    return min(dates), max(dates)
+
+
+def window_days(menus: List[Dict[str, Any]], fr_dt: str) -> int:
+    """FR_DT부터 응답의 마지막 날짜까지의 일 수 (구간 크기)"""
+    span = window_span(menus)
+    if span is None:
+        return DEFAULT_WINDOW_DAYS
+    last = datetime.datetime.strptime(span[1], DATE_FORMAT)
+    return max(1, (last - datetime.datetime.strptime(fr_dt, DATE_FORMAT)).days + 1)
+
+
+def plan_windows(start: str, end: str, days: int) -> List[str]:
+    """start~end를 덮는 구간 시작일(FR_DT) 목록"""
+    windows = []
+    current = start
+    while current <= end:
+        windows.append(current)
+        current = _shift(current, days)
+    return windows
+
+
+class Backfill:
+    """
+    한 사업장의 start~end 기간 메뉴를 구간 단위로 가져와 저장
+
+    요청은 스레드 풀에서 rate limit을 지키며 동시에 보내고, 저장은 호출한 스레드 하나에서만 한다.
+    겹치는 구간의 같은 메뉴(날짜, 식사, 코너)는 메모리에서 하나로 합친 뒤 저장한다.
+    """
+
+    def __init__(self, db: MenuDatabase, client: OurHomeClient, site: str, ex_stor_cd: int,
+                 concurrency: int = BACKFILL_CONCURRENCY, rate: float = BACKFILL_RATE):
+        self.db = db
+        self.client = client
+        self.site = site
+        self.ex_stor_cd = ex_stor_cd
+        self.concurrency = max(1, concurrency)
+        self.limiter = RateLimiter(rate)
+        self.counts = {'windows': 0, 'failed': 0, 'added': 0, 'changed': 0, 'unchanged': 0, 'skipped': 0}
+        self._written = set()
+
+    def _fetch(self, fr_dt: str) -> Optional[List[Dict[str, Any]]]:
+        self.limiter.wait()
+        result = self.client.fetch_menu(fr_dt=fr_dt, busiplcd=self.site, ex_stor_cd=self.ex_stor_cd)
+        return None if result is None else result.get('list', [])
+
+    def _flush(self, pending: Dict[Tuple, Dict[str, Any]], windows: List[Tuple[str, Optional[str], int, str]]) -> bool:
+        """모인 메뉴를 한 트랜잭션으로 저장하고, 성공하면 해당 구간을 완료로 기록"""
+        if pending:
+            counts = self.db.insert_menu_batch(pending.values(), self.site)
+            if counts is None:
+                print(f"[{self.site}] 저장 실패: {len(windows)}개 구간은 다음 실행에서 다시 시도")
+                self.counts['failed'] += len(windows)
+                pending.clear()
+                windows.clear()
+                return False
+            for name, count in counts.items():
+                self.counts[name] += count
+            self._written.update(pending)
+        self.db.mark_windows_completed(self.site, windows)
+        self.counts['windows'] += len(windows)
+        pending.clear()
+        windows.clear()
+        return True
+
+    def run(self, start: str, end: str, days: Optional[int] = None, restart: bool = False) -> Dict[str, int]:
+        """
+        start~end(YYYYMMDD) 기간 백필
+
+        Args:
+            start, end: 백필 기간 (포함)
+            days: 구간 크기 (없으면 첫 응답의 날짜 범위로 결정)
+            restart: 체크포인트를 무시하고 모든 구간을 다시 요청
+
+        Returns:
+            windows/failed(구간 수), added/changed/unchanged/skipped(메뉴 수)
+        """
+        completed = {} if restart else self.db.get_completed_windows(self.site)
+        pending: Dict[Tuple, Dict[str, Any]] = {}
+        done: List[Tuple[str, Optional[str], int, str]] = []
+
+        def collect(fr_dt: str, menus: List[Dict[str, Any]]):
+            for menu in menus:
+                key = (menu.get('OFFERDT'), menu.get('MEALCLASS_NM'), menu.get('CORNER'))
+                # 기간 밖이거나 이미 저장한 메뉴는 제외 (겹치는 구간)
+                if not start <= (key[0] or '') <= end or key in self._written:
+                    continue
+                pending[key] = menu
+            span = window_span(menus)
+            done.append((fr_dt, span[1] if span else None, len(menus), response_hash(menus)))
+
+        if days is None:
+            # 첫 구간을 먼저 받아 구간 크기를 알아냄
+            if start in completed:
+                # 이전 실행에서 기록한 첫 구간의 마지막 날짜로 계산
+                days = window_days([{'OFFERDT': completed[start]}], start)
+            else:
+                menus = self._fetch(start)
+                if menus is None:
+                    self.counts['failed'] += 1
+                    return self.counts
+                days = window_days(menus, start)
+                collect(start, menus)
+                completed[start] = None
+
+        windows = [fr_dt for fr_dt in plan_windows(start, end, days) if fr_dt not in completed]
+        print(f"[{self.site}] 백필 {start}~{end}: 구간 {days}일, 남은 구간 {len(windows)}개")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='backfill') as executor:
+            futures = {executor.submit(self._fetch, fr_dt): fr_dt for fr_dt in windows}
+            for future in as_completed(futures):
+                fr_dt = futures[future]
+                try:
+                    menus = future.result()
+                except Exception as e:
+                    print(f"[{self.site}] {fr_dt} 구간 조회 실패: {str(e)}")
+                    menus = None
+                if menus is None:
+                    self.counts['failed'] += 1
+                    continue
+                collect(fr_dt, menus)
+                if len(done) >= WRITE_CHUNK_WINDOWS:
+                    self._flush(pending, done)
+
+        self._flush(pending, done)
+        return self.counts
+
+
+def backfill(start: str, end: str, sites: Optional[List[Dict[str, Any]]] = None,
+             concurrency: int = BACKFILL_CONCURRENCY, rate: float = BACKFILL_RATE,
+             days: Optional[int] = None, restart: bool = False) -> Dict[str, Dict[str, int]]:
+    """모든 사업장의 start~end 기간 백필 (사업장별 결과 반환)"""
+    results = {}
+    with MenuDatabase() as db, OurHomeClient() as client:
+        for site in sites or load_sites():
+            job = Backfill(db, client, site['site'], site['ex_stor_cd'], concurrency, rate)
+            counts = job.run(start, end, days, restart)
+            print(
+                f"[{site['site']}] 백필 완료: 구간 {counts['windows']}개 (실패 {counts['failed']}개), "
+                f"메뉴 {counts['added']}개 추가, {counts['changed']}개 변경, {counts['unchanged']}개 변경 없음"
+            )
+            results[site['site']] = counts
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Backfill menus for a date range')
+    parser.add_argument('start', help='First date (YYYYMMDD)')
+    parser.add_argument('end', help='Last date (YYYYMMDD)')
+    parser.add_argument('--sites', help='BUSIPLCD[:EX_STOR_CD],... (default: MENU_SITES)')
+    parser.add_argument('--concurrency', type=int, default=BACKFILL_CONCURRENCY,
+                        help='Number of windows fetched at the same time')
+    parser.add_argument('--rate', type=float, default=BACKFILL_RATE,
+                        help='Maximum requests per second')
+    parser.add_argument('--window-days', type=int,
+                        help='Days per request (default: learned from the first response)')
+    parser.add_argument('--restart', action='store_true',
+                        help='Ignore completed windows and fetch everything again')
+    args = parser.parse_args()
+    backfill(args.start.replace('-', ''), args.end.replace('-', ''),
+             load_sites(args.sites) if args.sites else None,
+             args.concurrency, args.rate, args.window_days, args.restart)
@@ -0,0 +1,424 @@
+"""
+메뉴 데이터베이스/번역 파이프라인 벤치마크
+
+합성 메뉴 이력(평일 × 식사 × 코너 × 부가 메뉴)을 임시 데이터베이스에 만들어 다음을 잰다.
+- 저장 처리량: insert_menu_data(한 건씩), insert_menu_batch(한 주씩, 변경 없는 재저장 포함)
+- 조회 지연 시간 백분위수: get_menu_by_date, get_menu_by_range(한 주), 번역 포함/미포함, 메뉴 이름 검색
+- 번역 처리량: translate_new (응답 지연을 흉내 내는 로컬 가짜 API 사용, 네트워크 없음)
+
+같은 seed면 같은 이력이 만들어지므로 결과를 JSON으로 저장해 두고 --compare로 비교하면
+지표별 변화를 출력하며, 허용 범위보다 느려진 지표가 있으면 종료 코드 1로 끝난다.
+
+    python benchmark.py --years 3 --output bench.json
+    python benchmark.py --years 3 --compare bench.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+from db_manager import MenuDatabase
+from mock_llm_server import mock_translations, estimate_tokens, start_server
+
+DATE_FORMAT = "%Y%m%d"
+
+# 합성 메뉴 이름 재료 (조합해 수백 개의 요리 이름을 만들고, 실제처럼 같은 이름이 반복되게 함)
+DISH_INGREDIENTS = (
+    '김치', '된장', '제육', '닭', '돼지고기', '소고기', '오징어', '두부', '감자', '콩나물',
+    '시금치', '어묵', '버섯', '고등어', '참치', '순두부', '미역', '떡', '카레', '짜장',
+)
+DISH_STYLES = (
+    '찌개', '볶음', '국', '조림', '무침', '구이', '튀김', '덮밥', '전', '샐러드', '스튜', '볶음밥',
+)
+STAPLES = ('쌀밥', '잡곡밥', '흑미밥')
+KIMCHI = ('배추김치', '깍두기', '열무김치')
+
+# 식사 구분별 (시작, 종료) 시각
+MEAL_TIMES = {'중식': ('1120', '1300'), '석식': ('1730', '1900')}
+
+# 회귀로 판단할 기본 허용 범위 (20% 이상 나빠지면 회귀)
+DEFAULT_TOLERANCE = 0.2
+
+# 비교할 지표 (p99/max는 표본 몇 개에 좌우되어 흔들리므로 제외)
+HIGHER_IS_BETTER = ('.per_sec',)
+LOWER_IS_BETTER = ('.mean_ms', '.p50_ms', '.p90_ms')
+
+# 가짜 번역 API의 요청당 지연과 메뉴 하나당 추가 지연(초)
+MOCK_LATENCY = 0.05
+MOCK_ITEM_LATENCY = 0.002
+
+
+def dish_names() -> List[str]:
+    """합성 메뉴에 쓰이는 요리 이름 목록"""
+    return [ingredient + style for ingredient in DISH_INGREDIENTS for style in DISH_STYLES]
+
+
+def generate_history(start: str, days: int, corners: int = 4, sub_menus: int = 5,
+                     seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    start부터 days일(주말 제외) 동안의 API 응답 형식 메뉴 목록 생성
+
+    Args:
+        start: 시작 날짜 (YYYYMMDD)
+        days: 달력 기준 일 수
+        corners: 식사별 코너 수
+        sub_menus: 코너별 부가 메뉴 수 (밥/김치 포함)
+        seed: 같은 값이면 같은 이력이 만들어짐
+    """
+    rng = random.Random(seed)
+    names = dish_names()
+    first = datetime.datetime.strptime(start, DATE_FORMAT)
+    menus = []
+    for offset in range(days):
+        day = first + datetime.timedelta(days=offset)
+        if day.weekday() >= 5:
+            continue
+        date = day.strftime(DATE_FORMAT)
+        for meal_type, (fr_tm, to_tm) in MEAL_TIMES.items():
+            for corner in range(corners):
+                subs = [rng.choice(STAPLES), rng.choice(KIMCHI)][:sub_menus]
+                subs += rng.sample(names, max(0, sub_menus - len(subs)))
+                menus.append({
+                    "OFFERDT": date,
+                    "MEALCLASS_NM": meal_type,
+                    "FR_TM": fr_tm,
+                    "TO_TM": to_tm,
+                    "CORNER": chr(ord('A') + corner),
+                    "CORNERNM": f"코너{corner + 1}",
+                    "MENUNM": rng.choice(names),
+                    "MENU": f"M{corner + 1:03d}",
+                    "SUB_MENU_INFO": [{"MENUNM": name} for name in subs],
+                })
+    return menus
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """정렬된 표본의 백분위수 (nearest-rank)"""
+    if not samples:
+        return 0.0
+    index = max(0, min(len(samples) - 1, int(round(pct / 100 * len(samples))) - 1))
+    return samples[index]
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    """초 단위 표본을 밀리초 단위 요약으로 변환"""
+    samples = sorted(samples)
+    total = sum(samples)
+    return {
+        'count': len(samples),
+        'mean_ms': round(total / len(samples) * 1000, 3) if samples else 0.0,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p90_ms': round(percentile(samples, 90) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+        'max_ms': round(samples[-1] * 1000, 3) if samples else 0.0,
+    }
+
+
+def throughput(count: int, seconds: float) -> Dict[str, float]:
+    return {
+        'count': count,
+        'seconds': round(seconds, 3),
+        'per_sec': round(count / seconds, 1) if seconds > 0 else 0.0,
+    }
+
+
+def _weeks(menus: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """크롤러의 조회 구간처럼 한 주 단위로 묶음"""
+    weeks: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+    for menu in menus:
+        week = datetime.datetime.strptime(menu['OFFERDT'], DATE_FORMAT).isocalendar()[:2]
+        weeks.setdefault(week, []).append(menu)
+    return list(weeks.values())
+
+
+def bench_ingest(workdir: str, menus: List[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+    """
+    저장 처리량 측정
+    insert_menu_data로 채운 데이터베이스 경로(이후 조회/번역 측정에 사용)와 결과를 반환
+    """
+    results = {}
+
+    db_path = os.path.join(workdir, 'menu_item.db')
+    with MenuDatabase(db_path) as db:
+        started = time.perf_counter()
+        for menu in menus:
+            db.insert_menu_data(menu)
+        results['insert_menu_data'] = throughput(len(menus), time.perf_counter() - started)
+
+    with MenuDatabase(os.path.join(workdir, 'menu_batch.db')) as db:
+        weeks = _weeks(menus)
+        started = time.perf_counter()
+        for week in weeks:
+            db.insert_menu_batch(week)
+        results['insert_menu_batch'] = throughput(len(menus), time.perf_counter() - started)
+
+        # 같은 응답을 다시 저장 (변경 없음: 읽기만 하고 쓰지 않는 경로)
+        started = time.perf_counter()
+        for week in weeks:
+            db.insert_menu_batch(week)
+        results['insert_menu_batch_unchanged'] = throughput(len(menus), time.perf_counter() - started)
+
+    return db_path, results
+
+
+def _time_calls(call: Callable[[str], Any], arguments: List[str]) -> Dict[str, float]:
+    samples = []
+    for argument in arguments:
+        started = time.perf_counter()
+        call(argument)
+        samples.append(time.perf_counter() - started)
+    return latency_summary(samples)
+
+
+def _shift(date: str, days: int) -> str:
+    return (datetime.datetime.strptime(date, DATE_FORMAT) + datetime.timedelta(days=days)).strftime(DATE_FORMAT)
+
+
+def bench_queries(db_path: str, dates: List[str], queries: int, seed: int = 42,
+                  lang: str = 'en') -> Dict[str, Any]:
+    """임의의 날짜/주 조회와 메뉴 이름 검색의 지연 시간 백분위수 측정 (번역 포함 조회는 lang 사용)"""
+    rng = random.Random(seed)
+    names = dish_names()
+    sample = [rng.choice(dates) for _ in range(queries)]
+    with MenuDatabase(db_path) as db:
+        # 연결 생성과 첫 페이지 읽기는 측정에서 제외
+        db.get_menu_by_date(sample[0])
+        return {
+            'get_menu_by_date': _time_calls(lambda date: db.get_menu_by_date(date), sample),
+            f'get_menu_by_date_{lang}': _time_calls(lambda date: db.get_menu_by_date(date, lang), sample),
+            'get_menu_by_range_week': _time_calls(lambda date: db.get_menu_by_range(date, _shift(date, 6)), sample),
+            f'get_menu_by_range_week_{lang}': _time_calls(
+                lambda date: db.get_menu_by_range(date, _shift(date, 6), lang), sample),
+            'search': _time_calls(lambda name: db.search(name), [rng.choice(names) for _ in range(queries)]),
+        }
+
+
+class MockCompletions:
+    """
+    DeepSeek(OpenAI 호환) chat.completions.create를 흉내 내는 프로세스 내 가짜 API
+    mock_llm_server와 같은 번역을 돌려주며, 요청마다 지연 시간을 둔다 (HTTP 비용 제외)
+    """
+
+    def __init__(self, latency: float = MOCK_LATENCY, item_latency: float = MOCK_ITEM_LATENCY):
+        self.latency = latency
+        self.item_latency = item_latency
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def create(self, messages: List[Dict[str, str]], **kwargs):
+        with self._lock:
+            self.requests += 1
+        prompt = messages[-1]['content']
+        content, count = mock_translations(prompt)
+        time.sleep(self.latency + self.item_latency * count)
+        usage = SimpleNamespace(prompt_tokens=estimate_tokens(prompt), completion_tokens=estimate_tokens(content))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+
+@contextmanager
+def _environ(**values: str) -> Iterator[None]:
+    """환경 변수를 잠시 바꿨다가 되돌림"""
+    saved = {name: os.environ.get(name) for name in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def bench_translation(db_path: str, concurrency: Optional[int] = None, latency: float = MOCK_LATENCY,
+                      item_latency: float = MOCK_ITEM_LATENCY, http_mock: bool = False,
+                      llm_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    저장된 이력 전체를 번역해 처리량 측정
+
+    기본은 프로세스 내 가짜 API, http_mock이면 mock_llm_server를 띄워 HTTP/클라이언트 비용까지 포함하고,
+    llm_url을 주면 이미 실행 중인 OpenAI 호환 서버를 사용 (요청 수는 알 수 없어 None)
+    """
+    from translate_service import TranslationService
+
+    server = None
+    if http_mock:
+        server = start_server(latency=latency, item_latency=item_latency)
+        llm_url = server.url
+    try:
+        with _environ(DB_PATH=db_path):
+            service = TranslationService(base_url=llm_url, api_key=None if llm_url else 'benchmark')
+        completions = None
+        if llm_url is None:
+            completions = MockCompletions(latency, item_latency)
+            service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+        started = time.perf_counter()
+        counts = service.translate_new(concurrency=concurrency, full=True)
+        seconds = time.perf_counter() - started
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    if server is not None:
+        requests = server.snapshot()['requests']
+    else:
+        requests = completions.requests if completions is not None else None
+    result = throughput(counts['names'], seconds)
+    result.update({'translated': counts['translated'], 'failed': counts['failed'], 'requests': requests,
+                   'glossary': counts['glossary'], 'combined': counts['combined']})
+    return result
+
+
+def run_benchmark(years: float = 1.0, corners: int = 4, sub_menus: int = 5, queries: int = 500,
+                  seed: int = 42, translate: bool = True, concurrency: Optional[int] = None,
+                  mock_latency: float = MOCK_LATENCY, http_mock: bool = False, llm_url: Optional[str] = None,
+                  start: str = '20220103') -> Dict[str, Any]:
+    """합성 이력을 만들어 저장 → 번역 → 조회 순서로 측정하고 결과 반환"""
+    days = max(1, int(years * 365))
+    menus = generate_history(start, days, corners, sub_menus, seed)
+    dates = sorted({menu['OFFERDT'] for menu in menus})
+    print(f"합성 이력: {len(dates)}일, 메뉴 {len(menus)}개 (코너 {corners}개, 부가 메뉴 {sub_menus}개)")
+
+    workdir = tempfile.mkdtemp(prefix='menu_bench_')
+    try:
+        db_path, ingest = bench_ingest(workdir, menus)
+        results: Dict[str, Any] = {'ingest': ingest}
+        if translate:
+            results['translation'] = bench_translation(db_path, concurrency, mock_latency,
+                                                       http_mock=http_mock, llm_url=llm_url)
+        results['queries'] = bench_queries(db_path, dates, queries, seed)
+        results['db_bytes'] = os.path.getsize(db_path)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'params': {
+            'years': years, 'corners': corners, 'sub_menus': sub_menus, 'queries': queries,
+            'seed': seed, 'translate': translate, 'concurrency': concurrency, 'mock_latency': mock_latency,
+            'llm': llm_url or ('http_mock' if http_mock else 'in_process'),
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+
+def flatten(results: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+    """중첩된 결과를 'ingest.insert_menu_data.per_sec' 형식의 이름으로 펼침"""
+    flat = {}
+    for name, value in results.items():
+        key = f"{prefix}{name}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, key + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[key] = value
+    return flat
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """
+    두 결과의 지표 비교
+    처리량(per_sec)은 높을수록, 지연 시간(mean/p50/p90)은 낮을수록 좋은 지표로 보고
+    기준보다 tolerance 비율 이상 나빠지면 regressed로 표시
+    """
+    now = flatten(current['results'])
+    before = flatten(baseline['results'])
+    rows = []
+    for name in sorted(now.keys() & before.keys()):
+        if name.endswith(HIGHER_IS_BETTER):
+            higher_is_better = True
+        elif name.endswith(LOWER_IS_BETTER):
+            higher_is_better = False
+        else:
+            continue
+        old, new = before[name], now[name]
+        change = (new - old) / old if old else 0.0
+        worse = -change if higher_is_better else change
+        rows.append({'name': name, 'baseline': old, 'current': new,
+                     'change': round(change, 4), 'regressed': worse > tolerance})
+    return rows
+
+
+def print_results(report: Dict[str, Any]):
+    results = report['results']
+    print("\n=== 저장 ===")
+    for name, value in results['ingest'].items():
+        print(f"{name:32s} {value['count']:7d}건 {value['seconds']:8.2f}초 {value['per_sec']:10.1f}건/초")
+    if 'translation' in results:
+        value = results['translation']
+        print(f"\n=== 번역 ({report['params']['llm']}) ===")
+        print(f"이름 {value['count']}개, 요청 {value['requests']}회, {value['seconds']:.2f}초, "
+              f"{value['per_sec']:.1f}개/초, 실패 {value['failed']}개, 용어집 {value.get('glossary', 0)}개")
+    print("\n=== 조회 (ms) ===")
+    for name, value in results['queries'].items():
+        print(f"{name:32s} p50 {value['p50_ms']:8.3f}  p90 {value['p90_ms']:8.3f}  "
+              f"p99 {value['p99_ms']:8.3f}  max {value['max_ms']:8.3f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark menu storage, queries and translation on synthetic data')
+    parser.add_argument('--years', type=float, default=1.0, help='Years of synthetic menu history')
+    parser.add_argument('--corners', type=int, default=4, help='Corners per meal')
+    parser.add_argument('--sub-menus', type=int, default=5, help='Sub-menus per corner')
+    parser.add_argument('--queries', type=int, default=500, help='Queries per query benchmark')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for the synthetic history')
+    parser.add_argument('--concurrency', type=int, default=None, help='Concurrent translation requests')
+    parser.add_argument('--mock-latency', type=float, default=MOCK_LATENCY,
+                        help='Seconds the mock translation API waits per request')
+    parser.add_argument('--http-mock', action='store_true',
+                        help='Translate through a local mock_llm_server over HTTP instead of the in-process mock')
+    parser.add_argument('--llm-url', help='Translate against a running OpenAI-compatible server instead')
+    parser.add_argument('--skip-translation', action='store_true', help='Skip the translation benchmark')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--compare', help='Compare with a previous results JSON file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Relative slowdown reported as a regression')
+    args = parser.parse_args()
+
+    report = run_benchmark(args.years, args.corners, args.sub_menus, args.queries, args.seed,
+                           not args.skip_translation, args.concurrency, args.mock_latency,
+                           args.http_mock, args.llm_url)
+    print_results(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('params') != report['params']:
+            print("\n경고: 기준 결과와 측정 조건이 다름")
+        rows = compare(report, baseline, args.tolerance)
+        print(f"\n=== 비교 ({args.compare}) ===")
+        for row in rows:
+            mark = '  <- 회귀' if row['regressed'] else ''
+            print(f"{row['name']:48s} {row['baseline']:10.3f} -> {row['current']:10.3f} "
+                  f"({row['change']:+.1%}){mark}")
+        regressions = [row for row in rows if row['regressed']]
+        if regressions:
+            print(f"\n회귀 {len(regressions)}개 (허용 범위 {args.tolerance:.0%})")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,14 @@
 import sqlite3
 import os
 from datetime import datetime
+from migrations import apply_migrations
 
 def get_latest_menu():
-    db_path = '/home/ubuntu/susong/ForeignMenu/data/menu.db'
+    db_path = os.getenv('DB_PATH', '/home/ubuntu/susong/ForeignMenu/data/menu.db')
     
     conn = sqlite3.connect(db_path)
+    # 스키마가 없거나 오래된 경우 공용 마이그레이션으로 맞춤
+    apply_migrations(conn)
     cursor = conn.cursor()
     
     # Get the latest menu and its translations
@@ -18,7 +21,8 @@ def get_latest_menu():
             MAX(CASE WHEN mt.language = 'zh' THEN mt.translated_name END) as menu_zh,
             MAX(CASE WHEN mt.language = 'sv' THEN mt.translated_name END) as menu_sv
         FROM main_menu m
-        LEFT JOIN menu_translations mt ON m.id = mt.menu_id
+        LEFT JOIN dish_names d ON d.name = m.main_menu
+        LEFT JOIN menu_translations mt ON mt.menu_name = COALESCE(d.canonical, m.main_menu)
         WHERE m.meal_type = '중식'
         GROUP BY m.id
         ORDER BY m.date DESC, m.created_at DESC
@@ -1,8 +1,12 @@
-import requests
 import datetime
+import hashlib
 import json
-from typing import Dict, Any
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
 from db_manager import MenuDatabase
+from metrics import METRICS
+from ourhome_client import OurHomeClient, generate_ourhomekey  # noqa: F401 (기존 import 경로 유지)
 from dotenv import load_dotenv
 import os
 from pathlib import Path
@@ -11,23 +15,42 @@ from pathlib import Path
 env_path = Path(__file__).parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
-def generate_ourhomekey(senddttm: str, ex_stor_cd: int, seed_key: int) -> int:
-    """Generate OURHOMEKEY based on time information and store code."""
-    year = int(senddttm[:4])
-    month = int(senddttm[4:6])
-    day = int(senddttm[6:8])
-    time_part = senddttm[8:14]
-    
-    time_multiplier = int(f"{time_part[5]}{time_part[3]}{time_part[1]}")
+# 동시에 요청할 사업장 수
+CRAWL_CONCURRENCY = int(os.getenv('CRAWL_CONCURRENCY', '4'))
+
+# 모든 사업장의 응답이 지난번과 같을 때의 종료 코드 (run_crawler.sh가 번역을 건너뜀)
+NO_CHANGE_EXIT_CODE = 3
+
+
+def response_hash(menus: List[Dict[str, Any]]) -> str:
+    """
+    구간 응답의 정규화된 해시
+    키 순서와 메뉴 순서는 무시하고, 부가 메뉴 순서는 저장 내용에 영향을 주므로 유지
+    """
+    canonical = sorted(json.dumps(menu, ensure_ascii=False, sort_keys=True) for menu in menus)
+    return hashlib.sha1(json.dumps(canonical, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def load_sites(value: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    크롤링할 사업장 목록
+    MENU_SITES 환경 변수에 "BUSIPLCD[:EX_STOR_CD],..." 형식으로 지정하며,
+    없으면 BUSIPLCD/EX_STOR_CD 단일 사업장을 사용
+
+    Returns:
+        [{'site': 사업장 코드, 'ex_stor_cd': 매장 코드}, ...]
+    """
+    value = value if value is not None else os.getenv('MENU_SITES', '')
+    default_store = int(os.getenv('EX_STOR_CD', '1010'))
+    sites = []
+    for entry in value.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        site, _, store = entry.partition(':')
+        sites.append({'site': site.strip(), 'ex_stor_cd': int(store) if store.strip() else default_store})
+    return sites or [{'site': os.getenv('BUSIPLCD', 'FAN10'), 'ex_stor_cd': default_store}]
 
-    return (
-        (100 - (year // 100)) +  
-        (100 - (year % 100)) +   
-        (100 - month) +          
-        (100 - day) * time_multiplier +  
-        ex_stor_cd +             
-        seed_key                 
-    )
 
 def format_menu_item(menu: Dict[str, Any]) -> str:
     """Format a single menu item into a readable string."""
@@ -45,86 +68,99 @@ def format_menu_item(menu: Dict[str, Any]) -> str:
                 
     return "\n".join(output)
 
-def get_menu_info(test_mode: bool = True) -> Dict[str, Any]:
+def get_menu_info(test_mode: bool = True, client: Optional[OurHomeClient] = None,
+                  busiplcd: Optional[str] = None, ex_stor_cd: Optional[int] = None,
+                  fr_dt: Optional[str] = None) -> Dict[str, Any]:
     """Fetch menu information from the API and return the result."""
     if test_mode:
         with open('sample_response.json', 'r', encoding='utf-8') as f:
             return json.load(f)
     
-    # Get environment variables
-    EX_STOR_CD = int(os.getenv('EX_STOR_CD', '1010'))
-    ACCESS_TOKEN = os.getenv('ACCESS_TOKEN', '')
-    SEED_KEY = int(os.getenv('SEED_KEY', '62'))
-    BUSIPLCD = os.getenv('BUSIPLCD', 'FAN10')
-    
-    # Get API URL from environment
-    base_url = os.getenv('DEV_API_URL') if test_mode else os.getenv('PROD_API_URL')
-    if not base_url:
-        raise ValueError("API URL not found in environment variables")
-    
-    url = f"{base_url}/Ex/Stor/MenuInfo"
-    
-    current_datetime = datetime.datetime.now()
-    senddttm = current_datetime.strftime("%Y%m%d%H%M%S")
-    
-    # Generate API request data
-    ourhomekey = generate_ourhomekey(senddttm, EX_STOR_CD, SEED_KEY)
-    
-    request_data = {
-        "EX_STOR_INFO": {
-            "EX_STOR_CD": str(EX_STOR_CD),
-            "SENDDTTM": senddttm,
-            "ACCESS_TOKEN": ACCESS_TOKEN,
-            "OURHOMEKEY": str(ourhomekey)
-        },
-        "REQ_PARAMS": {
-            "GUBUN": "EX_STOR_WEEKEND_MENU_S1",
-            "BUSIPLCD": BUSIPLCD,
-            "FR_DT": current_datetime.strftime("%Y%m%d")
-        }
-    }
-    
-    headers = {"Content-Type": "application/json"}
-    
-    try:
-        response = requests.post(url, headers=headers, json=request_data)
-        response.raise_for_status()
-        
-        result = response.json()
-        
-        if result.get("return") == "1":
-            # 샐러드 코너 데이터만 로깅
-            for menu in result.get("list", []):
-                if "샐러드" in menu.get("CORNERNM", ""):
-                    print("\n=== 샐러드 코너 원본 데이터 ===")
-                    print(json.dumps(menu, ensure_ascii=False, indent=2))
-            return result
-        else:
-            print(f"API 오류: {result.get('errmsg', '알 수 없는 오류')}")
-            return None
-            
-    except requests.exceptions.RequestException as e:
-        print(f"요청 중 오류 발생: {str(e)}")
-    except json.JSONDecodeError:
-        print("응답 데이터 파싱 오류")
-    except Exception as e:
-        print(f"예상치 못한 오류: {str(e)}")
+    if client is None:
+        with OurHomeClient() as client:
+            return get_menu_info(False, client, busiplcd, ex_stor_cd, fr_dt)
+    
+    result = client.fetch_menu(fr_dt=fr_dt, busiplcd=busiplcd, ex_stor_cd=ex_stor_cd)
+    if result:
+        # 샐러드 코너 데이터만 로깅
+        for menu in result.get("list", []):
+            if "샐러드" in menu.get("CORNERNM", ""):
+                print("\n=== 샐러드 코너 원본 데이터 ===")
+                print(json.dumps(menu, ensure_ascii=False, indent=2))
+    return result
 
-def update_menu_database():
-    """메뉴 정보를 가져와서 데이터베이스에 업데이트"""
-    db = MenuDatabase()
-    
-    result = get_menu_info(test_mode=False)
+def update_menu_database(sites: Optional[List[Dict[str, Any]]] = None,
+                         client: Optional[OurHomeClient] = None,
+                         db: Optional[MenuDatabase] = None) -> Dict[str, int]:
+    """
+    메뉴 정보를 가져와서 데이터베이스에 업데이트
+    여러 사업장은 동시에 요청하고(가장 느린 사업장만큼만 소요),
+    저장은 응답이 도착하는 순서대로 메인 스레드 하나에서 처리
+    응답이 지난번에 저장한 응답과 같으면 데이터베이스에 아무것도 쓰지 않음
+    client/db를 넘기면 호출 후에도 닫지 않고 재사용할 수 있음 (scheduler.py)
 
-    if not result:
-        return
-    
-    success_count = 0
-    for menu in result.get("list", []):
-        if db.insert_menu_data(menu):
-            success_count += 1
+    Returns:
+        사업장 수(sites), 변경 없음(no_change), 실패(failed), 저장(updated) 건수
+    """
+    sites = sites or load_sites()
+    fr_dt = datetime.datetime.now().strftime("%Y%m%d")
+    summary = {'sites': len(sites), 'no_change': 0, 'failed': 0, 'updated': 0}
+    own_db = db is None
+    db = db or MenuDatabase()
+    own_client = client is None
+    client = client or OurHomeClient()
     
-    print(f"데이터베이스 업데이트 완료: {success_count}개 메뉴 추가/업데이트됨")
+    try:
+        with METRICS.span('crawl_cycle'), \
+                ThreadPoolExecutor(max_workers=max(1, min(CRAWL_CONCURRENCY, len(sites)))) as executor:
+            futures = {
+                executor.submit(get_menu_info, False, client, site['site'], site['ex_stor_cd'], fr_dt): site['site']
+                for site in sites
+            }
+            for future in as_completed(futures):
+                site = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[{site}] 메뉴 조회 실패: {str(e)}")
+                    result = None
+                
+                if not result:
+                    summary['failed'] += 1
+                    METRICS.inc('crawl_sites', site=site, result='failed')
+                    continue
+                
+                menus = result.get("list", [])
+                digest = response_hash(menus)
+                if db.get_window_hash(site, fr_dt) == digest:
+                    # 저장/번역/캐시 무효화가 모두 필요 없음 (데이터베이스 파일도 바뀌지 않음)
+                    print(f"[{site}] 이벤트: no_change (FR_DT {fr_dt}, 메뉴 {len(menus)}개)")
+                    summary['no_change'] += 1
+                    METRICS.inc('crawl_sites', site=site, result='no_change')
+                    continue
+                
+                counts = db.insert_menu_batch(menus, site)
+                if counts is None:
+                    print(f"[{site}] 데이터베이스 업데이트 실패: 변경사항이 롤백됨")
+                    summary['failed'] += 1
+                    METRICS.inc('crawl_sites', site=site, result='failed')
+                    continue
+                
+                dates = [menu.get('OFFERDT') for menu in menus if menu.get('OFFERDT')]
+                db.mark_windows_completed(site, [(fr_dt, max(dates) if dates else None, len(menus), digest)])
+                summary['updated'] += 1
+                METRICS.inc('crawl_sites', site=site, result='updated')
+                print(
+                    f"[{site}] 데이터베이스 업데이트 완료: {counts['added']}개 추가, "
+                    f"{counts['changed']}개 변경, {counts['unchanged']}개 변경 없음, {counts['skipped']}개 건너뜀"
+                )
+    finally:
+        if own_client:
+            client.close()
+        if own_db:
+            db.close()
+    
+    return summary
 
 def display_menu_from_db(date: str = None):
     """데이터베이스에서 메뉴 정보를 가져와서 표시"""
@@ -147,7 +183,10 @@ def display_menu_from_db(date: str = None):
                         print(f"  - {sub_menu}")
 
 if __name__ == "__main__":
-    update_menu_database()
+    summary = update_menu_database()
+    if summary['no_change'] == summary['sites']:
+        print("모든 사업장의 메뉴 변경 없음: 이후 단계를 건너뜀")
+        sys.exit(NO_CHANGE_EXIT_CODE)
     
     today = datetime.datetime.now().strftime("%Y%m%d")
     display_menu_from_db(today)
\ No newline at end of file
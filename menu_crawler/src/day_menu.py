@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+from dish_tags import combine, parse_tags, tag_names
+
+# 한국어는 원문을 그대로 사용
+DEFAULT_LANGUAGE = 'ko'
+
+# 주간 메뉴에 포함할 평일 수
+WEEK_DAYS = 5
+
+
+def _display_name(name: str, translated: Optional[str], lang: str) -> str:
+    """언어에 맞는 메뉴 이름 반환 (번역이 없으면 [원문])"""
+    if lang == DEFAULT_LANGUAGE:
+        return name
+    return translated or f"[{name}]"
+
+
+def _format_item(menu: Dict[str, Any], lang: str) -> Dict[str, Any]:
+    """get_menu_by_date의 메뉴 항목을 프론트엔드 MenuItem 형식으로 변환"""
+    translated_subs = menu.get('translated_sub_menus') or [None] * len(menu['sub_menus'])
+    return {
+        'id': menu['id'],
+        'name': _display_name(menu['main_menu'], menu.get('translated_name'), lang),
+        'meal_type': menu['meal_type'],
+        'corner_name': menu['corner_name'],
+        'description': (menu.get('description') or '') if lang != DEFAULT_LANGUAGE else '',
+        'sub_menus': [
+            _display_name(sub, translated, lang)
+            for sub, translated in zip(menu['sub_menus'], translated_subs)
+        ],
+        'tags': tag_names(menu.get('tags')),
+    }
+
+
+def _merge_into(target: Optional[Dict[str, Any]], item: Dict[str, Any]) -> Dict[str, Any]:
+    """같은 분류(후식/샐러드)의 항목이 여러 개면 첫 항목에 부가 메뉴를 합침"""
+    if target is None:
+        return item
+    target['sub_menus'] = list(dict.fromkeys(target['sub_menus'] + item['sub_menus']))
+    target['tags'] = tag_names(combine([parse_tags(','.join(target['tags'])), parse_tags(','.join(item['tags']))]))
+    return target
+
+
+def build_day_menu(date: str, menu_data: Dict[str, List[Dict[str, Any]]], lang: str) -> Dict[str, Any]:
+    """
+    하루치 메뉴를 프론트엔드의 DayMenu 형식으로 구성
+    (lunch, dinner, dessert, salad와 번역된 이름/설명)
+
+    Args:
+        date: 응답에 포함할 날짜 문자열
+        menu_data: MenuDatabase.get_menu_by_date(date, lang)의 결과
+        lang: 언어 코드 ('ko', 'en', 'zh', 'sv')
+
+    Returns:
+        DayMenu 딕셔너리
+    """
+    day = {
+        'date': date,
+        'language': lang,
+        'lunch': [],
+        'dinner': [],
+        'dessert': None,
+        'salad': None,
+    }
+
+    for menus in menu_data.values():
+        for menu in menus:
+            item = _format_item(menu, lang)
+            corner_name = (menu['corner_name'] or '').lower()
+            name = (item['name'] or '').lower()
+            meal_type = (menu['meal_type'] or '').lower()
+
+            if '후식' in corner_name or '디저트' in corner_name or 'dessert' in corner_name:
+                day['dessert'] = _merge_into(day['dessert'], item)
+            elif '샐러드' in corner_name or 'salad' in corner_name or '샐러드' in name or 'salad' in name:
+                day['salad'] = _merge_into(day['salad'], item)
+            elif '중식' in meal_type or 'lunch' in meal_type:
+                day['lunch'].append(item)
+            elif '석식' in meal_type or 'dinner' in meal_type:
+                day['dinner'].append(item)
+
+    return day
+
+
+def week_dates(start: str, count: int = WEEK_DAYS) -> List[str]:
+    """
+    start(YYYYMMDD)부터 주말을 건너뛰고 평일 count일의 날짜 목록을 반환
+    (프론트엔드 getWeeklyMenu와 같은 규칙: 일요일이면 다음 날 월요일부터 시작)
+    """
+    current = datetime.strptime(start, "%Y%m%d")
+    dates = []
+    while len(dates) < count:
+        if current.weekday() < 5:
+            dates.append(current.strftime("%Y%m%d"))
+        current += timedelta(days=1)
+    return dates
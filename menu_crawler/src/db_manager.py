@@ -1,146 +1,552 @@
+import hashlib
 import sqlite3
-from typing import Dict, List, Any
+import time
+import zlib
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 import json
 from datetime import datetime
 import os
+import threading
 from dotenv import load_dotenv
 from pathlib import Path
+from metrics import METRICS
+from dish_tags import corner_tags, tag_dish
+from menu_names import canonical_key
+from migrations import apply_migrations, SEARCH_LANGUAGES
 
 # Load environment variables
 env_path = Path(__file__).parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
+# SQLite 바인딩 파라미터 개수 제한(999)을 넘지 않도록 IN 절을 나누는 크기
+SQL_PARAM_CHUNK = 500
+
+# 연결마다 재사용할 준비된 구문(prepared statement) 캐시 크기
+STATEMENT_CACHE_SIZE = 256
+
+# 연결 생성 시 적용할 PRAGMA
+# WAL 모드에서는 크롤러가 쓰는 동안에도 읽기가 막히지 않음
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",       # WAL에서는 NORMAL로도 손상 없이 안전
+    "PRAGMA cache_size=-20000",        # 약 20MB 페이지 캐시
+    "PRAGMA mmap_size=268435456",      # 256MB 메모리 맵 읽기
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",          # sub_menu의 ON DELETE CASCADE 적용
+)
+
+# 다른 연결이 쓰기 잠금을 잡고 있을 때 기다리는 시간(초)
+BUSY_TIMEOUT = 10.0
+
+# 검색: trigram 색인으로 찾을 수 있는 최소 글자 수와 한 번에 살펴볼 최대 메뉴 이름 수
+SEARCH_MIN_TERM = 3
+SEARCH_MAX_DISHES = 200
+
+# 사업장을 지정하지 않은 메뉴의 기본 사업장 코드
+DEFAULT_SITE = os.getenv('BUSIPLCD', 'FAN10')
+
 class MenuDatabase:
     def __init__(self, db_path: str = None):
         self.db_path = db_path or os.getenv('DB_PATH', 'menu_data.db')
+        # 스레드마다 하나의 연결을 유지하며 재사용
+        self._local = threading.local()
         self.init_database()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """현재 스레드의 재사용 연결을 반환 (없으면 생성)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=BUSY_TIMEOUT,
+                cached_statements=STATEMENT_CACHE_SIZE
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in SQLITE_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """현재 스레드의 연결을 닫음"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
     def init_database(self):
-        """Initialize database tables if they don't exist."""
-        with sqlite3.connect(self.db_path) as conn:
+        """Initialize database tables if they don't exist (apply pending schema migrations)."""
+        # 마이그레이션 직후나 규칙 버전이 바뀌었을 때만 메뉴 속성 태그와 번역 키도 다시 계산됨
+        apply_migrations(self._get_connection())
+
+    def _prepare_menu_row(self, menu_data: Dict[str, Any], site: str) -> Tuple[Tuple[str, str, str, str], Tuple[str, str, str, str], List[str]]:
+        """
+        API 응답의 메뉴 항목을 (고유키, 메인 메뉴 정보, 부가 메뉴 목록)으로 변환
+        고유키는 (site, date, meal_type, corner), 메인 메뉴 정보는 (meal_time, corner_name, main_menu, menu_code)
+        """
+        # 샐러드 코너인 경우 특별 처리
+        is_salad = "샐러드" in (menu_data.get('CORNERNM') or '')
+        main_menu = menu_data['MENUNM']
+        sub_menus = menu_data.get('SUB_MENU_INFO') or []
+
+        if is_salad:
+            # 메인 메뉴가 음료인 경우, 서브메뉴에서 실제 샐러드 메뉴를 찾아 교체
+            if main_menu in ['두유', '쥬스']:
+                for sub in sub_menus:
+                    sub_name = sub.get('MENUNM', '')
+                    if sub_name not in ['두유', '쥬스']:
+                        main_menu = sub_name
+                        break
+
+        # 샐러드 코너도 모든 서브메뉴 포함 (음료 포함)
+        key = (site, menu_data['OFFERDT'], menu_data['MEALCLASS_NM'], menu_data['CORNER'])
+        row = (
+            f"{menu_data['FR_TM']}~{menu_data['TO_TM']}",
+            menu_data['CORNERNM'],
+            main_menu,  # 수정된 메인 메뉴 사용
+            menu_data['MENU']
+        )
+        # None이 아닌 부가 메뉴만 사용
+        sub_names = [sub['MENUNM'] for sub in sub_menus if sub.get('MENUNM')]
+        return key, row, sub_names
+
+    @staticmethod
+    def _content_hash(row: Tuple[str, str, str, str], sub_names: List[str]) -> str:
+        """메인 메뉴 정보와 부가 메뉴 목록(순서 포함)의 해시"""
+        content = json.dumps([list(row), sub_names], ensure_ascii=False)
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def _fetch_menu_rows(self, cursor: sqlite3.Cursor, site: str, dates: Iterable[str]) -> Dict[Tuple[str, str, str, str], Tuple[int, Optional[str]]]:
+        """사업장의 주어진 날짜들의 메인 메뉴를 (site, date, meal_type, corner) 키로 조회해 (id, content_hash) 반환"""
+        rows = {}
+        dates = sorted(set(dates))
+        for i in range(0, len(dates), SQL_PARAM_CHUNK):
+            chunk = dates[i:i + SQL_PARAM_CHUNK]
+            cursor.execute(f'''
+                SELECT id, date, meal_type, corner, content_hash
+                FROM main_menu
+                WHERE site = ? AND date IN ({",".join("?" * len(chunk))})
+            ''', [site] + chunk)
+            for menu_id, date, meal_type, corner, content_hash in cursor.fetchall():
+                rows[(site, date, meal_type, corner)] = (menu_id, content_hash)
+        return rows
+
+    def insert_menu_batch(self, menus: Iterable[Dict[str, Any]], site: Optional[str] = None) -> Optional[Dict[str, int]]:
+        """
+        API 응답의 메뉴 목록 전체를 하나의 연결, 하나의 트랜잭션으로 저장
+        (site, date, meal_type, corner)별 내용 해시를 비교해
+        새 메뉴는 추가하고, 내용이 바뀐 메뉴는 같은 행을 갱신하며 부가 메뉴를 통째로 교체하고,
+        바뀌지 않은 메뉴는 아무것도 쓰지 않음
+        added/changed/unchanged 건수와 필수 필드가 없어 건너뛴 skipped 건수를 반환하고,
+        오류 시 롤백 후 None 반환
+
+        Args:
+            menus: API 응답의 메뉴 목록
+            site: 메뉴를 가져온 사업장 코드 (기본값 DEFAULT_SITE)
+        """
+        site = site or DEFAULT_SITE
+        with METRICS.span('db_insert_batch', site=site) as span:
+            counts = self._write_menu_batch(menus, site)
+            span['ok'] = counts is not None
+        for result, count in (counts or {}).items():
+            METRICS.inc('menus', count, site=site, result=result)
+        return counts
+
+    def _write_menu_batch(self, menus: Iterable[Dict[str, Any]], site: str) -> Optional[Dict[str, int]]:
+        """insert_menu_batch의 실제 저장 처리"""
+        counts = {'added': 0, 'changed': 0, 'unchanged': 0, 'skipped': 0}
+
+        # 같은 응답 안에서 키가 중복되면 마지막 항목을 사용
+        prepared = {}
+        for menu_data in menus:
+            try:
+                key, row, sub_names = self._prepare_menu_row(menu_data, site)
+            except KeyError as e:
+                print(f"필수 필드 누락으로 건너뜀: {str(e)}")
+                counts['skipped'] += 1
+                continue
+            prepared[key] = (row, sub_names, self._content_hash(row, sub_names))
+
+        if not prepared:
+            return counts
+
+        try:
+            conn = self._get_connection()
             cursor = conn.cursor()
-            
-            # 메인 메뉴 테이블
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS main_menu (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT,
-                    meal_type TEXT,  -- 중식/석식
-                    meal_time TEXT,  -- 시간대 (예: 1120~1300)
-                    corner TEXT,     -- 코너 정보
-                    corner_name TEXT,-- 코너 이름
-                    main_menu TEXT,  -- 메인 메뉴 이름
-                    menu_code TEXT,  -- 메뉴 코드
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(date, meal_type, corner)
+            # 바뀐 메뉴가 없으면 읽기만 하고 끝내도록 먼저 해시만 조회 (쓰기 잠금 없음)
+            dates = [key[1] for key in prepared]
+            existing = self._fetch_menu_rows(cursor, site, dates)
+            if all(existing.get(key, (None, None))[1] == content_hash
+                   for key, (_, _, content_hash) in prepared.items()):
+                counts['unchanged'] += len(prepared)
+                return counts
+
+            with conn:
+                # 조회와 쓰기를 하나의 쓰기 트랜잭션으로 묶어 다시 비교
+                cursor.execute('BEGIN IMMEDIATE')
+                existing = self._fetch_menu_rows(cursor, site, dates)
+                now = int(time.time())
+
+                new_rows = []
+                changed_rows = []
+                changed_keys = []
+                for key, (row, sub_names, content_hash) in prepared.items():
+                    # 코너(메인 + 부가 메뉴)의 속성 태그
+                    tags = corner_tags(row[2], sub_names)
+                    if key not in existing:
+                        new_rows.append(key + row + (content_hash, now, tags))
+                    elif existing[key][1] != content_hash:
+                        changed_rows.append(row + (content_hash, now, tags, existing[key][0]))
+                        changed_keys.append(key)
+                    else:
+                        counts['unchanged'] += 1
+
+                # 메인 메뉴 일괄 삽입
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO main_menu
+                    (site, date, meal_type, corner, meal_time, corner_name, main_menu, menu_code,
+                     content_hash, updated_at, tags)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', new_rows)
+
+                # 바뀐 메뉴는 같은 행(ID 유지)을 갱신하고 부가 메뉴는 지운 뒤 다시 삽입
+                cursor.executemany('''
+                    UPDATE main_menu
+                    SET meal_time = ?, corner_name = ?, main_menu = ?, menu_code = ?,
+                        content_hash = ?, updated_at = ?, tags = ?
+                    WHERE id = ?
+                ''', changed_rows)
+                cursor.executemany(
+                    'DELETE FROM sub_menu WHERE main_menu_id = ?',
+                    [(row[-1],) for row in changed_rows]
                 )
-            ''')
-            
-            # 부가 메뉴 테이블
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS sub_menu (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    main_menu_id INTEGER,
-                    menu_name TEXT,
-                    FOREIGN KEY (main_menu_id) REFERENCES main_menu(id)
+
+                # 새로 삽입된 메인 메뉴의 ID를 한 번에 조회해 부가 메뉴 일괄 삽입
+                menu_ids = {key: menu_id for key, (menu_id, _) in existing.items()}
+                if new_rows:
+                    inserted = self._fetch_menu_rows(cursor, site, [row[1] for row in new_rows])
+                    menu_ids.update({row[:4]: inserted[row[:4]][0] for row in new_rows})
+                write_keys = [row[:4] for row in new_rows] + changed_keys
+                cursor.executemany('''
+                    INSERT INTO sub_menu (main_menu_id, menu_name)
+                    VALUES (?, ?)
+                ''', [(menu_ids[key], sub_name) for key in write_keys for sub_name in prepared[key][1]])
+
+                # 처음 나온 메뉴 이름(트리거로 dish_names에 추가됨)의 태그와 번역 키
+                names = {name for key in write_keys for name in [prepared[key][0][2], *prepared[key][1]] if name}
+                cursor.executemany('''
+                    UPDATE dish_names SET tags = COALESCE(tags, ?), canonical = COALESCE(canonical, ?)
+                    WHERE name = ? AND (tags IS NULL OR canonical IS NULL)
+                ''', [(tag_dish(name), canonical_key(name), name) for name in sorted(names)])
+
+                # 내용이 바뀐 날짜의 스냅샷은 지워서 다시 만들 때까지 원본 테이블에서 조회되게 함
+                cursor.executemany(
+                    'DELETE FROM menu_snapshots WHERE date = ?',
+                    [(date,) for date in sorted({key[1] for key in write_keys})]
                 )
-            ''')
-            
-            conn.commit()
 
-    def insert_menu_data(self, menu_data: Dict[str, Any]) -> bool:
+                counts['added'] += len(new_rows)
+                counts['changed'] += len(changed_rows)
+                return counts
+
+        except sqlite3.Error as e:
+            print(f"데이터베이스 오류: {str(e)}")
+            return None
+
+    def insert_menu_data(self, menu_data: Dict[str, Any], site: Optional[str] = None) -> bool:
         """
         메뉴 데이터를 데이터베이스에 삽입
-        이미 존재하는 데이터는 건너뜀
+        내용이 같은 기존 데이터는 건너뛰고, 바뀐 경우 갱신 (여러 건은 insert_menu_batch 사용)
         """
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # 샐러드 코너인 경우 특별 처리
-                is_salad = "샐러드" in menu_data.get('CORNERNM', '')
-                main_menu = menu_data['MENUNM']
-                sub_menus = []
-                
-                if is_salad:
-                    # 메인 메뉴가 음료인 경우, 서브메뉴에서 실제 샐러드 메뉴를 찾아 교체
-                    if main_menu in ['두유', '쥬스']:
-                        for sub in menu_data.get('SUB_MENU_INFO', []):
-                            sub_name = sub.get('MENUNM', '')
-                            if sub_name not in ['두유', '쥬스']:
-                                main_menu = sub_name
-                                break
-                    
-                    # 모든 서브메뉴 포함 (음료 포함)
-                    sub_menus = menu_data.get('SUB_MENU_INFO', [])
-                else:
-                    sub_menus = menu_data.get('SUB_MENU_INFO', [])
-                
-                # 메인 메뉴 정보 삽입
-                cursor.execute('''
-                    INSERT OR IGNORE INTO main_menu 
-                    (date, meal_type, meal_time, corner, corner_name, main_menu, menu_code)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    menu_data['OFFERDT'],
-                    menu_data['MEALCLASS_NM'],
-                    f"{menu_data['FR_TM']}~{menu_data['TO_TM']}",
-                    menu_data['CORNER'],
-                    menu_data['CORNERNM'],
-                    main_menu,  # 수정된 메인 메뉴 사용
-                    menu_data['MENU']
-                ))
-                
-                # 방금 삽입한 메인 메뉴의 ID 가져오기
-                main_menu_id = cursor.lastrowid
-                
-                # 부가 메뉴가 있고 새로운 메인 메뉴가 삽입된 경우에만 부가 메뉴 삽입
-                if main_menu_id and sub_menus:
-                    for sub_menu in sub_menus:
-                        if sub_menu.get('MENUNM'):  # None이 아닌 경우에만 삽입
-                            cursor.execute('''
-                                INSERT INTO sub_menu (main_menu_id, menu_name)
-                                VALUES (?, ?)
-                            ''', (main_menu_id, sub_menu['MENUNM']))
-                
-                conn.commit()
-                return True
-                
-        except sqlite3.Error as e:
-            print(f"데이터베이스 오류: {str(e)}")
-            return False
+        return self.insert_menu_batch([menu_data], site) is not None
 
-    def get_menu_by_date(self, date: str) -> Dict[str, List[Dict[str, Any]]]:
-        """특정 날짜의 메뉴 정보를 조회"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            result = {"중식": [], "석식": []}
-            
-            # 메인 메뉴와 부가 메뉴 조회
-            cursor.execute('''
-                SELECT m.*, GROUP_CONCAT(s.menu_name, '|') as sub_menus
+    def get_menu_by_date(self, date: str, lang: Optional[str] = None, site: Optional[str] = None,
+                         exclude_tags: int = 0, require_tags: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        특정 날짜의 메뉴 정보를 조회
+        lang을 지정하면 번역된 메인 메뉴 이름(translated_name), 설명(description),
+        부가 메뉴 번역 목록(translated_sub_menus)을 함께 조회 (번역이 없으면 None)
+        site를 지정하면 해당 사업장의 메뉴만 조회
+        exclude_tags/require_tags(dish_tags 비트마스크)로 코너를 거를 수 있음 (예: 돼지고기 제외, 채식만)
+        """
+        return self.get_menu_by_range(date, date, lang, site, exclude_tags, require_tags).get(
+            date, {"중식": [], "석식": []})
+
+    @METRICS.timed('db_menu_range')
+    def get_menu_by_range(self, start: str, end: str, lang: Optional[str] = None,
+                          site: Optional[str] = None, exclude_tags: int = 0,
+                          require_tags: int = 0) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """
+        start~end(포함) 기간의 메뉴를 하나의 쿼리로 조회해 날짜별로 반환
+        각 날짜의 값은 get_menu_by_date와 같은 형식이며, 메뉴가 없는 날짜는 포함되지 않음
+        exclude_tags의 태그가 하나라도 있거나 require_tags의 태그가 모두 있지 않은 코너는 제외
+        """
+        conn = self._get_connection()
+        result = {}
+
+        # 부가 메뉴는 [이름, 번역] 쌍의 JSON 배열로 모음 (이름/번역에 어떤 문자가 있어도 안전하고,
+        # 쌍을 SQL 안에서 만들므로 두 목록의 순서가 어긋나지 않음), 순서는 저장 순서(sub_menu.id)
+        cursor = conn.execute('''
+            SELECT m.*, t.translated_name, t.description,
+                   (SELECT json_group_array(json_array(x.menu_name, x.translated_name)) FROM (
+                        SELECT s.menu_name, st.translated_name
+                        FROM sub_menu s
+                        LEFT JOIN dish_names sd ON sd.name = s.menu_name
+                        LEFT JOIN menu_translations st
+                            ON st.menu_name = COALESCE(sd.canonical, s.menu_name) AND st.language = ?
+                        WHERE s.main_menu_id = m.id AND s.menu_name IS NOT NULL
+                        ORDER BY s.id
+                   ) x) AS sub_menus
+            FROM main_menu m
+            LEFT JOIN dish_names d ON d.name = m.main_menu
+            LEFT JOIN menu_translations t
+                ON t.menu_name = COALESCE(d.canonical, m.main_menu) AND t.language = ?
+            WHERE m.date BETWEEN ? AND ? AND (? IS NULL OR m.site = ?)
+              AND (COALESCE(m.tags, 0) & ?) = 0 AND (COALESCE(m.tags, 0) & ?) = ?
+            ORDER BY m.date, m.meal_type, m.site, m.corner
+        ''', (lang, lang, start, end, site, site, exclude_tags, require_tags, require_tags))
+
+        for row in cursor.fetchall():
+            menu_item = dict(row)
+            # 부가 메뉴 리스트로 변환 (lang이 없으면 번역은 모두 NULL이므로 번역 컬럼을 넣지 않음)
+            sub_menus = json.loads(menu_item.pop('sub_menus'))
+            menu_item['sub_menus'] = [name for name, _ in sub_menus]
+            if lang is None:
+                del menu_item['translated_name'], menu_item['description']
+            else:
+                menu_item['translated_sub_menus'] = [translated or None for _, translated in sub_menus]
+
+            day = result.setdefault(menu_item['date'], {"중식": [], "석식": []})
+            day.setdefault(menu_item['meal_type'], []).append(menu_item)
+
+        return result
+
+    def get_completed_windows(self, site: str) -> Dict[str, str]:
+        """사업장의 저장 완료된 조회 구간 {fr_dt: to_dt}"""
+        cursor = self._get_connection().execute(
+            'SELECT fr_dt, to_dt FROM crawl_windows WHERE site = ?', (site,)
+        )
+        return {fr_dt: to_dt for fr_dt, to_dt in cursor.fetchall()}
+
+    def get_window_hash(self, site: str, fr_dt: str) -> Optional[str]:
+        """마지막으로 저장한 구간 응답의 해시 (없으면 None)"""
+        row = self._get_connection().execute(
+            'SELECT response_hash FROM crawl_windows WHERE site = ? AND fr_dt = ?', (site, fr_dt)
+        ).fetchone()
+        return row[0] if row else None
+
+    def mark_windows_completed(self, site: str, windows: Iterable[Tuple[str, Optional[str], int, Optional[str]]]):
+        """
+        조회 구간을 저장 완료로 기록
+
+        Args:
+            site: 사업장 코드
+            windows: (fr_dt, to_dt, menu_count, response_hash) 목록
+        """
+        now = datetime.now().isoformat()
+        conn = self._get_connection()
+        with conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO crawl_windows (site, fr_dt, to_dt, menu_count, response_hash, completed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [(site, fr_dt, to_dt, count, digest, now) for fr_dt, to_dt, count, digest in windows])
+
+    def get_snapshots(self, dates: Iterable[str], lang: str) -> Dict[str, Tuple[str, bytes]]:
+        """날짜별 스냅샷 {date: (etag, 압축을 푼 JSON 본문)} (없는 날짜는 포함되지 않음)"""
+        dates = list(dates)
+        conn = self._get_connection()
+        result = {}
+        for i in range(0, len(dates), SQL_PARAM_CHUNK):
+            chunk = dates[i:i + SQL_PARAM_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            for row in conn.execute(f'''
+                SELECT date, etag, body FROM menu_snapshots
+                WHERE language = ? AND date IN ({placeholders})
+            ''', [lang] + chunk):
+                result[row['date']] = (row['etag'], zlib.decompress(row['body']))
+        return result
+
+    def get_snapshot_etags(self, dates: Iterable[str], lang: str) -> Dict[str, str]:
+        """날짜별 스냅샷 etag (본문은 읽지 않음)"""
+        dates = list(dates)
+        conn = self._get_connection()
+        result = {}
+        for i in range(0, len(dates), SQL_PARAM_CHUNK):
+            chunk = dates[i:i + SQL_PARAM_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            result.update(conn.execute(f'''
+                SELECT date, etag FROM menu_snapshots
+                WHERE language = ? AND date IN ({placeholders})
+            ''', [lang] + chunk).fetchall())
+        return result
+
+    def save_snapshots(self, lang: str, snapshots: Iterable[Tuple[str, str, bytes]]):
+        """
+        스냅샷 저장 (같은 날짜/언어는 교체)
+
+        Args:
+            lang: 언어 코드
+            snapshots: (date, etag, JSON 본문) 목록
+        """
+        now = int(time.time())
+        conn = self._get_connection()
+        with conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO menu_snapshots (date, language, body, etag, built_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(date, lang, zlib.compress(body), etag, now) for date, etag, body in snapshots])
+
+    def get_snapshot_stale_dates(self, lang: str, since_translation: int = 0) -> List[str]:
+        """
+        스냅샷을 다시 만들어야 하는 날짜
+        스냅샷이 없는 메뉴 날짜와, since_translation 이후(version)에 추가되거나 바뀐 lang 번역을 쓰는 날짜
+        """
+        cursor = self._get_connection().execute('''
+            SELECT DISTINCT m.date FROM main_menu m
+            WHERE NOT EXISTS (SELECT 1 FROM menu_snapshots s WHERE s.date = m.date AND s.language = ?)
+            UNION
+            SELECT m.date FROM menu_translations t
+            JOIN dish_names d ON d.canonical = t.menu_name
+            JOIN main_menu m ON m.main_menu = d.name
+            WHERE t.language = ? AND t.version > ?
+            UNION
+            SELECT m.date FROM menu_translations t
+            JOIN dish_names d ON d.canonical = t.menu_name
+            JOIN sub_menu s ON s.menu_name = d.name
+            JOIN main_menu m ON m.id = s.main_menu_id
+            WHERE t.language = ? AND t.version > ?
+            ORDER BY 1
+        ''', (lang, lang, since_translation, lang, since_translation))
+        return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def _search_expression(query: str, lang: Optional[str]) -> Optional[str]:
+        """
+        FTS5 검색식 (단어마다 따옴표로 감싼 부분 문자열을 AND로 묶음)
+        trigram 색인은 3글자 이상만 찾을 수 있으므로 짧은 단어만 있으면 None
+        """
+        terms = [term for term in query.split() if len(term) >= SEARCH_MIN_TERM]
+        if not terms:
+            return None
+        expression = ' AND '.join('"' + term.replace('"', '""') + '"' for term in terms)
+        if lang in SEARCH_LANGUAGES:
+            # 한국어 이름과 해당 언어 번역에서만 찾음
+            expression = f'{{ko {lang}}} : ({expression})'
+        return expression
+
+    def _search_dishes(self, query: str, lang: Optional[str], limit: int) -> List[Tuple[str, float]]:
+        """검색어와 맞는 메뉴 이름과 순위 점수(작을수록 관련도 높음) 목록"""
+        conn = self._get_connection()
+        expression = self._search_expression(query, lang)
+        if expression is not None:
+            return [tuple(row) for row in conn.execute('''
+                SELECT d.name, bm25(menu_search) AS rank
+                FROM menu_search JOIN dish_names d ON d.id = menu_search.rowid
+                WHERE menu_search MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            ''', (expression, limit))]
+
+        # 짧은 검색어는 LIKE로 찾고, 이름이 짧을수록(검색어와 가까울수록) 앞에 둠
+        pattern = '%' + query.strip().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        return [tuple(row) for row in conn.execute('''
+            SELECT name, MIN(LENGTH(text)) AS rank FROM (
+                SELECT name, name AS text FROM dish_names WHERE name LIKE ? ESCAPE '\\'
+                UNION ALL
+                SELECT d.name, t.translated_name FROM menu_translations t
+                JOIN dish_names d ON d.canonical = t.menu_name
+                WHERE (? IS NULL OR t.language = ?) AND t.translated_name LIKE ? ESCAPE '\\'
+            )
+            GROUP BY name
+            ORDER BY rank
+            LIMIT ?
+        ''', (pattern, lang, lang, pattern, limit))]
+
+    @METRICS.timed('db_search')
+    def search(self, query: str, lang: Optional[str] = None, date_range: Optional[Tuple[str, str]] = None,
+               limit: int = 50, today: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        메뉴 이름(한국어, 번역 이름/설명)으로 메뉴가 나오는 날짜 검색
+
+        Args:
+            query: 검색어 (예: '김치찌개', 'kimchi stew')
+            lang: 번역 언어 ('en', 'zh', 'sv') - 지정하면 한국어와 해당 언어에서만 찾고 번역 이름을 함께 반환
+            date_range: (start, end) YYYYMMDD 기간 (없으면 전체)
+            limit: 최대 결과 수
+            today: 다가오는 날짜를 판단할 기준일 (기본값 오늘)
+
+        Returns:
+            관련도 순, 같은 메뉴 안에서는 다가오는 날짜(가까운 순) 다음 지난 날짜(최근 순)로 정렬된
+            {'menu_name', 'translated_name', 'date', 'meal_type', 'site', 'corner_name', 'main_menu', 'is_main'} 목록
+        """
+        if not query.strip():
+            return []
+        today = today or datetime.now().strftime("%Y%m%d")
+        start, end = date_range or ('', '99999999')
+        ranks = dict(self._search_dishes(query, lang, SEARCH_MAX_DISHES))
+        if not ranks:
+            return []
+
+        conn = self._get_connection()
+        names = list(ranks)
+        occurrences = []
+        for i in range(0, len(names), SQL_PARAM_CHUNK):
+            chunk = names[i:i + SQL_PARAM_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            occurrences.extend(dict(row) for row in conn.execute(f'''
+                SELECT m.main_menu AS menu_name, m.date, m.meal_type, m.site, m.corner_name,
+                       m.main_menu, 1 AS is_main
                 FROM main_menu m
-                LEFT JOIN sub_menu s ON m.id = s.main_menu_id
-                WHERE m.date = ?
-                GROUP BY m.id
-                ORDER BY m.meal_type, m.corner
-            ''', (date,))
-            
-            for row in cursor.fetchall():
-                menu_item = dict(row)
-                # 부가 메뉴 리스트로 변환
-                sub_menus = menu_item.pop('sub_menus')
-                menu_item['sub_menus'] = sub_menus.split('|') if sub_menus else []
-                
-                result[menu_item['meal_type']].append(menu_item)
-            
-            return result
+                WHERE m.main_menu IN ({placeholders}) AND m.date BETWEEN ? AND ?
+                UNION ALL
+                SELECT s.menu_name, m.date, m.meal_type, m.site, m.corner_name, m.main_menu, 0
+                FROM sub_menu s JOIN main_menu m ON m.id = s.main_menu_id
+                WHERE s.menu_name IN ({placeholders}) AND m.date BETWEEN ? AND ?
+            ''', chunk + [start, end] + chunk + [start, end]))
+
+        def order(item: Dict[str, Any]):
+            upcoming = item['date'] >= today
+            # 다가오는 날짜는 오름차순, 지난 날짜는 내림차순
+            return (ranks[item['menu_name']], not upcoming,
+                    int(item['date']) if upcoming else -int(item['date']), not item['is_main'])
+
+        occurrences.sort(key=order)
+        occurrences = occurrences[:limit]
+
+        translations = {}
+        if lang is not None and occurrences:
+            found = sorted({item['menu_name'] for item in occurrences})
+            placeholders = ','.join('?' * len(found))
+            translations = dict(conn.execute(f'''
+                SELECT d.name, t.translated_name FROM dish_names d
+                JOIN menu_translations t ON t.menu_name = COALESCE(d.canonical, d.name)
+                WHERE t.language = ? AND d.name IN ({placeholders})
+            ''', [lang] + found).fetchall())
+        for item in occurrences:
+            item['is_main'] = bool(item['is_main'])
+            item['translated_name'] = translations.get(item['menu_name'])
+        return occurrences
+
+    def get_sync_state(self, name: str, default: int = 0) -> int:
+        """sync_state에 기록된 진행 위치"""
+        row = self._get_connection().execute('SELECT value FROM sync_state WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else default
+
+    def set_sync_state(self, name: str, value: int):
+        conn = self._get_connection()
+        with conn:
+            conn.execute('''
+                INSERT INTO sync_state (name, value, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            ''', (name, value, datetime.now().isoformat()))
 
     def get_latest_menu_date(self) -> str:
         """가장 최근 메뉴 날짜 조회"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT MAX(date) FROM main_menu')
-            return cursor.fetchone()[0] or ''
+        cursor = self._get_connection().execute('SELECT MAX(date) FROM main_menu')
+        return cursor.fetchone()[0] or ''
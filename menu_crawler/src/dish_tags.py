@@ -0,0 +1,170 @@
+"""
+메뉴 속성(알레르기/식단) 태그
+
+메뉴 이름의 키워드로 돼지고기, 소고기, 해산물, 견과류, 유제품, 매운 음식 등을 판단해 비트마스크로 나타낸다.
+채식(vegetarian)은 키워드가 없다는 것으로는 알 수 없으므로 (예: 부대찌개, 감자탕, 잡채) 채식으로 확인한
+메뉴(VEGETARIAN_DISHES)에만 붙이고, 모르는 메뉴는 채식이 아닌 것으로 본다.
+이름마다 한 번만 계산해 dish_names.tags에, 코너(메인 + 부가 메뉴)를 합친 값은 main_menu.tags에 저장하므로
+조회 시에는 (tags & 제외 마스크) = 0 조건 하나로 거를 수 있다.
+키워드를 바꾸면 TAGGER_VERSION을 올려 저장된 태그를 다시 계산하게 한다.
+"""
+import sqlite3
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+from menu_names import canonical_key, split_key
+
+# 비트 순서 (저장된 값의 의미가 바뀌므로 뒤에만 추가)
+TAGS = ('pork', 'beef', 'chicken', 'meat', 'seafood', 'nuts', 'dairy', 'egg', 'wheat', 'spicy', 'vegetarian')
+TAG_BITS = {tag: 1 << index for index, tag in enumerate(TAGS)}
+
+# 이 중 하나라도 있으면 채식이 아님
+ANIMAL_TAGS = ('pork', 'beef', 'chicken', 'meat', 'seafood')
+ANIMAL_MASK = sum(TAG_BITS[tag] for tag in ANIMAL_TAGS)
+VEGETARIAN = TAG_BITS['vegetarian']
+
+# 태그별 키워드 (메뉴 이름에 포함되면 해당 태그)
+KEYWORDS: Dict[str, tuple] = {
+    'pork': ('돼지', '돈육', '제육', '삼겹', '목살', '돈까스', '돈가스', '돈카츠', '보쌈', '족발', '순대',
+             '햄', '베이컨', '소시지', '소세지', '동그랑땡', '탕수육', '두루치기', '부대찌개', '감자탕',
+             '뼈해장'),
+    'beef': ('소고기', '쇠고기', '한우', '우육', '불고기', '차돌', '사골', '육개장', '장조림', '우삼겹',
+             '갈비탕', '소불고기', '스테이크', '미트볼', '함박'),
+    'chicken': ('닭', '치킨', '계육', '삼계', '찜닭', '너겟', '너깃'),
+    'meat': ('고기', '육전', '떡갈비', '갈비', '편육', '만두'),
+    'seafood': ('생선', '고등어', '삼치', '갈치', '꽁치', '연어', '참치', '명태', '동태', '코다리', '황태',
+                '오징어', '낙지', '쭈꾸미', '주꾸미', '문어', '새우', '조개', '바지락', '홍합', '굴',
+                '꽃게', '대게', '게살', '게맛살', '게장', '맛살', '어묵', '멸치', '해물', '해산물', '까나리',
+                '장어', '가자미', '조기', '임연수', '꼬막', '전복', '날치알', '명란', '액젓'),
+    'nuts': ('땅콩', '호두', '아몬드', '잣', '견과', '캐슈', '피스타치오', '피칸', '헤이즐넛'),
+    'dairy': ('우유', '치즈', '크림', '버터', '요거트', '요구르트', '라떼', '밀크', '연유', '그라탕'),
+    'egg': ('계란', '달걀', '에그', '오믈렛', '메추리알', '마요', '지단'),
+    'wheat': ('빵', '국수', '라면', '우동', '짜장면', '짬뽕', '칼국수', '수제비', '파스타', '스파게티',
+              '튀김', '까스', '가스', '만두', '토스트', '와플', '케이크', '쿠키', '부침', '전병', '소면', '쫄면'),
+    'spicy': ('매운', '매콤', '얼큰', '고추', '김치', '제육', '떡볶이', '마라', '짬뽕', '불닭', '육개장',
+              '닭볶음탕', '고추장', '두루치기', '쭈꾸미', '주꾸미', '낙지볶음', '비빔', '겉절이', '깍두기'),
+}
+
+# 키워드에 걸리지만 해당 태그가 아닌 이름 (키워드 검사 전에 지움)
+EXCEPTIONS: Dict[str, tuple] = {
+    'pork': ('햄버거', '햄버그'),
+    'wheat': ('가스파초',),
+}
+
+# 채식으로 확인한 메뉴 (정규화한 키 전체가 일치해야 함)
+# 김치류와 계란찜은 젓갈이, 국/찌개는 육수가 들어가는 경우가 많아 넣지 않음
+VEGETARIAN_DISHES = frozenset({
+    '쌀밥', '흰밥', '백미밥', '잡곡밥', '현미밥', '흑미밥', '보리밥', '콩밥', '기장밥', '귀리밥', '오곡밥',
+    '두부조림', '두부부침', '연두부', '순두부', '감자조림', '감자채볶음', '우엉조림', '연근조림',
+    '콩자반', '콩조림', '땅콩조림', '계란말이', '계란후라이', '달걀말이', '스크램블에그',
+    '산채비빔밥', '야채비빔밥', '야채볶음밥', '채소볶음밥',
+    '도토리묵', '청포묵', '도토리묵무침', '오이무침', '도라지무침', '무생채', '무나물', '콩나물무침',
+    '숙주나물', '시금치나물', '고사리나물', '가지나물', '호박나물', '취나물', '비름나물', '나물',
+    '애호박볶음', '가지볶음', '버섯볶음', '브로콜리', '찐감자', '찐고구마', '군고구마', '옥수수',
+    '그린샐러드', '양배추샐러드', '과일샐러드', '단호박샐러드', '샐러드바',
+    '과일', '사과', '배', '귤', '오렌지', '바나나', '포도', '수박', '참외', '키위', '파인애플', '방울토마토',
+    '요거트', '요구르트', '우유', '두유', '식혜', '수정과', '주스',
+})
+# 이 말로 끝나는 이름도 채식으로 봄 (고기/해산물 키워드가 있으면 제외됨)
+VEGETARIAN_SUFFIXES = ('나물',)
+
+# 저장된 태그를 만든 키워드 버전 (sync_state 키)
+TAGGER_VERSION = 2
+TAGGER_VERSION_KEY = 'dish_tags.version'
+
+
+def _known_vegetarian(name: str) -> bool:
+    """채식으로 확인한 메뉴인지 (세트 메뉴는 구성 메뉴가 모두 채식이어야 함)"""
+    parts = split_key(canonical_key(name))
+    return bool(parts) and all(part in VEGETARIAN_DISHES or part.endswith(VEGETARIAN_SUFFIXES) for part in parts)
+
+
+@lru_cache(maxsize=20000)
+def tag_dish(name: Optional[str]) -> int:
+    """메뉴 이름 하나의 태그 비트마스크 (채식으로 확인한 메뉴이고 고기/해산물이 없을 때만 vegetarian)"""
+    mask = 0
+    for tag, keywords in KEYWORDS.items():
+        text = name or ''
+        for word in EXCEPTIONS.get(tag, ()):
+            text = text.replace(word, '')
+        if any(keyword in text for keyword in keywords):
+            mask |= TAG_BITS[tag]
+    if name and not mask & ANIMAL_MASK and _known_vegetarian(name):
+        mask |= VEGETARIAN
+    return mask
+
+
+def combine(masks: Iterable[int]) -> int:
+    """여러 메뉴(한 코너)의 태그 합치기 - vegetarian은 모든 메뉴가 vegetarian일 때만"""
+    mask = 0
+    vegetarian = None
+    for value in masks:
+        mask |= value & ~VEGETARIAN
+        vegetarian = (vegetarian is not False) and bool(value & VEGETARIAN)
+    if vegetarian and not mask & ANIMAL_MASK:
+        mask |= VEGETARIAN
+    return mask
+
+
+def corner_tags(main_menu: Optional[str], sub_menus: Iterable[str]) -> int:
+    """메인 메뉴와 부가 메뉴를 합친 코너의 태그"""
+    return combine(tag_dish(name) for name in [main_menu, *sub_menus] if name)
+
+
+def tag_names(mask: Optional[int]) -> List[str]:
+    """비트마스크를 태그 이름 목록으로"""
+    return [tag for tag in TAGS if (mask or 0) & TAG_BITS[tag]]
+
+
+def parse_tags(value: Optional[str]) -> int:
+    """'pork,nuts' 형식의 태그 목록을 비트마스크로 (알 수 없는 태그는 ValueError)"""
+    mask = 0
+    for tag in (value or '').split(','):
+        tag = tag.strip().lower()
+        if not tag:
+            continue
+        if tag not in TAG_BITS:
+            raise ValueError(f"Unknown tag: {tag}")
+        mask |= TAG_BITS[tag]
+    return mask
+
+
+def refresh_tags(conn: sqlite3.Connection, full: bool = False) -> Dict[str, int]:
+    """
+    태그가 없는 메뉴 이름/코너의 태그 계산 (키워드 버전이 바뀌었거나 full이면 전체)
+
+    Returns:
+        dishes(메뉴 이름 수), corners(코너 수)
+    """
+    row = conn.execute('SELECT value FROM sync_state WHERE name = ?', (TAGGER_VERSION_KEY,)).fetchone()
+    outdated = row is None or row[0] != TAGGER_VERSION
+    full = full or outdated
+    condition = '' if full else 'WHERE tags IS NULL'
+
+    dishes = conn.execute(f'SELECT id, name FROM dish_names {condition}').fetchall()
+    corners = conn.execute(f'''
+        SELECT m.id, m.main_menu, GROUP_CONCAT(s.menu_name, '|')
+        FROM main_menu m LEFT JOIN sub_menu s ON s.main_menu_id = m.id
+        {condition.replace('tags', 'm.tags')}
+        GROUP BY m.id
+    ''').fetchall()
+
+    with conn:
+        conn.executemany('UPDATE dish_names SET tags = ? WHERE id = ?',
+                         [(tag_dish(name), dish_id) for dish_id, name in dishes])
+        conn.executemany('UPDATE main_menu SET tags = ? WHERE id = ?', [
+            (corner_tags(main_menu, sub_menus.split('|') if sub_menus else []), menu_id)
+            for menu_id, main_menu, sub_menus in corners
+        ])
+        if full:
+            # 응답에 태그가 들어 있으므로 스냅샷도 다시 만들게 함
+            conn.execute('DELETE FROM menu_snapshots')
+        if outdated:
+            conn.execute('''
+                INSERT INTO sync_state (name, value, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            ''', (TAGGER_VERSION_KEY, TAGGER_VERSION, datetime.now().isoformat()))
+
+    if dishes or corners:
+        print(f"메뉴 태그 계산: 메뉴 이름 {len(dishes)}개, 코너 {len(corners)}개")
+    return {'dishes': len(dishes), 'corners': len(corners)}
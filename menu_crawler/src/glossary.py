@@ -0,0 +1,221 @@
+"""
+메뉴 구성 요소 용어집 (로컬 번역)
+
+구내식당 메뉴는 대부분 재료/조리법/음식 종류를 이어 붙인 이름이라 (예: 팝콘치킨샐러드 = 팝콘 + 치킨 + 샐러드)
+이미 알고 있는 구성 요소만으로 이루어진 이름은 LLM을 호출하지 않고 바로 번역할 수 있다.
+용어집은 직접 정리한 구성 요소(CURATED)와 menu_translations에 저장된 번역(학습)으로 트라이를 만들고,
+이름을 가장 적은 수의(같으면 앞부분이 가장 긴) 구성 요소로 나눠 번역을 이어 붙인다.
+나눌 수 없는 이름만 LLM으로 보낸다.
+
+한 글자 용어(국, 탕, 밥 등)는 이름의 끝(음식 종류)이 될 수 없다. 감자탕(돼지 등뼈 찜), 국밥처럼
+한 글자로 끝나는 이름은 글자 그대로 이어 붙이면 틀린 번역이 되기 쉬워 LLM에 맡긴다.
+구성 요소로 나뉘지만 하나의 음식 이름으로 굳어진 메뉴(LEXICALISED)가 들어 있는 이름도 LLM에 맡긴다.
+용어집 번역은 source = 'glossary'로 저장되며 학습에 쓰지 않는다 (LLM 번역이 나오면 덮어씀).
+
+조리법(볶음, 구이 등)처럼 번역에서 앞에 오는 구성 요소는 '{}'가 들어간 틀로 적는다 (예: 'Grilled {}').
+"""
+import re
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+# 구성 요소 번역 (언어별, '{}'는 앞 구성 요소들의 번역이 들어갈 자리)
+CURATED: Dict[str, Dict[str, str]] = {
+    # 재료
+    '치킨': {'en': 'Chicken', 'zh': '鸡肉', 'sv': 'Kyckling'},
+    '닭': {'en': 'Chicken', 'zh': '鸡', 'sv': 'Kyckling'},
+    '돼지고기': {'en': 'Pork', 'zh': '猪肉', 'sv': 'Fläsk'},
+    '소고기': {'en': 'Beef', 'zh': '牛肉', 'sv': 'Nötkött'},
+    '불고기': {'en': 'Bulgogi', 'zh': '烤肉', 'sv': 'Bulgogi'},
+    '햄': {'en': 'Ham', 'zh': '火腿', 'sv': 'Skinka'},
+    '두부': {'en': 'Tofu', 'zh': '豆腐', 'sv': 'Tofu'},
+    '김치': {'en': 'Kimchi', 'zh': '泡菜', 'sv': 'Kimchi'},
+    '감자': {'en': 'Potato', 'zh': '土豆', 'sv': 'Potatis'},
+    '고구마': {'en': 'Sweet Potato', 'zh': '红薯', 'sv': 'Sötpotatis'},
+    '계란': {'en': 'Egg', 'zh': '鸡蛋', 'sv': 'Ägg'},
+    '어묵': {'en': 'Fish Cake', 'zh': '鱼饼', 'sv': 'Fiskkaka'},
+    '새우': {'en': 'Shrimp', 'zh': '虾', 'sv': 'Räkor'},
+    '오징어': {'en': 'Squid', 'zh': '鱿鱼', 'sv': 'Bläckfisk'},
+    '고등어': {'en': 'Mackerel', 'zh': '鲭鱼', 'sv': 'Makrill'},
+    '참치': {'en': 'Tuna', 'zh': '金枪鱼', 'sv': 'Tonfisk'},
+    '버섯': {'en': 'Mushroom', 'zh': '蘑菇', 'sv': 'Svamp'},
+    '야채': {'en': 'Vegetable', 'zh': '蔬菜', 'sv': 'Grönsaker'},
+    '콩나물': {'en': 'Bean Sprout', 'zh': '豆芽', 'sv': 'Böngroddar'},
+    '시금치': {'en': 'Spinach', 'zh': '菠菜', 'sv': 'Spenat'},
+    '미역': {'en': 'Seaweed', 'zh': '海带', 'sv': 'Sjögräs'},
+    '된장': {'en': 'Soybean Paste', 'zh': '大酱', 'sv': 'Sojabönpasta'},
+    '카레': {'en': 'Curry', 'zh': '咖喱', 'sv': 'Curry'},
+    '치즈': {'en': 'Cheese', 'zh': '奶酪', 'sv': 'Ost'},
+    '팝콘': {'en': 'Popcorn', 'zh': '爆米花', 'sv': 'Popcorn'},
+    '떡': {'en': 'Rice Cake', 'zh': '年糕', 'sv': 'Riskaka'},
+    # 음식 종류
+    '샐러드': {'en': 'Salad', 'zh': '沙拉', 'sv': 'Sallad'},
+    '밥': {'en': 'Rice', 'zh': '饭', 'sv': 'Ris'},
+    '볶음밥': {'en': 'Fried Rice', 'zh': '炒饭', 'sv': 'Stekt ris'},
+    '덮밥': {'en': 'Rice Bowl', 'zh': '盖饭', 'sv': 'Risskål'},
+    '국수': {'en': 'Noodles', 'zh': '面条', 'sv': 'Nudlar'},
+    '우동': {'en': 'Udon', 'zh': '乌冬面', 'sv': 'Udon'},
+    '라면': {'en': 'Ramyeon', 'zh': '拉面', 'sv': 'Ramen'},
+    '국': {'en': 'Soup', 'zh': '汤', 'sv': 'Soppa'},
+    '탕': {'en': 'Soup', 'zh': '汤', 'sv': 'Soppa'},
+    '찌개': {'en': 'Stew', 'zh': '炖汤', 'sv': 'Gryta'},
+    '전': {'en': 'Pancake', 'zh': '煎饼', 'sv': 'Pannkaka'},
+    '돈까스': {'en': 'Pork Cutlet', 'zh': '炸猪排', 'sv': 'Fläskschnitzel'},
+    # 조리법
+    '볶음': {'en': 'Stir-fried {}', 'zh': '炒{}', 'sv': 'Wokad {}'},
+    '구이': {'en': 'Grilled {}', 'zh': '烤{}', 'sv': 'Grillad {}'},
+    '조림': {'en': 'Braised {}', 'zh': '炖{}', 'sv': 'Bräserad {}'},
+    '튀김': {'en': 'Fried {}', 'zh': '炸{}', 'sv': 'Friterad {}'},
+    '무침': {'en': 'Seasoned {}', 'zh': '凉拌{}', 'sv': 'Marinerad {}'},
+    '찜': {'en': 'Steamed {}', 'zh': '蒸{}', 'sv': 'Ångkokt {}'},
+}
+
+# 번역을 이어 붙이는 문자열 (없는 언어는 공백)
+JOINERS = {'zh': ''}
+# 첫 구성 요소 외에는 소문자로 쓰는 언어
+LOWERCASE_INNER = ('sv',)
+
+# 학습에 쓰는 번역의 조건 (한글만, 2글자 이상 - 한 글자 구성 요소는 CURATED에만 둠)
+LEARNABLE = re.compile(r'[가-힣]{2,}')
+# 로컬 번역을 시도하는 이름 (한글만)
+RESOLVABLE = re.compile(r'[가-힣]+')
+
+# 구성 요소의 뜻을 이어 붙이면 틀린 번역이 되는 음식 이름 (이 이름이 들어 있으면 나누지 않음)
+# 예: 감자탕은 감자 국이 아니라 돼지 등뼈 찜, 두부김치는 볶은 김치와 데친 두부
+LEXICALISED = (
+    '감자탕', '국밥', '해장국', '닭볶음탕', '부대찌개', '두부김치', '닭갈비', '떡갈비', '떡볶이', '김치찜',
+)
+
+# 이름의 끝이 될 수 있는 용어의 최소 글자 수
+MIN_FINAL_LENGTH = 2
+
+# menu_translations.source 값
+SOURCE = 'glossary'
+
+# 이보다 많은 구성 요소로 나뉘면 이어 붙인 번역을 믿기 어려우므로 LLM에 맡김
+MAX_PIECES = 4
+
+# 트라이 노드에서 이 위치에서 끝나는 용어의 번역을 담는 키
+_TERM = ''
+
+
+class Glossary:
+    """구성 요소 용어집 트라이와 가장 긴 일치 우선 분해"""
+
+    def __init__(self, curated: Optional[Dict[str, Dict[str, str]]] = None):
+        self.curated = CURATED if curated is None else curated
+        self._root: Dict[str, dict] = {}
+        self.size = 0
+        for term, translations in self.curated.items():
+            self.add(term, translations)
+
+    def add(self, term: str, translations: Dict[str, str], override: bool = True):
+        """용어 추가 (override=False면 이미 있는 언어의 번역은 유지)"""
+        node = self._root
+        for char in term:
+            node = node.setdefault(char, {})
+        entry = node.get(_TERM)
+        if entry is None:
+            entry = node[_TERM] = {}
+            self.size += 1
+        for lang, translated in translations.items():
+            if override or lang not in entry:
+                entry[lang] = translated
+
+    def load(self, conn: sqlite3.Connection) -> int:
+        """
+        menu_translations의 번역을 학습 (직접 정리한 구성 요소가 우선, 용어집으로 만든 번역은 제외)
+        다시 부르면 직접 정리한 구성 요소부터 새로 만든다
+
+        Returns:
+            학습한 (이름, 언어) 번역 수
+        """
+        self._root, self.size = {}, 0
+        for term, translations in self.curated.items():
+            self.add(term, translations)
+        learned = 0
+        for name, lang, translated in conn.execute(
+            'SELECT menu_name, language, translated_name FROM menu_translations '
+            'WHERE translated_name IS NOT NULL AND source IS NOT ?', (SOURCE,)
+        ):
+            if LEARNABLE.fullmatch(name) and '{}' not in translated:
+                self.add(name, {lang: translated}, override=False)
+                learned += 1
+        return learned
+
+    def _matches(self, text: str, start: int, lang: str) -> List[Tuple[int, str]]:
+        """text[start:]의 앞부분과 일치하는 용어의 (끝 위치, lang 번역) 목록"""
+        matches = []
+        node = self._root
+        for end in range(start, len(text)):
+            node = node.get(text[end])
+            if node is None:
+                break
+            translated = node.get(_TERM, {}).get(lang)
+            if translated is not None:
+                matches.append((end + 1, translated))
+        return matches
+
+    def decompose(self, text: str, lang: str) -> Optional[List[str]]:
+        """
+        text 전체를 덮는 가장 적은 수의 용어로 나눈 번역 목록 (같은 수면 앞 용어가 긴 쪽)
+        나눌 수 없거나, MAX_PIECES개를 넘거나, 한 글자 용어로만 끝낼 수 있으면 None
+        """
+        # best[i]: text[i:]를 덮는 (용어 수, 번역 목록)
+        best: List[Optional[Tuple[int, List[str]]]] = [None] * (len(text) + 1)
+        best[len(text)] = (0, [])
+        for start in range(len(text) - 1, -1, -1):
+            # 긴 용어부터 보므로 용어 수가 같으면 먼저 찾은(긴) 쪽이 남음
+            for end, translated in reversed(self._matches(text, start, lang)):
+                if end == len(text) and end - start < MIN_FINAL_LENGTH:
+                    continue
+                rest = best[end]
+                if rest is not None and (best[start] is None or rest[0] + 1 < best[start][0]):
+                    best[start] = (rest[0] + 1, [translated] + rest[1])
+        if best[0] is None or best[0][0] > MAX_PIECES:
+            return None
+        return best[0][1]
+
+    @staticmethod
+    def compose(pieces: List[str], lang: str) -> Optional[str]:
+        """구성 요소 번역을 이어 붙임 (틀은 앞 구성 요소들의 번역을 감쌈, 틀로 시작하면 None)"""
+        joiner = JOINERS.get(lang, ' ')
+        result = ''
+        lowercase = lang in LOWERCASE_INNER
+        for piece in pieces:
+            if '{}' in piece:
+                if not result:
+                    return None
+                result = piece.format(result[:1].lower() + result[1:] if lowercase else result)
+            elif result:
+                result += joiner + (piece[:1].lower() + piece[1:] if lowercase else piece)
+            else:
+                result = piece
+        return result
+
+    def translate(self, name: str, lang: str) -> Optional[Dict]:
+        """용어로만 이루어진 이름의 번역 {'translated', 'description'} (나눌 수 없으면 None)"""
+        if not RESOLVABLE.fullmatch(name or '') or any(word in name for word in LEXICALISED):
+            return None
+        pieces = self.decompose(name, lang)
+        translated = self.compose(pieces, lang) if pieces else None
+        if translated is None:
+            return None
+        return {'translated': translated, 'description': None}
+
+    def resolve(self, pending: Dict[str, List[str]]) -> Tuple[List[Tuple[str, str, Dict]], Dict[str, List[str]]]:
+        """
+        번역할 (이름, 언어) 중 용어집으로 번역할 수 있는 것을 번역
+
+        Returns:
+            ((이름, 언어, 번역) 목록, 용어집으로 번역하지 못해 LLM에 보낼 이름별 언어)
+        """
+        resolved = []
+        remaining = {}
+        for name, langs in pending.items():
+            for lang in langs:
+                translation = self.translate(name, lang)
+                if translation is None:
+                    remaining.setdefault(name, []).append(lang)
+                else:
+                    resolved.append((name, lang, translation))
+        return resolved, remaining
@@ -0,0 +1,92 @@
+"""
+JSON 배열 점진 파서
+
+LLM 응답을 스트리밍으로 받을 때 배열 원소(객체)가 닫히는 즉시 꺼내 쓰기 위한 파서.
+응답이 max_tokens에서 잘려도 그때까지 닫힌 원소는 모두 얻을 수 있다.
+배열 앞뒤의 설명 문장이나 코드 블록 표시(```json)는 무시하고, 배열 안의 객체가 아닌 값과
+형식이 잘못된 객체는 건너뛴다.
+
+    parser = JsonArrayParser()
+    for chunk in chunks:
+        for item in parser.feed(chunk):
+            ...
+"""
+import json
+from typing import Any, Dict, List
+
+
+class JsonArrayParser:
+    """최상위 JSON 배열의 객체 원소를 조각 단위 입력에서 하나씩 꺼내는 파서"""
+
+    def __init__(self):
+        # '['를 만났는지, 최상위 배열의 ']'를 만났는지
+        self.started = False
+        self.closed = False
+        # 건너뛴(형식이 잘못된) 원소 수
+        self.skipped = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._element: List[str] = []
+
+    @property
+    def pending(self) -> bool:
+        """닫히지 않은 원소가 남아 있는지 (응답이 중간에 잘린 경우)"""
+        return self._depth > 0
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """입력 조각을 읽고 이번에 닫힌 객체 원소 목록 반환"""
+        items = []
+        for char in text:
+            if self.closed:
+                break
+            if not self.started:
+                self.started = char == '['
+                continue
+            if self._depth:
+                self._element.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif self._depth == 0:
+                # 원소 사이 (쉼표, 공백, 객체가 아닌 값)
+                if char == '{':
+                    self._depth = 1
+                    self._element = [char]
+                elif char == ']':
+                    self.closed = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(items)
+        return items
+
+    def _emit(self, items: List[Dict[str, Any]]):
+        try:
+            items.append(json.loads(''.join(self._element)))
+        except ValueError:
+            self.skipped += 1
+        self._element = []
+
+
+def parse_json_array(text: str) -> List[Dict[str, Any]]:
+    """
+    응답 전체에서 배열의 객체 원소 목록 (잘린 응답이면 닫힌 원소까지)
+
+    Raises:
+        ValueError: 응답에 JSON 배열이 없음
+    """
+    parser = JsonArrayParser()
+    items = parser.feed(text)
+    if not parser.started:
+        raise ValueError(f"Invalid response format: {text}")
+    return items
@@ -7,6 +7,13 @@ class MenuDisplay:
     def __init__(self):
         self.db = MenuDatabase()
         self.today = datetime.now().strftime("%Y%m%d")
+        self._today_menu = None
+
+    def _get_today_menu(self) -> Dict[str, List[Dict[str, Any]]]:
+        """오늘 메뉴를 한 번만 조회하고 이후에는 재사용"""
+        if self._today_menu is None:
+            self._today_menu = self.db.get_menu_by_date(self.today)
+        return self._today_menu
         
     def _format_menu_item(self, menu: Dict[str, Any], indent: int = 0) -> str:
         """메뉴 항목을 보기 좋게 포맷팅"""
@@ -36,7 +43,7 @@ class MenuDisplay:
 
     def display_today_lunch(self):
         """오늘의 점심 메뉴 표시"""
-        menu_data = self.db.get_menu_by_date(self.today)
+        menu_data = self._get_today_menu()
         lunch_menu = menu_data.get("중식", [])
         
         print("\n" + "=" * 60)
@@ -48,7 +55,7 @@ class MenuDisplay:
 
     def display_today_dinner(self):
         """오늘의 저녁 메뉴 표시"""
-        menu_data = self.db.get_menu_by_date(self.today)
+        menu_data = self._get_today_menu()
         dinner_menu = menu_data.get("석식", [])
         
         print("\n" + "=" * 60)
@@ -60,7 +67,7 @@ class MenuDisplay:
 
     def display_today_corners(self):
         """오늘의 코너1, 코너2 메뉴 표시"""
-        menu_data = self.db.get_menu_by_date(self.today)
+        menu_data = self._get_today_menu()
         lunch_menu = menu_data.get("중식", [])
         
         corner1_menu = next((menu for menu in lunch_menu if menu['corner'] == 'A'), None)
@@ -77,7 +84,7 @@ class MenuDisplay:
 
     def display_today_dessert(self):
         """오늘 중식의 후식 메뉴 표시"""
-        menu_data = self.db.get_menu_by_date(self.today)
+        menu_data = self._get_today_menu()
         lunch_menu = menu_data.get("중식", [])
         
         dessert_menu = next((menu for menu in lunch_menu if menu['corner'] == 'E'), None)
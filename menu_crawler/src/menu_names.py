@@ -0,0 +1,140 @@
+"""
+메뉴 이름 정규화
+
+같은 메뉴가 띄어쓰기, 괄호 안 설명, 장식 기호, 'NEW' 같은 표시 단어만 다르게 나오는 경우가 많아
+(예: '김치 찌개', '김치찌개(국내산)', '★김치찌개 NEW') 이름마다 따로 번역하지 않도록 정규화한 키(canonical key)를 쓴다.
+'/', '+', '&', ','로 묶인 세트 메뉴(예: '돈까스/우동')는 구성 메뉴의 키를 '/'로 이은 키가 되며,
+번역은 구성 메뉴마다 저장하고 세트 메뉴의 번역은 구성 메뉴 번역을 이어 만든다.
+
+메뉴 이름의 키는 dish_names.canonical에, 번역은 키로 menu_translations에 저장된다.
+규칙을 바꾸면 NORMALIZER_VERSION을 올려 저장된 키와 번역을 다시 정리하게 한다.
+"""
+import re
+import sqlite3
+import unicodedata
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+# 괄호로 둘러싼 설명 (안쪽부터 반복해서 지움)
+BRACKETS = re.compile(r'\([^()]*\)|\[[^\[\]]*\]|\{[^{}]*\}|<[^<>]*>|【[^【】]*】')
+BRACKET_CHARS = re.compile(r'[()\[\]{}<>【】]')
+
+# 세트 메뉴 구분자 (숫자 사이의 '/'는 '1/2' 같은 분수이므로 제외)
+COMBO_SEPARATOR = re.compile(r'(?<!\d)[/+&,]|[/+&,](?!\d)')
+KEY_SEPARATOR = re.compile(r'(?<!\d)/|/(?!\d)')
+COMBO_JOINER = '/'
+
+# 글자/숫자/공백이 아닌 문자 (숫자 사이의 '/', '.'는 유지)
+PUNCTUATION = re.compile(r'(?!(?<=\d)[/.](?=\d))[^\w\s]')
+
+# 한글 사이의 띄어쓰기 (메뉴마다 제각각이라 붙여 씀)
+HANGUL_SPACE = re.compile(r'(?<=[가-힣])\s+(?=[가-힣])')
+
+# 이름 앞뒤에 붙는 표시 단어
+NOTE_WORDS = frozenset({'new', 'best', 'hot', 'event', '신메뉴', '추천', '인기', '리필', '셀프'})
+
+# 번역된 세트 메뉴 이름을 이을 때 쓰는 구분자
+TRANSLATION_JOINER = ' / '
+
+# 저장된 키를 만든 규칙 버전 (sync_state 키)
+NORMALIZER_VERSION = 1
+NORMALIZER_VERSION_KEY = 'menu_names.version'
+
+
+def _strip_brackets(text: str) -> str:
+    """괄호 안 설명 제거 (이름 전체가 괄호 안이면 괄호 문자만 제거)"""
+    stripped, previous = text, None
+    while stripped != previous:
+        previous, stripped = stripped, BRACKETS.sub(' ', stripped)
+    return stripped if stripped.strip() else BRACKET_CHARS.sub(' ', text)
+
+
+def _part_key(text: str) -> str:
+    """세트가 아닌 메뉴 하나의 키 (기호 제거, 소문자, 표시 단어 제거, 한글 사이 공백 제거)"""
+    words = PUNCTUATION.sub(' ', text).lower().split()
+    while words and words[-1] in NOTE_WORDS:
+        words.pop()
+    while words and words[0] in NOTE_WORDS:
+        words.pop(0)
+    return HANGUL_SPACE.sub('', ' '.join(words))
+
+
+@lru_cache(maxsize=20000)
+def canonical_key(name: Optional[str]) -> str:
+    """
+    메뉴 이름의 정규화된 키 (키에 다시 적용해도 같은 키)
+
+    '김치 찌개(국내산)' -> '김치찌개', '돈까스 + 우동' -> '돈까스/우동', 'Caesar Salad*' -> 'caesar salad'
+    """
+    if not name:
+        return ''
+    text = _strip_brackets(unicodedata.normalize('NFKC', name))
+    parts = [key for key in (_part_key(part) for part in COMBO_SEPARATOR.split(text)) if key]
+    return COMBO_JOINER.join(parts)
+
+
+def split_key(key: str) -> List[str]:
+    """키를 구성 메뉴 키 목록으로 (세트가 아니면 키 하나)"""
+    return [part for part in KEY_SEPARATOR.split(key) if part]
+
+
+def combine_translations(parts: List[Dict]) -> Dict:
+    """구성 메뉴 번역({'translated', 'description'})을 이어 세트 메뉴 번역 만들기"""
+    descriptions = [part['description'] for part in parts if part.get('description')]
+    return {
+        'translated': TRANSLATION_JOINER.join(part['translated'] for part in parts),
+        'description': TRANSLATION_JOINER.join(descriptions) or None,
+    }
+
+
+def refresh_canonical(conn: sqlite3.Connection, full: bool = False) -> Dict[str, int]:
+    """
+    키가 없는 메뉴 이름의 키 계산 (규칙 버전이 바뀌었거나 full이면 전체)
+
+    전체를 다시 계산할 때는 키가 아닌 이름(이전 규칙의 키, 정규화 전 이름)으로 저장된 번역을
+    새 키로 옮긴다. 같은 키에 이미 번역이 있으면 그 번역을 유지한다.
+
+    Returns:
+        dishes(키를 바꾼 메뉴 이름 수), translations(새 키로 옮긴 번역 이름 수)
+    """
+    row = conn.execute('SELECT value FROM sync_state WHERE name = ?', (NORMALIZER_VERSION_KEY,)).fetchone()
+    outdated = row is None or row[0] != NORMALIZER_VERSION
+    full = full or outdated
+
+    condition = '' if full else 'WHERE canonical IS NULL'
+    dishes = [
+        (canonical_key(name), dish_id)
+        for dish_id, name, canonical in conn.execute(f'SELECT id, name, canonical FROM dish_names {condition}')
+        if canonical != canonical_key(name)
+    ]
+    moved = []
+    if full:
+        moved = [
+            (canonical_key(name), name)
+            for (name,) in conn.execute('SELECT DISTINCT menu_name FROM menu_translations')
+            if canonical_key(name) and canonical_key(name) != name
+        ]
+
+    with conn:
+        conn.executemany('UPDATE dish_names SET canonical = ? WHERE id = ?', dishes)
+        for key, name in moved:
+            conn.execute('''
+                INSERT OR IGNORE INTO menu_translations
+                    (menu_name, language, translated_name, description, created_at, source)
+                SELECT ?, language, translated_name, description, created_at, source
+                FROM menu_translations WHERE menu_name = ?
+            ''', (key, name))
+            conn.execute('DELETE FROM menu_translations WHERE menu_name = ?', (name,))
+        if moved:
+            # 응답에 들어가는 번역이 바뀔 수 있으므로 스냅샷도 다시 만들게 함
+            conn.execute('DELETE FROM menu_snapshots')
+        if outdated:
+            conn.execute('''
+                INSERT INTO sync_state (name, value, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            ''', (NORMALIZER_VERSION_KEY, NORMALIZER_VERSION, datetime.now().isoformat()))
+
+    if dishes or moved:
+        print(f"메뉴 이름 정규화: 메뉴 이름 {len(dishes)}개, 번역 키 {len(moved)}개 정리")
+    return {'dishes': len(dishes), 'translations': len(moved)}
@@ -0,0 +1,157 @@
+"""
+가벼운 계측 도구
+
+    from metrics import METRICS
+
+    with METRICS.span('db_insert_batch', site=site):
+        ...
+    METRICS.inc('llm_tokens', usage.prompt_tokens, kind='prompt')
+
+span은 monotonic 시계로 소요 시간을 재어 (이름, 라벨)별 횟수/합계/최댓값을 모으고,
+inc는 카운터를 더한다. 모은 값은 Prometheus 텍스트 형식(render_prometheus)으로 내보내며,
+METRICS_JSONL 환경 변수에 파일 경로를 지정하면 각 span/카운터 기록이 JSON 한 줄씩 추가된다.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, Optional, Tuple
+
+# Prometheus 지표 이름 앞에 붙는 접두어
+METRIC_PREFIX = 'menu_'
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items() if value is not None))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in key) + '}'
+
+
+class Metrics:
+    """span 소요 시간과 카운터를 모으는 스레드 안전 저장소"""
+
+    def __init__(self, jsonl_path: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._spans: Dict[Tuple[str, LabelKey], list] = {}
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._jsonl_path = jsonl_path
+        self._jsonl = None
+
+    def _emit(self, record: Dict[str, Any]):
+        """JSON lines 파일에 기록 (경로가 없으면 무시, 호출 측에서 잠금을 잡고 있어야 함)"""
+        if not self._jsonl_path:
+            return
+        if self._jsonl is None:
+            self._jsonl = open(self._jsonl_path, 'a', encoding='utf-8', buffering=1)
+        record['ts'] = round(time.time(), 3)
+        self._jsonl.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def observe(self, name: str, seconds: float, **labels):
+        """span 하나의 소요 시간 기록"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            stats = self._spans.get(key)
+            if stats is None:
+                stats = self._spans[key] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+            self._emit({'type': 'span', 'name': name, 'labels': dict(key[1]), 'seconds': round(seconds, 6)})
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """카운터 증가"""
+        if not value:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._emit({'type': 'counter', 'name': name, 'labels': dict(key[1]), 'value': value})
+
+    @contextmanager
+    def span(self, name: str, **labels) -> Iterator[Dict[str, Any]]:
+        """
+        with 블록의 소요 시간 기록
+        블록 안에서 yield된 딕셔너리에 값을 넣으면 라벨로 추가됨 (예: 결과 상태)
+        예외가 발생하면 error 라벨에 예외 이름이 들어감
+        """
+        extra: Dict[str, Any] = {}
+        started = time.monotonic()
+        try:
+            yield extra
+        except BaseException as e:
+            extra.setdefault('error', e.__class__.__name__)
+            raise
+        finally:
+            self.observe(name, time.monotonic() - started, **labels, **extra)
+
+    def timed(self, name: str, **labels) -> Callable:
+        """함수 실행 시간을 span으로 기록하는 데코레이터"""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재까지 모은 값 (spans: 횟수/합계/최댓값, counters: 값)"""
+        with self._lock:
+            return {
+                'spans': [
+                    {'name': name, 'labels': dict(labels), 'count': count, 'seconds': total, 'max': longest}
+                    for (name, labels), (count, total, longest) in sorted(self._spans.items())
+                ],
+                'counters': [
+                    {'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+            }
+
+    def render_prometheus(self) -> str:
+        """Prometheus 텍스트 형식 (span은 summary의 _count/_sum과 _max gauge)"""
+        with self._lock:
+            spans = [(key, tuple(stats)) for key, stats in sorted(self._spans.items())]
+            counters = sorted(self._counters.items())
+
+        # 같은 지표의 샘플은 TYPE 선언 아래에 모아서 출력
+        families: Dict[Tuple[str, str], list] = {}
+        for (name, labels), (count, total, longest) in spans:
+            metric = f'{METRIC_PREFIX}{name}_seconds'
+            label_text = _format_labels(labels)
+            families.setdefault((metric, 'summary'), []).extend([
+                f'{metric}_count{label_text} {count}',
+                f'{metric}_sum{label_text} {total:.6f}',
+            ])
+            families.setdefault((f'{metric}_max', 'gauge'), []).append(f'{metric}_max{label_text} {longest:.6f}')
+        for (name, labels), value in counters:
+            metric = f'{METRIC_PREFIX}{name}_total'
+            families.setdefault((metric, 'counter'), []).append(f'{metric}{_format_labels(labels)} {value:g}')
+
+        lines = []
+        for (metric, kind), samples in families.items():
+            lines.append(f'# TYPE {metric} {kind}')
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """모은 값 초기화"""
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+
+# 프로세스 전체에서 공유하는 기본 저장소
+METRICS = Metrics(os.getenv('METRICS_JSONL') or None)
@@ -0,0 +1,466 @@
+"""
+메뉴 데이터베이스 스키마 마이그레이션
+
+모든 테이블/인덱스 변경은 이 모듈의 MIGRATIONS에 버전 순서대로 추가하고,
+MenuDatabase, TranslationService 등은 apply_migrations()만 호출한다.
+적용된 버전은 schema_version 테이블에 기록된다.
+메뉴 속성 태그와 번역 키처럼 규칙으로 계산해 저장하는 값(DERIVED)은 마이그레이션을 적용했거나
+규칙 버전이 바뀌었을 때만 다시 계산한다 (평소 연결 시에는 sync_state 조회 한 번).
+"""
+import os
+import sqlite3
+from datetime import datetime
+from typing import Callable, List, Tuple
+from dish_tags import refresh_tags, TAGGER_VERSION, TAGGER_VERSION_KEY
+from menu_names import refresh_canonical, NORMALIZER_VERSION, NORMALIZER_VERSION_KEY
+
+
+def _create_base_tables(conn: sqlite3.Connection):
+    """기존 버전에서 각 모듈이 따로 만들던 기본 테이블"""
+    # 메인 메뉴 테이블
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS main_menu (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT,
+            meal_type TEXT,  -- 중식/석식
+            meal_time TEXT,  -- 시간대 (예: 1120~1300)
+            corner TEXT,     -- 코너 정보
+            corner_name TEXT,-- 코너 이름
+            main_menu TEXT,  -- 메인 메뉴 이름
+            menu_code TEXT,  -- 메뉴 코드
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(date, meal_type, corner)
+        )
+    ''')
+
+    # 부가 메뉴 테이블
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS sub_menu (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            main_menu_id INTEGER,
+            menu_name TEXT,
+            FOREIGN KEY (main_menu_id) REFERENCES main_menu(id)
+        )
+    ''')
+
+    # 번역 테이블
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS menu_translations (
+            menu_name TEXT,
+            language TEXT,
+            translated_name TEXT,
+            description TEXT,
+            created_at TEXT,
+            PRIMARY KEY (menu_name, language)
+        )
+    ''')
+
+
+def _add_sub_menu_cascade(conn: sqlite3.Connection):
+    """
+    sub_menu의 외래 키에 ON DELETE CASCADE 추가
+    SQLite는 제약 조건을 변경할 수 없으므로 테이블을 새로 만들어 옮긴다
+    """
+    conn.execute('''
+        CREATE TABLE sub_menu_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            main_menu_id INTEGER NOT NULL,
+            menu_name TEXT,
+            FOREIGN KEY (main_menu_id) REFERENCES main_menu(id) ON DELETE CASCADE
+        )
+    ''')
+    # 메인 메뉴가 없는 고아 부가 메뉴는 옮기지 않음
+    conn.execute('''
+        INSERT INTO sub_menu_new (id, main_menu_id, menu_name)
+        SELECT s.id, s.main_menu_id, s.menu_name
+        FROM sub_menu s
+        JOIN main_menu m ON m.id = s.main_menu_id
+    ''')
+    conn.execute('DROP TABLE sub_menu')
+    conn.execute('ALTER TABLE sub_menu_new RENAME TO sub_menu')
+
+
+def _add_indexes(conn: sqlite3.Connection):
+    """조인/조회 컬럼 인덱스"""
+    # get_menu_by_date/range의 부가 메뉴 조인
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_sub_menu_main_menu_id ON sub_menu(main_menu_id)')
+    # 부가 메뉴 이름으로 번역 대상/검색
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_sub_menu_menu_name ON sub_menu(menu_name)')
+    # 날짜 범위 조회 (정렬 컬럼까지 포함)
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_main_menu_date ON main_menu(date, meal_type, corner)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_main_menu_main_menu ON main_menu(main_menu)')
+    # 언어별 번역 조회
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_menu_translations_language ON menu_translations(language, menu_name)')
+
+
+def _create_sync_state(conn: sqlite3.Connection):
+    """증분 작업(번역 등)의 마지막 처리 위치(high-water mark) 저장 테이블"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS sync_state (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL,
+            updated_at TEXT
+        )
+    ''')
+
+
+def _add_main_menu_site(conn: sqlite3.Connection):
+    """
+    main_menu에 사업장(site) 컬럼을 추가하고 고유키를 (site, date, meal_type, corner)로 변경
+    기존 행은 지금까지 크롤링하던 사업장(BUSIPLCD)의 메뉴로 채운다
+    ID는 그대로 옮기므로 sub_menu 참조와 번역 진행 위치(sync_state)는 유지된다
+    """
+    conn.execute('''
+        CREATE TABLE main_menu_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            site TEXT NOT NULL,  -- 사업장 코드 (BUSIPLCD)
+            date TEXT,
+            meal_type TEXT,  -- 중식/석식
+            meal_time TEXT,  -- 시간대 (예: 1120~1300)
+            corner TEXT,     -- 코너 정보
+            corner_name TEXT,-- 코너 이름
+            main_menu TEXT,  -- 메인 메뉴 이름
+            menu_code TEXT,  -- 메뉴 코드
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(site, date, meal_type, corner)
+        )
+    ''')
+    conn.execute('''
+        INSERT INTO main_menu_new
+        (id, site, date, meal_type, meal_time, corner, corner_name, main_menu, menu_code, created_at)
+        SELECT id, ?, date, meal_type, meal_time, corner, corner_name, main_menu, menu_code, created_at
+        FROM main_menu
+    ''', (os.getenv('BUSIPLCD', 'FAN10'),))
+    conn.execute('DROP TABLE main_menu')
+    conn.execute('ALTER TABLE main_menu_new RENAME TO main_menu')
+    # 테이블과 함께 삭제된 인덱스 재생성 (사업장 구분 없는 날짜 범위 조회용)
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_main_menu_date ON main_menu(date, meal_type, corner)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_main_menu_main_menu ON main_menu(main_menu)')
+
+
+def _create_crawl_windows(conn: sqlite3.Connection):
+    """백필에서 저장까지 끝난 조회 구간 (중단 후 이어서 실행할 때 건너뜀)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS crawl_windows (
+            site TEXT NOT NULL,
+            fr_dt TEXT NOT NULL,      -- 요청한 FR_DT
+            to_dt TEXT,               -- 응답에 포함된 마지막 날짜
+            menu_count INTEGER,
+            completed_at TEXT,
+            PRIMARY KEY (site, fr_dt)
+        )
+    ''')
+
+
+def _add_main_menu_content_hash(conn: sqlite3.Connection):
+    """
+    메뉴 내용(메인/부가 메뉴) 해시와 마지막 변경 시각(unix 초) 컬럼
+    기존 행은 해시가 NULL이므로 다음 크롤링에서 한 번 변경된 것으로 처리된다
+    """
+    conn.execute('ALTER TABLE main_menu ADD COLUMN content_hash TEXT')
+    conn.execute('ALTER TABLE main_menu ADD COLUMN updated_at INTEGER')
+    # 번역 서비스가 마지막 실행 이후 바뀐 메뉴를 찾을 때 사용
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_main_menu_updated_at ON main_menu(updated_at)')
+
+
+def _add_crawl_window_hash(conn: sqlite3.Connection):
+    """구간 응답의 정규화된 해시 (같은 응답이면 저장/번역을 모두 건너뜀)"""
+    conn.execute('ALTER TABLE crawl_windows ADD COLUMN response_hash TEXT')
+
+
+def _create_menu_snapshots(conn: sqlite3.Connection):
+    """
+    날짜/언어별로 미리 만든 DayMenu 응답 (zlib 압축 JSON)
+    etag는 압축 전 본문의 해시로, 다시 만들었을 때 내용이 같으면 쓰지 않는 데 사용
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS menu_snapshots (
+            date TEXT NOT NULL,
+            language TEXT NOT NULL,
+            body BLOB NOT NULL,
+            etag TEXT NOT NULL,
+            built_at INTEGER NOT NULL,
+            PRIMARY KEY (date, language)
+        )
+    ''')
+
+
+# 검색 색인에 번역을 넣는 언어 (menu_search의 컬럼)
+SEARCH_LANGUAGES = ('en', 'zh', 'sv')
+
+
+def _fts5_tokenizer(conn: sqlite3.Connection) -> str:
+    """부분 문자열 검색용 trigram 토크나이저 (SQLite 3.34 미만이면 unicode61)"""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x, tokenize='trigram')")
+        conn.execute('DROP TABLE temp.fts5_probe')
+        return 'trigram'
+    except sqlite3.OperationalError:
+        print("FTS5 trigram 토크나이저가 없어 unicode61을 사용 (단어 단위 검색)")
+        return 'unicode61'
+
+
+def _create_menu_search(conn: sqlite3.Connection):
+    """
+    메뉴 이름 전문 검색 색인
+    dish_names는 메인/부가 메뉴에 나온 이름마다 한 행이고, menu_search(FTS5)의 rowid는 dish_names.id이다.
+    한국어 이름(ko)과 언어별 번역 이름/설명(en, zh, sv)을 색인하며,
+    메뉴 저장과 번역 저장 시 트리거로 함께 갱신된다.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS dish_names (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+    ''')
+    columns = ', '.join(('ko',) + SEARCH_LANGUAGES)
+    conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS menu_search USING fts5({columns}, tokenize='{_fts5_tokenizer(conn)}')")
+
+    # 번역 이름과 설명을 한 컬럼으로 (번역이 없으면 NULL)
+    translated = {
+        lang: f"(SELECT translated_name || ' ' || COALESCE(description, '') FROM menu_translations "
+              f"WHERE menu_name = {{name}} AND language = '{lang}')"
+        for lang in SEARCH_LANGUAGES
+    }
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS main_menu_dish_insert AFTER INSERT ON main_menu
+        WHEN NEW.main_menu IS NOT NULL
+        BEGIN
+            INSERT OR IGNORE INTO dish_names (name) VALUES (NEW.main_menu);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS main_menu_dish_update AFTER UPDATE OF main_menu ON main_menu
+        WHEN NEW.main_menu IS NOT NULL
+        BEGIN
+            INSERT OR IGNORE INTO dish_names (name) VALUES (NEW.main_menu);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS sub_menu_dish_insert AFTER INSERT ON sub_menu
+        WHEN NEW.menu_name IS NOT NULL
+        BEGIN
+            INSERT OR IGNORE INTO dish_names (name) VALUES (NEW.menu_name);
+        END
+    ''')
+    values = ', '.join(translated[lang].format(name='NEW.name') for lang in SEARCH_LANGUAGES)
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS dish_names_search_insert AFTER INSERT ON dish_names
+        BEGIN
+            INSERT INTO menu_search (rowid, {columns}) VALUES (NEW.id, NEW.name, {values});
+        END
+    ''')
+    # 번역이 추가/변경/삭제되면 해당 이름의 번역 컬럼을 다시 계산
+    for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+        assignments = ', '.join(
+            f"{lang} = {translated[lang].format(name=row + '.menu_name')}" for lang in SEARCH_LANGUAGES
+        )
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS menu_translations_search_{event.lower()} AFTER {event} ON menu_translations
+            BEGIN
+                UPDATE menu_search SET {assignments}
+                WHERE rowid = (SELECT id FROM dish_names WHERE name = {row}.menu_name);
+            END
+        ''')
+
+    # 기존 메뉴 이름으로 채움 (dish_names 트리거가 색인도 함께 채움)
+    conn.execute('''
+        INSERT OR IGNORE INTO dish_names (name)
+        SELECT main_menu FROM main_menu WHERE main_menu IS NOT NULL
+        UNION
+        SELECT menu_name FROM sub_menu WHERE menu_name IS NOT NULL
+    ''')
+
+
+def _add_dish_tags(conn: sqlite3.Connection):
+    """
+    메뉴 이름별, 코너별 속성 태그 비트마스크 (dish_tags.TAGS 순서)
+    NULL은 아직 계산하지 않은 행으로, 마이그레이션 직후 dish_tags.refresh_tags로 채운다 (DERIVED)
+    """
+    conn.execute('ALTER TABLE dish_names ADD COLUMN tags INTEGER')
+    conn.execute('ALTER TABLE main_menu ADD COLUMN tags INTEGER')
+
+
+def _add_dish_canonical(conn: sqlite3.Connection):
+    """
+    메뉴 이름의 정규화된 키(menu_names.canonical_key) 컬럼 - 번역은 이 키로 저장/조회된다
+    NULL은 아직 계산하지 않은 행으로, 마이그레이션 직후 menu_names.refresh_canonical로 채우고
+    기존 번역도 키로 옮긴다 (DERIVED, 그때까지는 이름 그대로 조회)
+    검색 색인의 번역 컬럼도 키로 찾도록 트리거를 다시 만든다
+    """
+    conn.execute('ALTER TABLE dish_names ADD COLUMN canonical TEXT')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_dish_names_canonical ON dish_names(canonical)')
+
+    translated = {
+        lang: f"(SELECT translated_name || ' ' || COALESCE(description, '') FROM menu_translations "
+              f"WHERE menu_name = {{key}} AND language = '{lang}')"
+        for lang in SEARCH_LANGUAGES
+    }
+    columns = ', '.join(('ko',) + SEARCH_LANGUAGES)
+
+    def assignments(key: str) -> str:
+        return ', '.join(f"{lang} = {translated[lang].format(key=key)}" for lang in SEARCH_LANGUAGES)
+
+    conn.execute('DROP TRIGGER IF EXISTS dish_names_search_insert')
+    values = ', '.join(translated[lang].format(key='COALESCE(NEW.canonical, NEW.name)') for lang in SEARCH_LANGUAGES)
+    conn.execute(f'''
+        CREATE TRIGGER dish_names_search_insert AFTER INSERT ON dish_names
+        BEGIN
+            INSERT INTO menu_search (rowid, {columns}) VALUES (NEW.id, NEW.name, {values});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER dish_names_search_canonical AFTER UPDATE OF canonical ON dish_names
+        BEGIN
+            UPDATE menu_search SET {assignments('COALESCE(NEW.canonical, NEW.name)')} WHERE rowid = NEW.id;
+        END
+    ''')
+    for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+        conn.execute(f'DROP TRIGGER IF EXISTS menu_translations_search_{event.lower()}')
+        conn.execute(f'''
+            CREATE TRIGGER menu_translations_search_{event.lower()} AFTER {event} ON menu_translations
+            BEGIN
+                UPDATE menu_search SET {assignments(row + '.menu_name')}
+                WHERE rowid IN (
+                    SELECT id FROM dish_names WHERE canonical = {row}.menu_name
+                    UNION ALL
+                    SELECT id FROM dish_names WHERE canonical IS NULL AND name = {row}.menu_name
+                );
+            END
+        ''')
+
+
+def _add_translation_source(conn: sqlite3.Connection):
+    """
+    번역을 만든 방법 - NULL은 LLM(또는 직접 입력), 'glossary'는 용어집(glossary.py)으로 이어 붙인 번역
+    용어집 번역은 설명이 없고 틀릴 수 있으므로 용어집 학습에 쓰지 않고, LLM 번역이 나오면 덮어쓴다
+    """
+    conn.execute('ALTER TABLE menu_translations ADD COLUMN source TEXT')
+
+
+def _add_translation_version(conn: sqlite3.Connection):
+    """
+    번역이 추가되거나 바뀔 때마다 커지는 버전 (스냅샷이 바뀐 번역을 쓰는 날짜를 찾는 데 사용)
+    rowid는 ON CONFLICT ... DO UPDATE로 번역을 고쳐도 그대로라 쓸 수 없다
+    기존 행은 rowid로 채우므로 rowid로 기록한 스냅샷 진행 위치를 그대로 이어 쓴다
+    """
+    conn.execute('ALTER TABLE menu_translations ADD COLUMN version INTEGER')
+    conn.execute('UPDATE menu_translations SET version = rowid')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_menu_translations_version ON menu_translations(version)')
+    next_version = '(SELECT COALESCE(MAX(version), 0) + 1 FROM menu_translations)'
+    conn.execute(f'''
+        CREATE TRIGGER menu_translations_version_insert AFTER INSERT ON menu_translations
+        BEGIN
+            UPDATE menu_translations SET version = {next_version} WHERE rowid = NEW.rowid;
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER menu_translations_version_update
+        AFTER UPDATE OF translated_name, description ON menu_translations
+        BEGIN
+            UPDATE menu_translations SET version = {next_version} WHERE rowid = NEW.rowid;
+        END
+    ''')
+    conn.execute('''
+        UPDATE sync_state SET name = 'snapshot.translation_version' WHERE name = 'snapshot.translation_rowid'
+    ''')
+
+
+# (버전, 설명, 적용 함수) - 반드시 버전 순서대로 추가하고 기존 항목은 수정하지 않음
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, 'base tables', _create_base_tables),
+    (2, 'sub_menu cascade delete', _add_sub_menu_cascade),
+    (3, 'lookup indexes', _add_indexes),
+    (4, 'sync state', _create_sync_state),
+    (5, 'main_menu site', _add_main_menu_site),
+    (6, 'crawl windows', _create_crawl_windows),
+    (7, 'main_menu content hash', _add_main_menu_content_hash),
+    (8, 'crawl window response hash', _add_crawl_window_hash),
+    (9, 'menu snapshots', _create_menu_snapshots),
+    (10, 'menu search index', _create_menu_search),
+    (11, 'dish tags', _add_dish_tags),
+    (12, 'dish canonical names', _add_dish_canonical),
+    (13, 'translation source', _add_translation_source),
+    (14, 'translation version', _add_translation_version),
+]
+
+
+# 규칙으로 계산해 저장하는 값 (sync_state 버전 키, 현재 규칙 버전, 다시 계산하는 함수)
+DERIVED: List[Tuple[str, int, Callable[[sqlite3.Connection], object]]] = [
+    (TAGGER_VERSION_KEY, TAGGER_VERSION, refresh_tags),
+    (NORMALIZER_VERSION_KEY, NORMALIZER_VERSION, refresh_canonical),
+]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """현재 적용된 스키마 버전 (없으면 0)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT
+        )
+    ''')
+    return conn.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """
+    아직 적용되지 않은 마이그레이션을 순서대로 적용
+
+    각 마이그레이션은 자체 트랜잭션에서 실행되며, 실패하면 해당 단계만 롤백되고 예외가 전달된다.
+    여러 프로세스가 동시에 시작해도 BEGIN IMMEDIATE로 한 프로세스만 적용한다.
+
+    Args:
+        conn: 데이터베이스 연결
+
+    Returns:
+        적용 후 스키마 버전
+    """
+    version = get_schema_version(conn)
+    if version < MIGRATIONS[-1][0]:
+        _migrate(conn)
+    refresh_derived(conn, migrated=version < MIGRATIONS[-1][0])
+    return get_schema_version(conn)
+
+
+def refresh_derived(conn: sqlite3.Connection, migrated: bool = False):
+    """
+    마이그레이션을 적용했거나(새 컬럼은 NULL) sync_state의 규칙 버전이 현재와 다른 값만 다시 계산
+    (새로 저장하는 행은 저장할 때 계산하므로 평소에는 아무것도 하지 않음)
+    """
+    keys = [key for key, _, _ in DERIVED]
+    stored = dict(conn.execute(
+        f'SELECT name, value FROM sync_state WHERE name IN ({",".join("?" * len(keys))})', keys
+    ).fetchall())
+    for key, version, refresh in DERIVED:
+        if migrated or stored.get(key) != version:
+            refresh(conn)
+
+
+def _migrate(conn: sqlite3.Connection):
+    """아직 적용되지 않은 마이그레이션 적용"""
+
+    # 테이블 재생성 중에는 외래 키 검사를 끔 (트랜잭션 밖에서만 변경 가능)
+    conn.execute('PRAGMA foreign_keys=OFF')
+    try:
+        for target, description, migrate in MIGRATIONS:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                # 다른 프로세스가 먼저 적용했을 수 있으므로 잠금을 잡은 뒤 다시 확인
+                if get_schema_version(conn) >= target:
+                    conn.rollback()
+                    continue
+                migrate(conn)
+                conn.execute(
+                    'INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)',
+                    (target, description, datetime.now().isoformat())
+                )
+                conn.commit()
+                print(f"스키마 마이그레이션 적용: v{target} ({description})")
+            except Exception:
+                conn.rollback()
+                raise
+    finally:
+        conn.execute('PRAGMA foreign_keys=ON')
@@ -0,0 +1,272 @@
+"""
+로컬 OpenAI 호환 가짜 번역 서버
+
+DeepSeek 대신 chat.completions API(POST /chat/completions, /v1/chat/completions)에 응답해
+네트워크 없이 번역 경로의 동시성/재시도/배치 동작을 시험하고 부하를 잴 수 있게 한다.
+프롬프트에 들어 있는 메뉴 목록을 결정적인 JSON 번역으로 돌려주며,
+응답 지연, 오류(500) 비율, 요청 제한(429, Retry-After) 비율을 설정할 수 있다.
+"stream": true 요청에는 SSE 조각으로 응답하고, 응답이 max_tokens를 넘으면 잘라서 finish_reason "length"로 끝낸다.
+같은 seed면 같은 순서의 요청에 같은 오류가 발생한다.
+
+    python mock_llm_server.py --port 8800 --latency 0.2 --error-rate 0.05 --rate-limit-rate 0.1
+    DEEPSEEK_BASE_URL=http://127.0.0.1:8800 python translate_service.py --full
+
+GET /stats로 요청/오류 수를 확인할 수 있다.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+
+DEFAULT_PORT = 8800
+COMPLETIONS_PATHS = ('/chat/completions', '/v1/chat/completions')
+STATS_PATH = '/stats'
+
+# 스트리밍 응답 조각 하나의 글자 수
+STREAM_CHUNK_CHARS = 40
+
+# 다국어 프롬프트에서 요청한 언어 목록 ("must contain the keys [...]")
+LANGUAGES_PATTERN = re.compile(r"must contain the keys (\[.*?\])")
+
+
+def prompt_items(prompt: str) -> List[str]:
+    """프롬프트 마지막의 번역할 메뉴 목록 (JSON 배열)"""
+    return json.loads(prompt[prompt.rindex('['):])
+
+
+def mock_translations(prompt: str) -> Tuple[str, int]:
+    """
+    프롬프트의 메뉴 목록에 대한 결정적인 번역 응답
+    단일 언어 프롬프트는 {"original", "translated", "description"},
+    다국어 프롬프트는 언어별 {"translated", "description"}을 담은 JSON 배열 문자열과 항목 수를 반환
+    """
+    items = prompt_items(prompt)
+    languages = LANGUAGES_PATTERN.search(prompt)
+    results = []
+    for item in items:
+        if languages is None:
+            results.append({"original": item, "translated": f"T({item})", "description": None})
+            continue
+        result = {"original": item}
+        for lang in json.loads(languages.group(1)):
+            result[lang] = {"translated": f"{lang}({item})", "description": None}
+        results.append(result)
+    return json.dumps(results, ensure_ascii=False), len(items)
+
+
+def estimate_tokens(text: str) -> int:
+    """대략 2글자당 1토큰"""
+    return max(1, len(text) // 2)
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """
+    가짜 chat.completions 서버
+    요청마다 (요청 제한, 오류, 정상) 중 하나를 seed로 정해진 난수로 고르고,
+    정상 응답은 latency + item_latency × 메뉴 수만큼 기다린 뒤 돌려준다
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], latency: float = 0.0, item_latency: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: float = 1.0,
+                 seed: int = 0, verbose: bool = False):
+        super().__init__(address, MockLLMHandler)
+        self.latency = latency
+        self.item_latency = item_latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.verbose = verbose
+        self.stats = {'requests': 0, 'ok': 0, 'errors': 0, 'rate_limited': 0, 'items': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_outcome(self) -> str:
+        """이번 요청의 결과 ('rate_limited', 'errors', 'ok')를 정하고 집계"""
+        with self._lock:
+            self.stats['requests'] += 1
+            draw = self._random.random()
+            if draw < self.rate_limit_rate:
+                outcome = 'rate_limited'
+            elif draw < self.rate_limit_rate + self.error_rate:
+                outcome = 'errors'
+            else:
+                outcome = 'ok'
+            self.stats[outcome] += 1
+            return outcome
+
+    def count_items(self, count: int):
+        with self._lock:
+            self.stats['items'] += count
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    # keep-alive (OpenAI 클라이언트가 연결을 재사용)
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        if self.path == STATS_PATH:
+            self._send_json(200, self.server.snapshot())
+        else:
+            self._send_error(404, 'not_found', 'Not Found')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        if self.path not in COMPLETIONS_PATHS:
+            self._send_error(404, 'not_found', 'Not Found')
+            return
+        try:
+            request = json.loads(body)
+            prompt = request['messages'][-1]['content']
+            content, count = mock_translations(prompt)
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            self._send_error(400, 'invalid_request_error', f'Invalid request: {e}')
+            return
+
+        outcome = self.server.next_outcome()
+        if outcome == 'rate_limited':
+            self._send_error(429, 'rate_limit_exceeded', 'Rate limit reached',
+                             {'Retry-After': f'{self.server.retry_after:g}'})
+            return
+        if outcome == 'errors':
+            self._send_error(500, 'server_error', 'Internal server error')
+            return
+
+        # max_tokens를 넘는 응답은 실제 API처럼 중간에서 자름
+        finish_reason = 'stop'
+        max_tokens = request.get('max_tokens')
+        if max_tokens and estimate_tokens(content) > max_tokens:
+            content = content[:max_tokens * 2]
+            finish_reason = 'length'
+
+        self.server.count_items(count)
+        prompt_tokens = sum(estimate_tokens(message.get('content', '')) for message in request['messages'])
+        completion_tokens = estimate_tokens(content)
+        usage = {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens,
+        }
+        header = {
+            'id': f'mock-{self.server.snapshot()["requests"]}',
+            'created': int(time.time()),
+            'model': request.get('model', 'mock'),
+        }
+        if request.get('stream'):
+            time.sleep(self.server.latency)
+            include_usage = bool((request.get('stream_options') or {}).get('include_usage'))
+            self._send_stream(header, content, finish_reason, self.server.item_latency * count,
+                              usage if include_usage else None)
+            return
+
+        time.sleep(self.server.latency + self.server.item_latency * count)
+        self._send_json(200, {
+            **header,
+            'object': 'chat.completion',
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': finish_reason,
+            }],
+            'usage': usage,
+        })
+
+    def _send_stream(self, header: Dict[str, Any], content: str, finish_reason: str, duration: float,
+                     usage: Optional[Dict[str, int]]):
+        """
+        content를 STREAM_CHUNK_CHARS 글자씩 SSE(chat.completion.chunk)로 보냄
+        조각 사이에 duration을 나눠 기다리고, usage가 있으면 choices 없는 마지막 조각에 담음
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        # 길이를 미리 알 수 없으므로 연결을 닫아 끝을 알림
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        header = {**header, 'object': 'chat.completion.chunk'}
+        chunks = [content[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+        for index, text in enumerate(chunks):
+            time.sleep(duration / len(chunks))
+            delta = {'role': 'assistant', 'content': text} if index == 0 else {'content': text}
+            self._send_event({**header, 'choices': [{'index': 0, 'delta': delta, 'finish_reason': None}]})
+        self._send_event({**header, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': finish_reason}]})
+        if usage is not None:
+            self._send_event({**header, 'choices': [], 'usage': usage})
+        self.wfile.write(b'data: [DONE]\n\n')
+        self.wfile.flush()
+
+    def _send_event(self, payload: Dict[str, Any]):
+        self.wfile.write(b'data: ' + json.dumps(payload, ensure_ascii=False).encode('utf-8') + b'\n\n')
+        self.wfile.flush()
+
+    def _send_error(self, status: int, code: str, message: str, headers: Optional[Dict[str, str]] = None):
+        self._send_json(status, {'error': {'message': message, 'type': code, 'code': code}}, headers)
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server(host: str = '127.0.0.1', port: int = 0, **options) -> MockLLMServer:
+    """백그라운드 스레드에서 서버 시작 (port=0이면 빈 포트, 종료는 shutdown()/server_close())"""
+    server = MockLLMServer((host, port), **options)
+    thread = threading.Thread(target=server.serve_forever, name='mock-llm', daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local OpenAI-compatible stand-in for the translation API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds to wait per request')
+    parser.add_argument('--item-latency', type=float, default=0.0, help='Extra seconds per menu item')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for injected failures')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    server = MockLLMServer((args.host, args.port), args.latency, args.item_latency, args.error_rate,
+                           args.rate_limit_rate, args.retry_after, args.seed, args.verbose)
+    print(f"Mock LLM server is running on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Stats: {json.dumps(server.snapshot())}")
+
+
+if __name__ == '__main__':
+    main()
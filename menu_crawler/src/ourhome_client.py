@@ -0,0 +1,212 @@
+import datetime
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, Any, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from pathlib import Path
+from metrics import METRICS
+
+# Load environment variables
+env_path = Path(__file__).parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+MENU_INFO_PATH = '/Ex/Stor/MenuInfo'
+
+# 연결/응답 대기 시간 (초) - 업스트림이 느려도 크롤러가 무한정 멈추지 않도록
+CONNECT_TIMEOUT = float(os.getenv('OURHOME_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.getenv('OURHOME_READ_TIMEOUT', '30'))
+
+# 5xx/타임아웃/연결 오류 시 재시도 횟수와 지수 백오프 (full jitter)
+MAX_RETRIES = int(os.getenv('OURHOME_MAX_RETRIES', '3'))
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 20.0
+
+# 세션이 유지할 keep-alive 연결 수 (동시 요청 수 이상이어야 재사용됨)
+POOL_SIZE = 10
+
+
+def generate_ourhomekey(senddttm: str, ex_stor_cd: int, seed_key: int) -> int:
+    """Generate OURHOMEKEY based on time information and store code."""
+    year = int(senddttm[:4])
+    month = int(senddttm[4:6])
+    day = int(senddttm[6:8])
+    time_part = senddttm[8:14]
+
+    time_multiplier = int(f"{time_part[5]}{time_part[3]}{time_part[1]}")
+
+    return (
+        (100 - (year // 100)) +
+        (100 - (year % 100)) +
+        (100 - month) +
+        (100 - day) * time_multiplier +
+        ex_stor_cd +
+        seed_key
+    )
+
+
+class RetryableResponse(Exception):
+    """재시도할 HTTP 응답 (5xx, 429)"""
+
+    def __init__(self, response: requests.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+class OurHomeClient:
+    """
+    아워홈 메뉴 API 클라이언트
+
+    하나의 requests.Session을 재사용해 keep-alive 연결로 TLS 핸드셰이크를 줄이고,
+    모든 요청에 연결/응답 타임아웃을 적용한다.
+    5xx/타임아웃은 지터를 준 지수 백오프로 재시도하며, 인증 값(SENDDTTM/OURHOMEKEY)은
+    시도마다 다시 생성한다. 호출별 지연 시간과 시도 횟수는 last_call/stats에 기록된다.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, ex_stor_cd: Optional[int] = None,
+                 access_token: Optional[str] = None, seed_key: Optional[int] = None,
+                 busiplcd: Optional[str] = None, connect_timeout: float = CONNECT_TIMEOUT,
+                 read_timeout: float = READ_TIMEOUT, max_retries: int = MAX_RETRIES,
+                 session: Optional[requests.Session] = None):
+        self.base_url = base_url or os.getenv('PROD_API_URL')
+        if not self.base_url:
+            raise ValueError("API URL not found in environment variables")
+        self.ex_stor_cd = ex_stor_cd if ex_stor_cd is not None else int(os.getenv('EX_STOR_CD', '1010'))
+        self.access_token = access_token if access_token is not None else os.getenv('ACCESS_TOKEN', '')
+        self.seed_key = seed_key if seed_key is not None else int(os.getenv('SEED_KEY', '62'))
+        self.busiplcd = busiplcd or os.getenv('BUSIPLCD', 'FAN10')
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+
+        if session is None:
+            session = requests.Session()
+            # 재시도는 직접 처리 (시도마다 인증 값을 새로 만들어야 함)
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({"Content-Type": "application/json"})
+        self.session = session
+
+        self.last_call: Optional[Dict[str, Any]] = None
+        self.stats = {'calls': 0, 'attempts': 0, 'failures': 0, 'seconds': 0.0}
+        self._stats_lock = threading.Lock()
+
+    def close(self):
+        """세션의 연결 풀 정리"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def build_request(self, fr_dt: Optional[str] = None, busiplcd: Optional[str] = None,
+                      ex_stor_cd: Optional[int] = None) -> Dict[str, Any]:
+        """현재 시각으로 인증 값을 만들어 MenuInfo 요청 본문 생성"""
+        ex_stor_cd = ex_stor_cd if ex_stor_cd is not None else self.ex_stor_cd
+        current_datetime = datetime.datetime.now()
+        senddttm = current_datetime.strftime("%Y%m%d%H%M%S")
+        ourhomekey = generate_ourhomekey(senddttm, ex_stor_cd, self.seed_key)
+
+        return {
+            "EX_STOR_INFO": {
+                "EX_STOR_CD": str(ex_stor_cd),
+                "SENDDTTM": senddttm,
+                "ACCESS_TOKEN": self.access_token,
+                "OURHOMEKEY": str(ourhomekey)
+            },
+            "REQ_PARAMS": {
+                "GUBUN": "EX_STOR_WEEKEND_MENU_S1",
+                "BUSIPLCD": busiplcd or self.busiplcd,
+                "FR_DT": fr_dt or current_datetime.strftime("%Y%m%d")
+            }
+        }
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """Retry-After 헤더가 있으면 따르고, 없으면 지터를 준 지수 백오프"""
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_MAX)
+            except ValueError:
+                pass
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+    def _post(self, fr_dt: Optional[str], busiplcd: Optional[str], ex_stor_cd: Optional[int]) -> requests.Response:
+        """한 번의 요청 (재시도 대상 응답이면 RetryableResponse)"""
+        url = f"{self.base_url}{MENU_INFO_PATH}"
+        request_data = self.build_request(fr_dt, busiplcd, ex_stor_cd)
+        response = self.session.post(url, json=request_data, timeout=self.timeout)
+        if response.status_code >= 500 or response.status_code == 429:
+            raise RetryableResponse(response)
+        response.raise_for_status()
+        return response
+
+    def _record(self, attempts: int, seconds: float, status: Optional[int], ok: bool):
+        """호출 지표 기록"""
+        with self._stats_lock:
+            self.last_call = {'attempts': attempts, 'seconds': seconds, 'status': status, 'ok': ok}
+            self.stats['calls'] += 1
+            self.stats['attempts'] += attempts
+            self.stats['seconds'] += seconds
+            if not ok:
+                self.stats['failures'] += 1
+
+    def fetch_menu(self, fr_dt: Optional[str] = None, busiplcd: Optional[str] = None,
+                   ex_stor_cd: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        fr_dt(YYYYMMDD, 기본값 오늘)부터의 메뉴 정보를 가져옴
+        여러 스레드에서 동시에 호출해도 같은 세션의 연결 풀을 나눠 씀
+
+        Args:
+            fr_dt: 조회 시작 날짜
+            busiplcd: 사업장 코드 (기본값은 클라이언트 설정)
+            ex_stor_cd: 매장 코드 (기본값은 클라이언트 설정)
+
+        Returns:
+            API 응답 (return == "1"), 실패하면 None
+        """
+        started = time.monotonic()
+        attempts = 0
+        status = None
+        result = None
+
+        try:
+            while True:
+                attempts += 1
+                try:
+                    response = self._post(fr_dt, busiplcd, ex_stor_cd)
+                    status = response.status_code
+                    break
+                except (RetryableResponse, requests.exceptions.Timeout,
+                        requests.exceptions.ConnectionError) as e:
+                    status = e.response.status_code if isinstance(e, RetryableResponse) else None
+                    if attempts > self.max_retries:
+                        raise
+                    delay = self._retry_delay(attempts - 1, e)
+                    print(f"메뉴 API 요청 실패 ({e}), {delay:.1f}초 후 재시도 ({attempts}/{self.max_retries})")
+                    time.sleep(delay)
+
+            result = response.json()
+            if result.get("return") != "1":
+                print(f"API 오류: {result.get('errmsg', '알 수 없는 오류')}")
+                result = None
+
+        except json.JSONDecodeError:
+            print("응답 데이터 파싱 오류")
+        except (RetryableResponse, requests.exceptions.RequestException) as e:
+            print(f"요청 중 오류 발생: {str(e)}")
+
+        seconds = time.monotonic() - started
+        site = busiplcd or self.busiplcd
+        self._record(attempts, seconds, status, result is not None)
+        METRICS.observe('ourhome_fetch', seconds, site=site, ok=result is not None)
+        METRICS.inc('ourhome_attempts', attempts, site=site)
+        print(f"메뉴 API 호출 ({site}): 상태 {status}, {attempts}회 시도, {seconds:.2f}초")
+        return result
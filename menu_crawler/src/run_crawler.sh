@@ -6,6 +6,13 @@ echo "=== Crawler Start: $(date) ===" >> /home/ubuntu/susong/ForeignMenu/menu_cr
 # 작업 디렉토리로 이동
 cd /home/ubuntu/susong/ForeignMenu/menu_crawler/src
 
+# 스케줄러(scheduler.py)와 같은 잠금 파일 - 다른 크롤링/번역이 실행 중이면 건너뜀
+exec 9>>"${SCHEDULER_LOCK:-menu_scheduler.lock}"
+if ! flock -n 9; then
+    echo "Another crawl/translation run is in progress, skipping: $(date)" >> /home/ubuntu/susong/ForeignMenu/menu_crawler/logs/crawler.log
+    exit 0
+fi
+
 # Python 가상환경 활성화 (가상환경을 사용하는 경우)
 # source /path/to/your/venv/bin/activate
 
@@ -13,14 +20,21 @@ cd /home/ubuntu/susong/ForeignMenu/menu_crawler/src
 python3 crawl.py >> /home/ubuntu/susong/ForeignMenu/menu_crawler/logs/crawler.log 2>&1
 CRAWL_EXIT_CODE=$?
 
-# 크롤러 실행 결과 확인
-if [ $CRAWL_EXIT_CODE -eq 0 ]; then
+# 크롤러 실행 결과 확인 (3: 지난번과 응답이 같아 번역할 것이 없음)
+if [ $CRAWL_EXIT_CODE -eq 3 ]; then
+    echo "No menu changes, skipping translation" >> /home/ubuntu/susong/ForeignMenu/menu_crawler/logs/crawler.log
+    echo "=== Crawler End Successfully (no change): $(date) ===" >> /home/ubuntu/susong/ForeignMenu/menu_crawler/logs/crawler.log
+    exit 0
+elif [ $CRAWL_EXIT_CODE -eq 0 ]; then
     echo "Crawling successful" >> /home/ubuntu/susong/ForeignMenu/menu_crawler/logs/crawler.log
     
     # 번역 서비스 실행
     python3 translate_service.py >> /home/ubuntu/susong/ForeignMenu/menu_crawler/logs/crawler.log 2>&1
     TRANSLATE_EXIT_CODE=$?
     
+    # 바뀐 날짜의 메뉴 스냅샷 갱신 (번역이 일부 실패해도 저장된 메뉴는 반영)
+    python3 snapshots.py >> /home/ubuntu/susong/ForeignMenu/menu_crawler/logs/crawler.log 2>&1
+
     if [ $TRANSLATE_EXIT_CODE -eq 0 ]; then
         echo "Translation successful" >> /home/ubuntu/susong/ForeignMenu/menu_crawler/logs/crawler.log
         
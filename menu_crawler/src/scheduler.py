@@ -0,0 +1,306 @@
+"""
+크롤링/번역 스케줄러
+
+하나의 프로세스로 상주하면서 cron 형식의 일정에 따라
+크롤링(변경이 있으면 이어서 증분 번역)과 증분 번역을 실행하고, 끝나면 메뉴 스냅샷을 갱신한다.
+API 클라이언트와 데이터베이스 연결은 실행 사이에도 유지하고,
+실패가 이어지면 지수 백오프로 다음 실행을 늦추며,
+파일 잠금으로 다른 프로세스와 실행이 겹치지 않게 한다.
+작업별 마지막 실행 시각/소요 시간/결과는 상태 파일(JSON)에 기록된다.
+
+    python scheduler.py            # 상주 실행
+    python scheduler.py --once     # 모든 작업을 한 번씩 실행
+    python scheduler.py --status   # 마지막 실행 상태 출력
+"""
+import argparse
+import datetime
+import fcntl
+import json
+import os
+import random
+import signal
+import threading
+import time
+from typing import Callable, Dict, Any, List, Optional, Set
+from dotenv import load_dotenv
+from pathlib import Path
+from crawl import update_menu_database, load_sites
+from db_manager import MenuDatabase
+from ourhome_client import OurHomeClient
+from snapshots import build_snapshots
+from translate_service import TranslationService, LANGUAGES
+
+# Load environment variables
+env_path = Path(__file__).parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+# 기본 일정: 평일 07~19시 30분마다 크롤링, 매시 정각 번역 재시도
+CRAWL_SCHEDULE = os.getenv('CRAWL_SCHEDULE', '*/30 7-19 * * 1-5')
+TRANSLATE_SCHEDULE = os.getenv('TRANSLATE_SCHEDULE', '0 * * * *')
+
+# 실행 시각에 더할 무작위 지연(초) - 여러 서버가 같은 시각에 요청하지 않도록
+SCHEDULE_JITTER = float(os.getenv('SCHEDULER_JITTER', '30'))
+
+# 연속 실패 시 다음 실행까지의 최소 대기(초): BACKOFF_BASE * 2^(실패 횟수 - 1), 최대 BACKOFF_MAX
+BACKOFF_BASE = 60.0
+BACKOFF_MAX = 3600.0
+
+LOCK_PATH = os.getenv('SCHEDULER_LOCK', 'menu_scheduler.lock')
+STATUS_PATH = os.getenv('SCHEDULER_STATUS', 'scheduler_status.json')
+
+# cron 필드별 (최솟값, 최댓값)
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> Set[int]:
+    """'*', '*/n', 'a', 'a-b', 'a-b/n'과 이들의 쉼표 목록을 값 집합으로 변환"""
+    values = set()
+    for part in field.split(','):
+        expr, _, step = part.partition('/')
+        step = int(step) if step else 1
+        if expr == '*':
+            start, end = low, high
+        elif '-' in expr:
+            start, end = (int(value) for value in expr.split('-', 1))
+        else:
+            start = int(expr)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Invalid cron field: {field}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """
+    5필드 cron 일정 (분 시 일 월 요일, 요일은 0=일요일, 7도 일요일로 허용)
+    일과 요일이 모두 지정되면 cron과 같이 둘 중 하나만 맞아도 실행
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_cron_field(field, low, high) for field, (low, high) in zip(fields, CRON_FIELDS)
+        )
+        self.weekdays = {weekday % 7 for weekday in weekdays}
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    def _day_matches(self, moment: datetime.datetime) -> bool:
+        day_ok = moment.day in self.days
+        # datetime.weekday()는 월요일이 0
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment: datetime.datetime) -> datetime.datetime:
+        """moment 이후(초과) 처음으로 일정에 맞는 시각"""
+        candidate = moment.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        limit = candidate + datetime.timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = (candidate + datetime.timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + datetime.timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += datetime.timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression}")
+
+
+class RunLock:
+    """프로세스 간 실행 잠금 (flock, 다른 프로세스가 잡고 있으면 바로 실패)"""
+
+    def __init__(self, path: str = LOCK_PATH):
+        self.path = path
+        self._file = None
+
+    def acquire(self) -> bool:
+        self._file = open(self.path, 'a')
+        try:
+            fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._file.close()
+            self._file = None
+            return False
+        return True
+
+    def release(self):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+class Job:
+    """
+    일정에 따라 실행되는 작업
+    run은 성공 여부(bool)를 반환하며, 예외도 실패로 처리된다
+    """
+
+    def __init__(self, name: str, schedule: CronSchedule, run: Callable[[], bool]):
+        self.name = name
+        self.schedule = schedule
+        self.run = run
+        self.next_run: Optional[datetime.datetime] = None
+        self.consecutive_failures = 0
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    def plan(self, now: datetime.datetime, jitter: float = SCHEDULE_JITTER):
+        """다음 실행 시각 결정 (실패가 이어지면 백오프 시간만큼 뒤로 미룸)"""
+        next_run = self.schedule.next_after(now)
+        if self.consecutive_failures:
+            backoff = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** (self.consecutive_failures - 1)))
+            next_run = max(next_run, now + datetime.timedelta(seconds=backoff))
+        self.next_run = next_run + datetime.timedelta(seconds=random.uniform(0, jitter))
+
+
+class Scheduler:
+    """
+    작업들을 일정에 맞춰 하나씩 실행하는 상주 루프
+    작업은 같은 스레드에서 순서대로 실행되고, 실행 중에는 RunLock을 잡는다
+    """
+
+    def __init__(self, jobs: List[Job], lock: Optional[RunLock] = None, status_path: Optional[str] = STATUS_PATH):
+        self.jobs = jobs
+        self.lock = lock or RunLock()
+        self.status_path = status_path
+        self._stop = threading.Event()
+
+    def stop(self, *_):
+        self._stop.set()
+
+    def run_job(self, job: Job) -> Optional[bool]:
+        """작업을 한 번 실행하고 결과 기록 (잠금을 못 잡으면 None)"""
+        if not self.lock.acquire():
+            print(f"[{job.name}] 다른 실행이 진행 중이어서 건너뜀")
+            return None
+
+        started = time.monotonic()
+        started_at = datetime.datetime.now()
+        try:
+            ok = bool(job.run())
+        except Exception as e:
+            print(f"[{job.name}] 실행 오류: {str(e)}")
+            ok = False
+        finally:
+            self.lock.release()
+
+        job.consecutive_failures = 0 if ok else job.consecutive_failures + 1
+        job.last_run = {
+            'started_at': started_at.isoformat(timespec='seconds'),
+            'duration': round(time.monotonic() - started, 3),
+            'ok': ok,
+        }
+        print(f"[{job.name}] {'완료' if ok else '실패'} ({job.last_run['duration']:.1f}초)")
+        return ok
+
+    def status(self) -> Dict[str, Any]:
+        """작업별 마지막 실행 결과와 다음 실행 예정 시각"""
+        return {
+            job.name: {
+                'schedule': job.schedule.expression,
+                'last_run': job.last_run,
+                'consecutive_failures': job.consecutive_failures,
+                'next_run': job.next_run.isoformat(timespec='seconds') if job.next_run else None,
+            }
+            for job in self.jobs
+        }
+
+    def _write_status(self):
+        if not self.status_path:
+            return
+        tmp_path = self.status_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.status(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.status_path)
+
+    def run_once(self):
+        """모든 작업을 순서대로 한 번씩 실행"""
+        for job in self.jobs:
+            self.run_job(job)
+            job.plan(datetime.datetime.now())
+        self._write_status()
+
+    def run_forever(self):
+        """stop()이 호출될 때까지 일정에 맞춰 작업 실행"""
+        now = datetime.datetime.now()
+        for job in self.jobs:
+            job.plan(now)
+        self._write_status()
+
+        while not self._stop.is_set():
+            job = min(self.jobs, key=lambda job: job.next_run)
+            delay = (job.next_run - datetime.datetime.now()).total_seconds()
+            if delay > 0:
+                # 최대 1분씩 기다리며 종료 신호 확인
+                self._stop.wait(min(delay, 60))
+                continue
+            self.run_job(job)
+            job.plan(datetime.datetime.now())
+            self._write_status()
+
+
+def create_scheduler() -> Scheduler:
+    """크롤링/번역 작업을 등록한 스케줄러 생성 (클라이언트와 연결은 실행 사이에 재사용)"""
+    db = MenuDatabase()
+    client = OurHomeClient()
+    translator = TranslationService()
+    # 실행 사이에 유지되는 번역 캐시를 최근 번역으로 미리 채움
+    translator.cache.preload(LANGUAGES)
+
+    def translate() -> bool:
+        counts = translator.translate_new()
+        # 새 메뉴/번역이 반영된 날짜의 스냅샷을 다시 만듦
+        build_snapshots(db)
+        return not counts['failed']
+
+    def crawl() -> bool:
+        sites = load_sites()
+        summary = update_menu_database(sites, client=client, db=db)
+        if summary['no_change'] == summary['sites']:
+            print("모든 사업장의 메뉴 변경 없음: 번역을 건너뜀")
+            return True
+        # 번역 실패는 translate 작업이 다시 시도하므로 크롤링 결과에 반영하지 않음
+        translate()
+        # 모든 사업장이 실패했을 때만 업스트림 장애로 보고 백오프
+        return summary['failed'] < summary['sites']
+
+    return Scheduler([
+        Job('crawl', CronSchedule(CRAWL_SCHEDULE), crawl),
+        Job('translate', CronSchedule(TRANSLATE_SCHEDULE), translate),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run crawl and translation jobs on a schedule')
+    parser.add_argument('--once', action='store_true', help='Run every job once and exit')
+    parser.add_argument('--status', action='store_true', help='Print the last run status and exit')
+    args = parser.parse_args()
+
+    if args.status:
+        try:
+            with open(STATUS_PATH, 'r', encoding='utf-8') as f:
+                print(f.read())
+        except FileNotFoundError:
+            print(f"No status file at {STATUS_PATH}")
+        return
+
+    scheduler = create_scheduler()
+    if args.once:
+        scheduler.run_once()
+        return
+
+    signal.signal(signal.SIGTERM, scheduler.stop)
+    signal.signal(signal.SIGINT, scheduler.stop)
+    print("Scheduler started: " + ", ".join(f"{job.name}({job.schedule.expression})" for job in scheduler.jobs))
+    scheduler.run_forever()
+
+
+if __name__ == '__main__':
+    main()
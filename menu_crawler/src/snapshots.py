@@ -0,0 +1,109 @@
+"""
+날짜/언어별 메뉴 스냅샷
+
+API 서버가 요청마다 조인/문자열 분리/번역 조회를 하지 않도록,
+크롤링과 번역이 끝난 뒤 날짜와 언어마다 DayMenu 응답(JSON)을 미리 만들어 menu_snapshots에 저장한다.
+다시 만드는 날짜는 스냅샷이 없는 날짜(메뉴 저장 시 바뀐 날짜의 스냅샷은 지워짐)와
+마지막 실행 이후 추가되거나 바뀐 번역을 쓰는 날짜뿐이며, 내용이 같으면 쓰지 않는다.
+
+    python snapshots.py          # 바뀐 날짜만
+    python snapshots.py --full   # 모든 날짜 다시 확인
+"""
+import argparse
+import datetime
+import hashlib
+import json
+from typing import Dict, List, Optional, Sequence
+from db_manager import MenuDatabase
+from day_menu import build_day_menu, DEFAULT_LANGUAGE
+from metrics import METRICS
+
+# 스냅샷을 만드는 언어 (프론트엔드 지원 언어)
+SNAPSHOT_LANGUAGES = (DEFAULT_LANGUAGE, 'en', 'zh', 'sv')
+
+# 마지막으로 반영한 menu_translations 버전 (sync_state 키)
+HWM_TRANSLATION = 'snapshot.translation_version'
+
+# 한 번의 범위 쿼리로 읽을 최대 기간(일)
+BUILD_CHUNK_DAYS = 31
+
+
+def render_day(date: str, menu_data: Dict, lang: str) -> bytes:
+    """API 서버의 하루 응답과 같은 JSON 본문"""
+    return json.dumps(build_day_menu(date, menu_data, lang), ensure_ascii=False).encode('utf-8')
+
+
+def snapshot_etag(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()
+
+
+def _chunks(dates: List[str], days: int = BUILD_CHUNK_DAYS) -> List[List[str]]:
+    """정렬된 날짜를 첫 날짜부터 days일 안에 드는 묶음으로 나눔 (떨어진 날짜를 한 범위로 읽지 않도록)"""
+    chunks: List[List[str]] = []
+    end = ''
+    for date in dates:
+        if not chunks or date > end:
+            chunks.append([])
+            end = (datetime.datetime.strptime(date, "%Y%m%d") + datetime.timedelta(days=days - 1)).strftime("%Y%m%d")
+        chunks[-1].append(date)
+    return chunks
+
+
+def build_snapshots(db: MenuDatabase, languages: Sequence[str] = SNAPSHOT_LANGUAGES,
+                    full: bool = False) -> Dict[str, int]:
+    """
+    바뀐 날짜의 스냅샷을 다시 만들어 저장
+
+    Args:
+        db: 메뉴 데이터베이스
+        languages: 스냅샷을 만들 언어
+        full: 모든 메뉴 날짜를 다시 만들어 비교
+
+    Returns:
+        dates(다시 만든 날짜/언어 수), written(내용이 바뀌어 저장한 수), unchanged
+    """
+    counts = {'dates': 0, 'written': 0, 'unchanged': 0}
+    conn = db._get_connection()
+    # 이 시점까지의 번역을 반영 (실행 중 추가된 번역은 다음 실행에서 다시 확인)
+    mark = conn.execute('SELECT COALESCE(MAX(version), 0) FROM menu_translations').fetchone()[0]
+    since = 0 if full else db.get_sync_state(HWM_TRANSLATION)
+
+    with METRICS.span('snapshot_build', full=full):
+        if full:
+            all_dates = [row[0] for row in conn.execute('SELECT DISTINCT date FROM main_menu ORDER BY date')]
+        for lang in languages:
+            dates = all_dates if full else db.get_snapshot_stale_dates(lang, since)
+            query_lang = None if lang == DEFAULT_LANGUAGE else lang
+            for chunk in _chunks(dates):
+                menus = db.get_menu_by_range(chunk[0], chunk[-1], lang=query_lang)
+                etags = db.get_snapshot_etags(chunk, lang)
+                changed = []
+                for date in chunk:
+                    body = render_day(date, menus.get(date, {}), lang)
+                    etag = snapshot_etag(body)
+                    if etags.get(date) == etag:
+                        counts['unchanged'] += 1
+                    else:
+                        changed.append((date, etag, body))
+                db.save_snapshots(lang, changed)
+                counts['dates'] += len(chunk)
+                counts['written'] += len(changed)
+
+    db.set_sync_state(HWM_TRANSLATION, mark)
+    METRICS.inc('snapshots', counts['written'], result='written')
+    METRICS.inc('snapshots', counts['unchanged'], result='unchanged')
+    print(f"스냅샷: {counts['dates']}개 확인, {counts['written']}개 저장, {counts['unchanged']}개 변경 없음")
+    return counts
+
+
+def refresh_snapshots(full: bool = False, db_path: Optional[str] = None) -> Dict[str, int]:
+    """기본 데이터베이스의 스냅샷 갱신"""
+    with MenuDatabase(db_path) as db:
+        return build_snapshots(db, full=full)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build per-day, per-language menu snapshots')
+    parser.add_argument('--full', action='store_true', help='Rebuild and compare every menu date')
+    args = parser.parse_args()
+    refresh_snapshots(args.full)
@@ -1,33 +1,381 @@
+import argparse
 import json
 import os
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import openai
 from openai import OpenAI
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 import sqlite3
 from datetime import datetime
 from dotenv import load_dotenv
 from pathlib import Path
+from glossary import Glossary, SOURCE as GLOSSARY_SOURCE
+from json_stream import JsonArrayParser, parse_json_array
+from menu_names import canonical_key, split_key, combine_translations
+from metrics import METRICS
+from migrations import apply_migrations
 
 # Load environment variables from .env file
 env_path = Path(__file__).parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
+# OpenAI-compatible endpoint; set DEEPSEEK_BASE_URL to a local server (see mock_llm_server.py) to run offline
+DEFAULT_BASE_URL = "https://api.deepseek.com"
+LOCAL_API_KEY = "local"
+
+# Target languages for the frontend (Korean is served untranslated)
+LANGUAGES = ['en', 'zh', 'sv']
+
+# Display names used in prompts
+LANGUAGE_NAMES = {
+    'en': 'English',
+    'zh': 'Chinese (Simplified)',
+    'sv': 'Swedish'
+}
+
+# Few-shot examples per language
+TRANSLATION_EXAMPLES = {
+    'en': [
+        {
+            "original": "김치찌개",
+            "translated": "Kimchi Stew",
+            "description": "A traditional Korean stew made with fermented kimchi, pork, and tofu"
+        },
+        {
+            "original": "팝콘치킨샐러드",
+            "translated": "Popcorn Chicken Salad",
+            "description": "A fresh salad topped with crispy bite-sized fried chicken pieces"
+        }
+    ],
+    'zh': [
+        {
+            "original": "김치찌개",
+            "translated": "泡菜汤",
+            "description": "一道传统的韩国汤，用发酵泡菜、猪肉和豆腐制成"
+        },
+        {
+            "original": "팝콘치킨샐러드",
+            "translated": "爆米花鸡肉沙拉",
+            "description": "一道清新的沙拉，配上香脆的小块炸鸡"
+        }
+    ],
+    'sv': [
+        {
+            "original": "김치찌개",
+            "translated": "Kimchigryta",
+            "description": "En traditionell koreansk gryta gjord på fermenterad kimchi, fläsk och tofu"
+        },
+        {
+            "original": "팝콘치킨샐러드",
+            "translated": "Popcornkycklingssallad",
+            "description": "En fräsch sallad toppad med krispiga små bitar av friterad kyckling"
+        }
+    ]
+}
+
+# Number of translation requests in flight at once
+DEFAULT_CONCURRENCY = int(os.getenv('TRANSLATION_CONCURRENCY', '4'))
+
+# Retry policy for rate limits and transient API errors
+MAX_RETRIES = int(os.getenv('TRANSLATION_MAX_RETRIES', '5'))
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# Errors worth retrying; anything else (bad request, auth) fails immediately
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+# Seconds between progress lines during a long translation run
+PROGRESS_INTERVAL = 5.0
+
+# Batch planning: dishes per request are limited by an estimated output token budget
+BATCH_MAX_ITEMS = int(os.getenv('TRANSLATION_BATCH_SIZE', '20'))
+BATCH_TOKEN_BUDGET = 3000
+# Rough output cost of one {"original", "translated", "description"} object
+OUTPUT_TOKENS_PER_ITEM = 90
+# Headroom for the JSON array and any stray text around it
+RESPONSE_BASE_TOKENS = 200
+MIN_COMPLETION_TOKENS = 1000
+MAX_COMPLETION_TOKENS = 8000
+# How many times an item missing from a response is re-queued before giving up
+MAX_BATCH_ATTEMPTS = 3
+
+# Request every missing language for a dish in one call instead of one call per language
+MULTI_TARGET = os.getenv('TRANSLATION_MULTI_TARGET', '1') != '0'
+
+# Maximum (menu_name, language) entries kept in the in-process translation cache
+TRANSLATION_CACHE_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', '50000'))
+
+# Stream completions and store each translation as soon as its JSON object is complete
+STREAM_RESPONSES = os.getenv('TRANSLATION_STREAM', '0') != '0'
+# Seconds between writes of streamed translations while requests are in flight
+STREAM_FLUSH_INTERVAL = 0.2
+
+# Resolve names made only of known components (see glossary.py) locally instead of asking the LLM
+GLOSSARY_ENABLED = os.getenv('TRANSLATION_GLOSSARY', '1') != '0'
+
+# Keep IN (...) lists under SQLite's bound parameter limit
+SQL_PARAM_CHUNK = 500
+
+# sync_state keys holding the last main_menu/sub_menu ids already considered for translation,
+# and the main_menu.updated_at from which changed (re-published) dishes are considered again
+HWM_MAIN_MENU = 'translate.main_menu_id'
+HWM_SUB_MENU = 'translate.sub_menu_id'
+HWM_MAIN_UPDATED = 'translate.main_menu_updated_at'
+HWM_KEYS = (HWM_MAIN_MENU, HWM_SUB_MENU, HWM_MAIN_UPDATED)
+
+
+def is_translatable(menu_name: Optional[str]) -> bool:
+    """Skip empty names and ones that are just a number or simple text (e.g. '1/2', '3.5')."""
+    return bool(menu_name) and not menu_name.replace('/', '').replace('.', '').isdigit()
+
+
+def estimate_output_tokens(menu_name: str) -> int:
+    """Estimate completion tokens for one translated item (Korean text is ~2 tokens per syllable)."""
+    return OUTPUT_TOKENS_PER_ITEM + 2 * len(menu_name)
+
+
+def plan_batches(menu_names: List[str], max_items: int = BATCH_MAX_ITEMS,
+                 token_budget: int = BATCH_TOKEN_BUDGET, languages_count: int = 1) -> List[List[str]]:
+    """
+    Group menu names into batches that fit both the item limit and the output token budget.
+    
+    Args:
+        menu_names: Menu names to translate
+        max_items: Maximum dishes per request
+        token_budget: Maximum estimated completion tokens per request
+        languages_count: Number of target languages requested per dish
+        
+    Returns:
+        List of batches, each a list of menu names (every batch has at least one name)
+    """
+    batches = []
+    batch = []
+    batch_tokens = 0
+    for name in menu_names:
+        tokens = estimate_output_tokens(name) * languages_count
+        if batch and (len(batch) >= max_items or batch_tokens + tokens > token_budget):
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+        batch.append(name)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def completion_token_limit(menu_names: List[str], languages_count: int = 1) -> int:
+    """max_tokens for a request translating menu_names, scaled to the batch size and language count."""
+    estimate = RESPONSE_BASE_TOKENS + languages_count * sum(estimate_output_tokens(name) for name in menu_names)
+    return max(MIN_COMPLETION_TOKENS, min(MAX_COMPLETION_TOKENS, int(estimate * 1.5)))
+
+
+class TranslationProgress:
+    """Tracks completed/failed translation work and reports throughput."""
+
+    def __init__(self, total: int, interval: float = PROGRESS_INTERVAL):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.interval = interval
+        self.started = time.monotonic()
+        self._last_report = self.started
+
+    def update(self, done: int = 0, failed: int = 0):
+        self.done += done
+        self.failed += failed
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            print(self.summary())
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def summary(self) -> str:
+        finished = self.done + self.failed
+        percent = 100.0 * finished / self.total if self.total else 100.0
+        rate = self.done / self.elapsed if self.elapsed > 0 else 0.0
+        return (f"Translation progress: {finished}/{self.total} ({percent:.1f}%), "
+                f"{self.failed} failed, {rate:.2f} translations/s, {self.elapsed:.1f}s elapsed")
+
+
+class TranslationCache:
+    """
+    In-process LRU cache of menu_translations rows keyed by (menu_name, language).
+    
+    Entries are stored as (translated_name, description) tuples. Lookups that miss are
+    resolved with one query per call (see get_many), and writes through TranslationService
+    invalidate the affected keys so the next read sees the stored row.
+    
+    Keys found to have no translation are remembered too (up to max_size, LRU), so names
+    that stay untranslated do not query SQLite on every lookup. Other processes may add
+    translations, so TranslationService forgets them at the start of every run (forget_missing).
+    """
+    
+    def __init__(self, db_path: str, max_size: int = TRANSLATION_CACHE_SIZE):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple[str, str], Tuple[str, Optional[str]]]' = OrderedDict()
+        # Keys known to have no stored translation
+        self._missing: 'OrderedDict[Tuple[str, str], None]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _put(self, key: Tuple[str, str], value: Tuple[str, Optional[str]]):
+        """Insert or refresh an entry, evicting the least recently used ones (caller holds the lock)."""
+        self._missing.pop(key, None)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def _put_missing(self, key: Tuple[str, str]):
+        """Remember that key has no stored translation (caller holds the lock)."""
+        self._missing[key] = None
+        self._missing.move_to_end(key)
+        while len(self._missing) > self.max_size:
+            self._missing.popitem(last=False)
+    
+    def preload(self, languages: Optional[List[str]] = None) -> int:
+        """
+        Load existing translations into the cache (newest first, up to max_size).
+        
+        Returns:
+            Number of entries loaded
+        """
+        query = 'SELECT menu_name, language, translated_name, description FROM menu_translations'
+        params = []
+        if languages:
+            query += f' WHERE language IN ({",".join("?" * len(languages))})'
+            params = list(languages)
+        query += ' ORDER BY created_at DESC LIMIT ?'
+        params.append(self.max_size)
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+        
+        with self._lock:
+            # Insert oldest first so the newest rows end up most recently used
+            for name, lang, translated, description in reversed(rows):
+                self._put((name, lang), (translated, description))
+        return len(rows)
+    
+    def get_many(self, menu_names: List[str], language: str) -> Dict[str, Dict]:
+        """
+        Resolve translations for many menu names in one language.
+        
+        Cached names (and names known to be untranslated) are answered from memory; the rest
+        are fetched with a single IN query (chunked for very long lists) and added to the cache.
+        
+        Returns:
+            Dictionary of menu name to {'translated', 'description'} for names that have a translation
+        """
+        found = {}
+        misses = []
+        with self._lock:
+            names = list(dict.fromkeys(menu_names))
+            for name in names:
+                key = (name, language)
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    found[name] = entry
+                elif key in self._missing:
+                    self._missing.move_to_end(key)
+                else:
+                    misses.append(name)
+            self.hits += len(names) - len(misses)
+            self.misses += len(misses)
+        
+        if misses:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                for i in range(0, len(misses), SQL_PARAM_CHUNK):
+                    chunk = misses[i:i + SQL_PARAM_CHUNK]
+                    rows = conn.execute(f'''
+                    SELECT menu_name, translated_name, description
+                    FROM menu_translations
+                    WHERE language = ? AND menu_name IN ({",".join("?" * len(chunk))})
+                    ''', [language] + chunk).fetchall()
+                    with self._lock:
+                        for name, translated, description in rows:
+                            self._put((name, language), (translated, description))
+                            found[name] = (translated, description)
+                        for name in set(chunk) - {name for name, _, _ in rows}:
+                            self._put_missing((name, language))
+            finally:
+                conn.close()
+        
+        return {
+            name: {'translated': translated, 'description': description}
+            for name, (translated, description) in found.items()
+        }
+    
+    def forget_missing(self):
+        """Drop every remembered miss so the next lookup sees rows written since."""
+        with self._lock:
+            self._missing.clear()
+    
+    def invalidate(self, keys: Optional[List[Tuple[str, str]]] = None):
+        """Drop the given (menu_name, language) keys, or every entry when keys is None."""
+        with self._lock:
+            if keys is None:
+                self._entries.clear()
+                self._missing.clear()
+                return
+            for key in keys:
+                self._entries.pop(key, None)
+                self._missing.pop(key, None)
+
+
 class TranslationService:
     """
     Service for translating menu items to multiple languages and managing translations in the database.
     Supports English, Chinese, and Swedish translations with descriptions for unfamiliar Korean dishes.
     """
     
-    def __init__(self):
-        """Initialize the translation service with API client and database connection."""
-        api_key = os.getenv("DEEPSEEK_API_KEY")
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None):
+        """
+        Initialize the translation service with API client and database connection.
+        
+        Args:
+            base_url: OpenAI-compatible endpoint (default DEEPSEEK_BASE_URL, then the DeepSeek API)
+            api_key: API key (default DEEPSEEK_API_KEY; optional for endpoints other than DeepSeek)
+        """
+        base_url = base_url or os.getenv("DEEPSEEK_BASE_URL") or DEFAULT_BASE_URL
+        api_key = api_key or os.getenv("DEEPSEEK_API_KEY")
         if not api_key:
-            raise ValueError("DEEPSEEK_API_KEY not found in environment variables")
+            if base_url == DEFAULT_BASE_URL:
+                raise ValueError("DEEPSEEK_API_KEY not found in environment variables")
+            # Local stand-ins such as mock_llm_server.py ignore the key
+            api_key = LOCAL_API_KEY
             
-        print(f"Initializing with API key: {api_key[:8]}...")
+        print(f"Initializing with API key: {api_key[:8]}... ({base_url})")
         
+        # Retries are handled by _request_with_retry so backoff is visible and configurable
         self.client = OpenAI(
             api_key=api_key,
-            base_url="https://api.deepseek.com"
+            base_url=base_url,
+            max_retries=0
         )
 
         self.db_path = os.getenv('DB_PATH')
@@ -35,26 +383,18 @@ class TranslationService:
             raise ValueError("DB_PATH not found in environment variables")
         
         self._setup_database()
+        self.cache = TranslationCache(self.db_path)
+        # Set to None to send every missing name to the LLM
+        self.glossary = Glossary() if GLOSSARY_ENABLED else None
+        self.stream = STREAM_RESPONSES
 
     def _setup_database(self):
-        """Create the translations table if it doesn't exist."""
+        """Create the translations table (and the rest of the shared schema) if it doesn't exist."""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create translations table if not exists
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS menu_translations (
-            menu_name TEXT,
-            language TEXT,
-            translated_name TEXT,
-            description TEXT,
-            created_at TEXT,
-            PRIMARY KEY (menu_name, language)
-        )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        try:
+            apply_migrations(conn)
+        finally:
+            conn.close()
 
     def _get_translation_prompt(self, menu_items: List[str], target_lang: str) -> str:
         """
@@ -67,63 +407,207 @@ class TranslationService:
         Returns:
             Formatted prompt string for the API
         """
-        language_map = {
-            'en': 'English',
-            'zh': 'Chinese (Simplified)',
-            'sv': 'Swedish'
-        }
+        return f"""You are a professional menu translator. Please translate the following Korean menu items to {LANGUAGE_NAMES[target_lang]}.
+For Korean dishes that might be unfamiliar to foreigners, add a brief description.
+Please maintain the original meaning and ingredients in the translation.
+Please respond ONLY in this exact JSON format and nothing else.
+Make sure to translate both the name and description to {LANGUAGE_NAMES[target_lang]}.
+
+Here are some examples in {LANGUAGE_NAMES[target_lang]}:
+{json.dumps(TRANSLATION_EXAMPLES[target_lang], ensure_ascii=False, indent=2)}
+
+Korean menu items to translate:
+{json.dumps(menu_items, ensure_ascii=False)}"""
+
+    def _get_multi_translation_prompt(self, menu_items: List[str], languages: Sequence[str]) -> str:
+        """
+        Generate a prompt asking for every target language of each dish in one response.
         
-        examples = {
-            'en': [
-                {
-                    "original": "김치찌개",
-                    "translated": "Kimchi Stew",
-                    "description": "A traditional Korean stew made with fermented kimchi, pork, and tofu"
-                },
-                {
-                    "original": "팝콘치킨샐러드",
-                    "translated": "Popcorn Chicken Salad",
-                    "description": "A fresh salad topped with crispy bite-sized fried chicken pieces"
-                }
-            ],
-            'zh': [
-                {
-                    "original": "김치찌개",
-                    "translated": "泡菜汤",
-                    "description": "一道传统的韩国汤，用发酵泡菜、猪肉和豆腐制成"
-                },
-                {
-                    "original": "팝콘치킨샐러드",
-                    "translated": "爆米花鸡肉沙拉",
-                    "description": "一道清新的沙拉，配上香脆的小块炸鸡"
-                }
-            ],
-            'sv': [
-                {
-                    "original": "김치찌개",
-                    "translated": "Kimchigryta",
-                    "description": "En traditionell koreansk gryta gjord på fermenterad kimchi, fläsk och tofu"
-                },
-                {
-                    "original": "팝콘치킨샐러드",
-                    "translated": "Popcornkycklingssallad",
-                    "description": "En fräsch sallad toppad med krispiga små bitar av friterad kyckling"
+        Args:
+            menu_items: List of Korean menu items to translate
+            languages: Target language codes (subset of 'en', 'zh', 'sv')
+            
+        Returns:
+            Formatted prompt string for the API
+        """
+        examples = []
+        for index, example in enumerate(TRANSLATION_EXAMPLES[languages[0]]):
+            item = {"original": example["original"]}
+            for lang in languages:
+                lang_example = TRANSLATION_EXAMPLES[lang][index]
+                item[lang] = {
+                    "translated": lang_example["translated"],
+                    "description": lang_example["description"]
                 }
-            ]
-        }
+            examples.append(item)
         
-        return f"""You are a professional menu translator. Please translate the following Korean menu items to {language_map[target_lang]}.
+        targets = ", ".join(f"{LANGUAGE_NAMES[lang]} ({lang})" for lang in languages)
+        
+        return f"""You are a professional menu translator. Please translate the following Korean menu items to {targets}.
 For Korean dishes that might be unfamiliar to foreigners, add a brief description.
 Please maintain the original meaning and ingredients in the translation.
 Please respond ONLY in this exact JSON format and nothing else.
-Make sure to translate both the name and description to {language_map[target_lang]}.
+Every item must contain the keys {json.dumps(list(languages))}, each with a name and description written in that language.
 
-Here are some examples in {language_map[target_lang]}:
-{json.dumps(examples[target_lang], ensure_ascii=False, indent=2)}
+Here are some examples:
+{json.dumps(examples, ensure_ascii=False, indent=2)}
 
 Korean menu items to translate:
 {json.dumps(menu_items, ensure_ascii=False)}"""
 
+    @staticmethod
+    def _messages(prompt: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": "You are a professional menu translator. Always respond in the exact JSON format requested, with no additional text or explanations."},
+            {"role": "user", "content": prompt}
+        ]
+
+    @staticmethod
+    def _record_usage(usage):
+        """Token usage reported by the API, for tracking LLM spend."""
+        if usage is not None:
+            METRICS.inc('llm_tokens', getattr(usage, 'prompt_tokens', 0) or 0, kind='prompt')
+            METRICS.inc('llm_tokens', getattr(usage, 'completion_tokens', 0) or 0, kind='completion')
+
+    def _complete_json_array(self, prompt: str, max_tokens: int,
+                             on_item: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        Send one prompt to the DeepSeek API and parse the JSON array in the response.
+        
+        Objects of a response cut off at max_tokens are kept up to the last complete one.
+        In streaming mode on_item is called with each object as soon as it is complete.
+        
+        Raises:
+            openai.APIError: If the API request fails
+            ValueError: If the response does not contain a JSON array
+        """
+        if self.stream:
+            return self._stream_json_array(prompt, max_tokens, on_item)
+        
+        with METRICS.span('llm_request', model="deepseek-chat"):
+            completion = self.client.chat.completions.create(
+                model="deepseek-chat",
+                messages=self._messages(prompt),
+                temperature=0.7,
+                max_tokens=max_tokens
+            )
+        self._record_usage(getattr(completion, 'usage', None))
+        
+        items = parse_json_array(completion.choices[0].message.content)
+        if getattr(completion.choices[0], 'finish_reason', None) == 'length':
+            print(f"Response truncated at max_tokens={max_tokens}; kept {len(items)} complete items")
+            METRICS.inc('llm_truncated', stream=False)
+        return items
+
+    def _stream_json_array(self, prompt: str, max_tokens: int,
+                           on_item: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        Stream one completion, parsing array objects as they close (see json_stream.py).
+        
+        A response truncated at max_tokens, or a stream that breaks (lost connection,
+        API or parse error) after some objects arrived, returns the objects received so
+        far; the caller re-queues the rest.
+        
+        Raises:
+            openai.APIError: If the request fails before any object arrived
+            ValueError: If the response does not contain a JSON array
+        """
+        parser = JsonArrayParser()
+        items = []
+        finish_reason = None
+        with METRICS.span('llm_request', model="deepseek-chat", stream=True):
+            stream = self.client.chat.completions.create(
+                model="deepseek-chat",
+                messages=self._messages(prompt),
+                temperature=0.7,
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            try:
+                for chunk in stream:
+                    # The final chunk carries usage and no choices
+                    self._record_usage(getattr(chunk, 'usage', None))
+                    if not chunk.choices:
+                        continue
+                    choice = chunk.choices[0]
+                    finish_reason = choice.finish_reason or finish_reason
+                    for item in parser.feed(choice.delta.content or ''):
+                        items.append(item)
+                        if on_item is not None:
+                            on_item(item)
+            except Exception as e:
+                if not items:
+                    raise
+                print(f"Stream interrupted after {len(items)} items: {e.__class__.__name__}")
+                finish_reason = 'interrupted'
+        
+        if not parser.started:
+            raise ValueError("Invalid response format: no JSON array in streamed response")
+        if finish_reason in ('length', 'interrupted') or parser.pending:
+            print(f"Streamed response ended early ({finish_reason}); kept {len(items)} complete items")
+            METRICS.inc('llm_truncated', stream=True)
+        return items
+
+    def _request_translations(self, menu_items: List[str], target_lang: str,
+                              on_item: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        Send one single-language translation request to the DeepSeek API.
+        
+        Args:
+            menu_items: List of menu items to translate
+            target_lang: Target language code
+            on_item: Called with each result as it arrives (streaming mode)
+            
+        Returns:
+            List of translation results with descriptions
+        """
+        prompt = self._get_translation_prompt(menu_items, target_lang)
+        return self._complete_json_array(prompt, completion_token_limit(menu_items), on_item)
+
+    def _request_multi_translations(self, menu_items: List[str], languages: Sequence[str],
+                                    on_item: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        Send one request translating menu items into several languages at once.
+        
+        Returns:
+            List of {"original": ..., "<lang>": {"translated": ..., "description": ...}} results
+        """
+        prompt = self._get_multi_translation_prompt(menu_items, languages)
+        return self._complete_json_array(prompt, completion_token_limit(menu_items, len(languages)), on_item)
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """Exponential backoff with full jitter, honouring Retry-After on rate limits."""
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_MAX)
+            except ValueError:
+                pass
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+    def _request_with_retry(self, request: Callable[[], List[Dict]], label: str) -> List[Dict]:
+        """
+        Call request(), retrying rate limits and transient errors with backoff.
+        
+        Raises:
+            The last error once MAX_RETRIES is exhausted, or any non-retryable error.
+        """
+        attempt = 0
+        while True:
+            try:
+                return request()
+            except RETRYABLE_ERRORS as e:
+                if attempt >= MAX_RETRIES:
+                    raise
+                delay = self._retry_delay(attempt, e)
+                METRICS.inc('llm_retries', error=e.__class__.__name__)
+                print(f"Retrying {label} translation in {delay:.1f}s "
+                      f"(attempt {attempt + 1}/{MAX_RETRIES}): {e.__class__.__name__}")
+                time.sleep(delay)
+                attempt += 1
+
     def _translate_batch(self, menu_items: List[str], target_lang: str) -> List[Dict]:
         """
         Translate a batch of menu items using the DeepSeek API.
@@ -133,40 +617,457 @@ Korean menu items to translate:
             target_lang: Target language code
             
         Returns:
-            List of translation results with descriptions
+            List of translation results with descriptions (empty on failure)
         """
         try:
-            prompt = self._get_translation_prompt(menu_items, target_lang)
-            
-            completion = self.client.chat.completions.create(
-                model="deepseek-chat",
-                messages=[
-                    {"role": "system", "content": "You are a professional menu translator. Always respond in the exact JSON format requested, with no additional text or explanations."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000
+            return self._request_with_retry(
+                lambda: self._request_translations(menu_items, target_lang), target_lang
             )
             
-            response_text = completion.choices[0].message.content
-            
-            # Extract JSON from response
-            start_idx = response_text.find('[')
-            end_idx = response_text.rfind(']') + 1
-            
-            if start_idx == -1 or end_idx == 0:
-                print(f"Invalid response format: {response_text}")
-                return []
-                
-            json_str = response_text[start_idx:end_idx]
-            translations = json.loads(json_str)
+        except Exception as e:
+            print(f"Translation error: {str(e)}")
+            print(f"Full error details: {e.__class__.__name__}")
+            return []
+
+    def find_missing_translations(self, menu_names: List[str], languages: List[str]) -> Dict[str, List[str]]:
+        """
+        Find which languages each menu name is still missing.
+        
+        Returns:
+            Dictionary of menu name to missing language codes (names with nothing missing are omitted)
+        """
+        existing = {lang: self.cache.get_many(menu_names, lang) for lang in languages}
+        
+        missing = {}
+        for name in menu_names:
+            langs = [lang for lang in languages if name not in existing[lang]]
+            if langs:
+                missing[name] = langs
+        return missing
+
+    def get_high_water_mark(self) -> Tuple[int, int, int]:
+        """(main_menu id, sub_menu id, main_menu updated_at) up to which menus have been considered for translation."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            state = dict(conn.execute(
+                'SELECT name, value FROM sync_state WHERE name IN (?, ?, ?)', HWM_KEYS
+            ).fetchall())
+        finally:
+            conn.close()
+        return tuple(state.get(key, 0) for key in HWM_KEYS)
+
+    def set_high_water_mark(self, mark: Tuple[int, int, int]):
+        """Record that every main_menu/sub_menu row up to mark has been considered."""
+        now = datetime.now().isoformat()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.executemany('''
+            INSERT INTO sync_state (name, value, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            ''', [(key, value, now) for key, value in zip(HWM_KEYS, mark)])
+            conn.commit()
+        finally:
+            conn.close()
+
+    @METRICS.timed('translate_find_untranslated')
+    def find_untranslated(self, languages: List[str], since: Tuple[int, int, int] = (0, 0, 0),
+                          until: Optional[Tuple[int, ...]] = None) -> Dict[str, List[str]]:
+        """
+        Find normalized menu names (see menu_names.canonical_key) lacking a translation,
+        via an anti-join against menu_translations.
+        
+        Args:
+            languages: Target language codes
+            since: The high-water mark; only main_menu/sub_menu rows with ids above its
+                   first two values, or main_menu rows changed at or after its third,
+                   are considered. (0, 0, 0) scans the full history
+            until: Ignore rows with ids above these (rows added after the scan started)
             
-            return translations
+        Returns:
+            Dictionary of normalized menu name to missing language codes
+        """
+        until = until or (2 ** 63 - 1, 2 ** 63 - 1)
+        language_rows = " UNION ALL ".join("SELECT ?" for _ in languages)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(f'''
+            WITH names(name) AS (
+                SELECT main_menu FROM main_menu WHERE id > ? AND id <= ?
+                UNION
+                SELECT main_menu FROM main_menu WHERE updated_at >= ? AND id <= ?
+                UNION
+                SELECT menu_name FROM sub_menu WHERE id > ? AND id <= ?
+            ),
+            keys(name) AS (
+                SELECT DISTINCT COALESCE(d.canonical, n.name)
+                FROM names n LEFT JOIN dish_names d ON d.name = n.name
+                WHERE n.name IS NOT NULL
+            ),
+            langs(language) AS ({language_rows})
+            SELECT k.name, l.language
+            FROM keys k CROSS JOIN langs l
+            WHERE NOT EXISTS (
+                SELECT 1 FROM menu_translations t
+                WHERE t.menu_name = k.name AND t.language = l.language
+            )
+            ORDER BY k.name
+            ''', (since[0], until[0], since[2], until[0], since[1], until[1], *languages)).fetchall()
+        finally:
+            conn.close()
+        
+        missing = {}
+        for name, lang in rows:
+            # Names stored before their key was computed come back raw
+            key = canonical_key(name)
+            if is_translatable(key):
+                missing.setdefault(key, set()).add(lang)
+        # Keep the caller's language order
+        return {name: [lang for lang in languages if lang in langs] for name, langs in missing.items()}
+
+    def translate_new(self, concurrency: Optional[int] = None, multi_target: Optional[bool] = None,
+                      full: bool = False) -> Dict[str, int]:
+        """
+        Translate names introduced or changed since the last run (or the whole history when full).
+        
+        The high-water mark only advances when every translation succeeded, so failed
+        names are picked up again on the next incremental run.
+        
+        Returns:
+            Counts from translate_pending plus the number of 'names' considered
+        """
+        # Rows written by other processes since the last run must be visible to split_combos/save_combos
+        self.cache.forget_missing()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            current = tuple(conn.execute(
+                'SELECT (SELECT COALESCE(MAX(id), 0) FROM main_menu), (SELECT COALESCE(MAX(id), 0) FROM sub_menu)'
+            ).fetchone()) + (int(time.time()),)
+        finally:
+            conn.close()
+        
+        since = (0, 0, 0) if full else self.get_high_water_mark()
+        pending = self.find_untranslated(LANGUAGES, since, current)
+        print(f"{'Full' if full else 'Incremental'} translation: {len(pending)} names need translation "
+              f"(menu ids {since[0]}..{current[0]}, sub-menu ids {since[1]}..{current[1]})")
+        
+        parts, combos = self.split_combos(pending)
+        parts, local = self.translate_from_glossary(parts)
+        counts = self.translate_pending(parts, concurrency, multi_target)
+        counts['glossary'] = local
+        counts['combined'] = self.save_combos(combos)
+        counts['names'] = len(pending)
+        if not counts['failed']:
+            self.set_high_water_mark(current)
+        return counts
+
+    def split_combos(self, pending: Dict[str, List[str]]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+        """
+        Replace combo names (e.g. '돈까스/우동', see menu_names.split_key) in pending by their parts.
+        
+        Parts that already have a translation are not requested again. Combos with a part that
+        cannot be translated on its own (e.g. a bare number) are kept and translated whole.
+        
+        Returns:
+            (names to translate with their missing languages, combo names to assemble with save_combos)
+        """
+        names = {}
+        combos = {}
+        for name, langs in pending.items():
+            parts = split_key(name)
+            if len(parts) > 1 and all(is_translatable(part) for part in parts):
+                combos[name] = langs
+            else:
+                names[name] = langs
+        if not combos:
+            return names, combos
+        
+        languages = list(dict.fromkeys(lang for langs in combos.values() for lang in langs))
+        parts = sorted({part for name in combos for part in split_key(name)})
+        for part, langs in self.find_missing_translations(parts, languages).items():
+            names[part] = list(dict.fromkeys(names.get(part, []) + langs))
+        return names, combos
+
+    @METRICS.timed('translate_glossary')
+    def translate_from_glossary(self, pending: Dict[str, List[str]]) -> Tuple[Dict[str, List[str]], int]:
+        """
+        Store translations for names made only of glossary components and return the rest.
+        
+        The glossary is rebuilt from the curated components and every stored LLM translation
+        first, so dishes translated by earlier runs become components for new names. Rows are
+        stored with source 'glossary' so an LLM translation can replace them later.
+        
+        Returns:
+            (names still to send to the LLM with their missing languages, number of translations stored)
+        """
+        if self.glossary is None or not pending:
+            return pending, 0
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            learned = self.glossary.load(conn)
+            resolved, remaining = self.glossary.resolve(pending)
+            if resolved:
+                self._save_translations(conn, resolved, GLOSSARY_SOURCE)
+        finally:
+            conn.close()
+        
+        total = sum(len(langs) for langs in pending.values())
+        print(f"Glossary ({self.glossary.size} terms, {learned} learned translations): "
+              f"{len(resolved)}/{total} translations resolved locally ({len(resolved) / total:.0%})")
+        METRICS.inc('glossary', len(resolved), result='hit')
+        METRICS.inc('glossary', total - len(resolved), result='miss')
+        return remaining, len(resolved)
+
+    def save_combos(self, combos: Dict[str, List[str]]) -> int:
+        """
+        Store translations of combo names assembled from their parts' translations.
+        
+        Combos with a part still untranslated (its request failed) are skipped and picked up
+        again by the next run that retries the part. Combos with a part translated by the
+        glossary are stored as glossary translations too.
+        
+        Returns:
+            Number of (combo name, language) translations stored
+        """
+        rows = []
+        languages = list(dict.fromkeys(lang for langs in combos.values() for lang in langs))
+        for lang in languages:
+            names = [name for name, langs in combos.items() if lang in langs]
+            translated = self.cache.get_many([part for name in names for part in split_key(name)], lang)
+            for name in names:
+                parts = split_key(name)
+                if all(part in translated for part in parts):
+                    rows.append((name, lang, combine_translations([translated[part] for part in parts])))
+        
+        if rows:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                glossary_parts = set(conn.execute(
+                    'SELECT menu_name, language FROM menu_translations WHERE source = ?', (GLOSSARY_SOURCE,)
+                ).fetchall())
+                from_glossary = [
+                    row for row in rows if any((part, row[1]) in glossary_parts for part in split_key(row[0]))
+                ]
+                self._save_translations(conn, [row for row in rows if row not in from_glossary])
+                self._save_translations(conn, from_glossary, GLOSSARY_SOURCE)
+            finally:
+                conn.close()
+            print(f"Assembled {len(rows)} combo translations from their parts")
+        METRICS.inc('translations', len(rows), result='combined')
+        return len(rows)
+
+    def _save_translations(self, conn: sqlite3.Connection, rows: List[Tuple[str, str, Dict]],
+                           source: Optional[str] = None) -> int:
+        """
+        Insert (menu_name, language, translation) rows, leaving existing translations untouched
+        except glossary translations, which rows from the LLM (source None) replace.
+        """
+        if not rows:
+            return 0
+        now = datetime.now().isoformat()
+        cursor = conn.executemany('''
+        INSERT INTO menu_translations (menu_name, language, translated_name, description, created_at, source)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(menu_name, language) DO UPDATE SET
+            translated_name = excluded.translated_name, description = excluded.description,
+            created_at = excluded.created_at, source = excluded.source
+        WHERE menu_translations.source IS NOT NULL AND excluded.source IS NULL
+        ''', [
+            (name, lang, item['translated'], item.get('description'), now, source)
+            for name, lang, item in rows
+        ])
+        conn.commit()
+        self.cache.invalidate([(name, lang) for name, lang, _ in rows])
+        return cursor.rowcount
+
+    def _match_results(self, menu_items: List[str], results: List[Dict]) -> Dict[str, Dict]:
+        """
+        Map translation results back to the requested menu names by their 'original' field.
+        
+        Results may come back reordered, with extra whitespace, or with items missing;
+        anything that does not match a requested name is dropped.
+        """
+        requested = {name.strip(): name for name in menu_items}
+        matched = {}
+        for item in results:
+            if not isinstance(item, dict):
+                continue
+            name = requested.get(str(item.get('original', '')).strip())
+            if name is not None and name not in matched:
+                matched[name] = item
+        return matched
+
+    @staticmethod
+    def _result_translations(item: Dict, languages: Sequence[str]) -> Dict[str, Dict]:
+        """{language: translation} carried by one result, keeping only entries with a translated name."""
+        if len(languages) == 1:
+            translations = {languages[0]: item}
+        else:
+            translations = {lang: item[lang] for lang in languages if isinstance(item.get(lang), dict)}
+        return {lang: entry for lang, entry in translations.items() if entry.get('translated')}
+
+    def _translate_languages(self, menu_items: List[str], languages: Sequence[str],
+                             on_translated: Optional[Callable[[str, Dict[str, Dict]], None]] = None
+                             ) -> Dict[str, Dict[str, Dict]]:
+        """
+        Translate menu items into one or more languages with a single request.
+        
+        Args:
+            menu_items: List of menu items to translate
+            languages: Target language codes; more than one uses the multi-target prompt
+            on_translated: Called with (menu name, {language: translation}) as each result
+                           arrives when responses are streamed
             
+        Returns:
+            Dictionary of menu name to {language: translation} for every valid translation
+            received. Languages absent or invalid for a dish are omitted. On failure, only
+            the results already streamed (empty when not streaming).
+        """
+        # Results streamed before a failure are still returned, so only the rest is re-queued
+        received = []
+        
+        def on_item(item: Dict):
+            received.append(item)
+            if on_translated is None:
+                return
+            for name, result in self._match_results(menu_items, [item]).items():
+                translations = self._result_translations(result, languages)
+                if translations:
+                    on_translated(name, translations)
+        
+        try:
+            if len(languages) == 1:
+                lang = languages[0]
+                results = self._request_with_retry(
+                    lambda: self._request_translations(menu_items, lang, on_item), lang
+                )
+            else:
+                results = self._request_with_retry(
+                    lambda: self._request_multi_translations(menu_items, languages, on_item), "/".join(languages)
+                )
         except Exception as e:
             print(f"Translation error: {str(e)}")
             print(f"Full error details: {e.__class__.__name__}")
-            return []
+            results = received
+        
+        return {
+            name: self._result_translations(item, languages)
+            for name, item in self._match_results(menu_items, results).items()
+        }
+
+    @METRICS.timed('translate_pending')
+    def translate_pending(self, pending: Dict[str, List[str]], concurrency: Optional[int] = None,
+                          multi_target: Optional[bool] = None) -> Dict[str, int]:
+        """
+        Translate every (menu name, language) pair in pending concurrently.
+        
+        In multi-target mode, dishes missing several languages are translated into all of
+        them with one request; otherwise each language is requested separately. Names are
+        grouped into token-budgeted batches (see plan_batches). Requests run on a thread
+        pool bounded by concurrency and results are written to the database from the
+        calling thread as each request completes, or, when streaming, as each dish arrives.
+        Dishes or languages missing from a response (including one cut off mid-stream)
+        are re-queued as smaller single-language batches.
+        
+        Args:
+            pending: Dictionary of menu name to language codes to translate
+            concurrency: Maximum number of requests in flight (default TRANSLATION_CONCURRENCY)
+            multi_target: Request all languages of a dish at once (default TRANSLATION_MULTI_TARGET)
+            
+        Returns:
+            Counts of 'translated' and 'failed' pairs and API 'requests' made
+        """
+        concurrency = concurrency or DEFAULT_CONCURRENCY
+        multi_target = MULTI_TARGET if multi_target is None else multi_target
+        
+        # Group names by the exact set of languages requested together
+        groups = {}
+        for name, langs in pending.items():
+            if multi_target and len(langs) > 1:
+                groups.setdefault(tuple(langs), []).append(name)
+            else:
+                for lang in langs:
+                    groups.setdefault((lang,), []).append(name)
+        
+        total = sum(len(langs) * len(names) for langs, names in groups.items())
+        progress = TranslationProgress(total)
+        if not total:
+            return {'translated': 0, 'failed': 0, 'requests': 0}
+        
+        print(f"Translating {total} missing translations with concurrency {concurrency}"
+              f"{' (streaming)' if self.stream else ''}")
+        requests = 0
+        # Streamed results arrive on worker threads and are written here, on the connection's thread
+        streamed = queue.Queue()
+        saved = set()
+        conn = sqlite3.connect(self.db_path)
+        
+        def save(results: List[Tuple[str, Dict[str, Dict]]]):
+            rows = [
+                (name, lang, item)
+                for name, translations in results
+                for lang, item in translations.items()
+                if (name, lang) not in saved
+            ]
+            if rows:
+                self._save_translations(conn, rows)
+                saved.update((name, lang) for name, lang, _ in rows)
+                progress.update(done=len(rows))
+        
+        def save_streamed():
+            results = []
+            while not streamed.empty():
+                results.append(streamed.get_nowait())
+            save(results)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                running = {}
+                on_translated = (lambda name, translations: streamed.put((name, translations))) if self.stream else None
+                
+                def submit(batch: List[str], langs: Tuple[str, ...], attempt: int):
+                    future = executor.submit(self._translate_languages, batch, langs, on_translated)
+                    running[future] = (batch, langs, attempt)
+                
+                for langs, names in groups.items():
+                    for batch in plan_batches(names, languages_count=len(langs)):
+                        submit(batch, langs, 0)
+                
+                while running:
+                    finished, _ = wait(running, timeout=STREAM_FLUSH_INTERVAL if self.stream else None,
+                                       return_when=FIRST_COMPLETED)
+                    # A finished request has queued all of its streamed results before returning
+                    save_streamed()
+                    for future in finished:
+                        batch, langs, attempt = running.pop(future)
+                        requests += 1
+                        matched = future.result()
+                        save(list(matched.items()))
+                        
+                        for lang in langs:
+                            # Streamed results are saved even if the request failed afterwards
+                            missing = [name for name in batch
+                                       if lang not in matched.get(name, {}) and (name, lang) not in saved]
+                            if not missing:
+                                continue
+                            if attempt + 1 < MAX_BATCH_ATTEMPTS:
+                                # Fall back to single-language requests for the gaps, in smaller
+                                # batches so one bad item cannot sink the rest
+                                max_items = len(batch) if len(langs) > 1 else max(1, len(batch) // 2)
+                                print(f"Re-queuing {len(missing)} {lang} items missing from response")
+                                for retry_batch in plan_batches(missing, max_items=max_items):
+                                    submit(retry_batch, (lang,), attempt + 1)
+                            else:
+                                print(f"Giving up on {lang} translation for: {', '.join(missing)}")
+                                progress.update(failed=len(missing))
+        finally:
+            conn.close()
+        
+        print(progress.summary())
+        print(f"Translation requests: {requests}")
+        METRICS.inc('translations', progress.done, result='translated')
+        METRICS.inc('translations', progress.failed, result='failed')
+        return {'translated': progress.done, 'failed': progress.failed, 'requests': requests}
 
     def get_or_create_translations(self, menu_id: int, menu_name: str, languages: List[str]) -> Dict[str, Dict]:
         """
@@ -180,51 +1081,42 @@ Korean menu items to translate:
         Returns:
             Dictionary of translations and descriptions by language
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # Translations are stored under the normalized name; combos are assembled from their parts
+        menu_name = canonical_key(menu_name)
+        parts = split_key(menu_name)
+        if len(parts) > 1 and all(is_translatable(part) for part in parts):
+            for part in parts:
+                self.get_or_create_translations(menu_id, part, languages)
+            combos = {menu_name: self.find_missing_translations([menu_name], languages).get(menu_name, [])}
+            self.save_combos(combos)
         
         translations = {}
         to_translate = []
         
         for lang in languages:
-            cursor.execute('''
-            SELECT translated_name, description
-            FROM menu_translations
-            WHERE menu_name = ? AND language = ?
-            ''', (menu_name, lang))
-            
-            result = cursor.fetchone()
-            if result:
-                translations[lang] = {
-                    'translated': result[0],
-                    'description': result[1]
-                }
+            cached = self.cache.get_many([menu_name], lang)
+            if menu_name in cached:
+                translations[lang] = cached[menu_name]
             else:
                 to_translate.append(lang)
         
-        if to_translate:
-            for lang in to_translate:
-                translated_batch = self._translate_batch([menu_name], lang)
-                if translated_batch:
-                    trans_item = translated_batch[0]
-                    translations[lang] = {
-                        'translated': trans_item['translated'],
-                        'description': trans_item.get('description')
-                    }
-                    
-                    cursor.execute('''
-                    INSERT INTO menu_translations (menu_name, language, translated_name, description, created_at)
-                    VALUES (?, ?, ?, ?, ?)
-                    ''', (
-                        menu_name,
-                        lang,
-                        trans_item['translated'],
-                        trans_item.get('description'),
-                        datetime.now().isoformat()
-                    ))
+        rows = []
+        for lang in to_translate:
+            translated_batch = self._translate_batch([menu_name], lang)
+            if translated_batch:
+                trans_item = translated_batch[0]
+                translations[lang] = {
+                    'translated': trans_item['translated'],
+                    'description': trans_item.get('description')
+                }
+                rows.append((menu_name, lang, translations[lang]))
         
-        conn.commit()
-        conn.close()
+        if rows:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                self._save_translations(conn, rows)
+            finally:
+                conn.close()
         return translations
 
 def test_translation():
@@ -244,68 +1136,40 @@ def test_translation():
         print(f"Test failed: {e}")
         raise
 
-def translate_menu():
+def translate_menu(concurrency: Optional[int] = None, multi_target: Optional[bool] = None, full: bool = False,
+                   stream: Optional[bool] = None):
     """
-    Main function to translate all menu items in the database.
+    Main function to translate menu items in the database.
     Supports translation to English (en), Chinese (zh), and Swedish (sv).
+    By default only names added since the last successful run are considered;
+    full=True re-checks the whole history. Existing translations are never rewritten.
+    stream=True streams responses (default TRANSLATION_STREAM).
     """
     service = TranslationService()
+    if stream is not None:
+        service.stream = stream
     
     try:
-        # Get all menu items first
-        conn = sqlite3.connect(service.db_path)
-        cursor = conn.cursor()
-        
-        # Get all unique menu items from both main_menu and sub_menu tables
-        cursor.execute('''
-        SELECT DISTINCT menu_name as name
-        FROM sub_menu
-        UNION 
-        SELECT DISTINCT main_menu as name
-        FROM main_menu
-        ''')
-        menu_items = cursor.fetchall()
-        conn.close()
-        
-        # Translate each menu item
-        languages = ['en', 'zh', 'sv']
-        for (menu_name,) in menu_items:
-            # Skip if the menu item is just a number or simple text
-            if menu_name.replace('/', '').replace('.', '').isdigit():
-                continue
-                
-            translations = service.get_or_create_translations(None, menu_name, languages)
-            
-            # Insert translations into database
-            conn = sqlite3.connect(service.db_path)
-            cursor = conn.cursor()
-            
-            for lang, trans in translations.items():
-                if trans.get('translated'):
-                    try:
-                        cursor.execute('''
-                        INSERT OR REPLACE INTO menu_translations 
-                        (menu_name, language, translated_name, description, created_at)
-                        VALUES (?, ?, ?, ?, ?)
-                        ''', (
-                            menu_name,
-                            lang,
-                            trans['translated'],
-                            trans.get('description'),
-                            datetime.now().isoformat()
-                        ))
-                    except Exception as e:
-                        print(f"Error inserting translation for {menu_name}: {e}")
-            
-            conn.commit()
-            conn.close()
-            
-        print("Translation completed successfully!")
+        counts = service.translate_new(concurrency, multi_target, full)
+        
+        if counts['failed']:
+            print(f"Translation finished with {counts['failed']} failures")
+        else:
+            print("Translation completed successfully!")
         
     except Exception as e:
         print(f"Error during translation: {e}")
-        if 'conn' in locals():
-            conn.close()
 
 if __name__ == '__main__':
-    translate_menu()  # Run full translation
+    parser = argparse.ArgumentParser(description='Translate menu items in the database')
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help=f'Maximum concurrent translation requests (default {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--single-target', action='store_true',
+                        help='Request each language separately instead of all languages per dish')
+    parser.add_argument('--full', action='store_true',
+                        help='Check the whole menu history instead of only names added since the last run')
+    parser.add_argument('--stream', action='store_true',
+                        help='Stream responses and store each translation as soon as it arrives')
+    args = parser.parse_args()
+    translate_menu(args.concurrency, False if args.single_target else None, args.full,
+                   True if args.stream else None)
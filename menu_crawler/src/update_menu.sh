@@ -1,3 +1,6 @@
 #!/bin/bash
-cd /Users/andrew/Project/ForeignMenu
+cd "$(dirname "$0")"
+# 스케줄러(scheduler.py)와 같은 잠금 파일 - 다른 크롤링/번역이 실행 중이면 건너뜀
+exec 9>>"${SCHEDULER_LOCK:-menu_scheduler.lock}"
+flock -n 9 || { echo "Another crawl/translation run is in progress, skipping" >> menu_update.log; exit 0; }
 /usr/local/bin/python3 crawl.py >> menu_update.log 2>&1
@@ -18,38 +18,44 @@ export const LANGUAGES = {
 export async function getWeeklyMenu(date: Date = new Date(), language: Language = 'en'): Promise<WeekMenu> {
   // If it's Sunday, start from the next day (Monday)
   const startDate = isSunday(date) ? addDays(date, 1) : date;
-  const days: DayMenu[] = [];
+  const formattedStart = format(startDate, 'yyyyMMdd');
+
+  // One request returns the next 5 weekday menus starting from startDate
+  try {
+    const response = await fetch(`${API_URL}/api/menu/week/${formattedStart}?lang=${language}`);
+    if (!response.ok) {
+      throw new Error(`Failed to fetch weekly menu for ${formattedStart}`);
+    }
+
+    return await response.json();
+  } catch (error) {
+    console.error(`Error fetching weekly menu for ${formattedStart}:`, error);
+    return { days: getWeekdays(startDate).map(day => emptyDayMenu(day, language)) };
+  }
+}
+
+function getWeekdays(startDate: Date): string[] {
+  const days: string[] = [];
   let currentDate = startDate;
-  
-  // Continue fetching until we have 5 weekday menus
+
+  // Skip weekends until we have 5 weekdays
   while (days.length < 5) {
-    // Skip weekends
     if (!isWeekend(currentDate)) {
-      const formattedDate = format(currentDate, 'yyyyMMdd');
-      
-      try {
-        const response = await fetch(`${API_URL}/api/menu/${formattedDate}?lang=${language}`);
-        if (!response.ok) {
-          throw new Error(`Failed to fetch menu for ${formattedDate}`);
-        }
-        
-        const dayMenu = await response.json();
-        days.push(dayMenu);
-      } catch (error) {
-        console.error(`Error fetching menu for ${formattedDate}:`, error);
-        // Add empty menu for this day
-        days.push({
-          date: formattedDate,
-          language,
-          lunch: [],
-          dinner: [],
-          dessert: null,
-          salad: null,
-        });
-      }
+      days.push(format(currentDate, 'yyyyMMdd'));
     }
     currentDate = addDays(currentDate, 1);
   }
-  
-  return { days };
+
+  return days;
+}
+
+function emptyDayMenu(date: string, language: Language): DayMenu {
+  return {
+    date,
+    language,
+    lunch: [],
+    dinner: [],
+    dessert: null,
+    salad: null,
+  };
 }
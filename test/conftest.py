@@ -0,0 +1,95 @@
+"""
+테스트 공통 설정과 가짜 데이터
+
+menu_crawler/src를 import 경로에 추가하므로 테스트 파일을 하나씩 실행해도(pytest test/test_x.py,
+python test/test_x.py) PYTHONPATH 없이 동작한다.
+unittest 테스트는 함수를 직접 import하고, pytest 테스트는 같은 이름의 fixture로 받는다.
+"""
+import json
+import os
+import re
+import sys
+import threading
+from types import SimpleNamespace
+import openai
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "menu_crawler", "src"))
+
+
+def make_menu(date, meal_type="중식", corner="A", name="김치찌개", subs=("쌀밥", "깍두기"), corner_name="코너1"):
+    """API 응답 형식의 메뉴 항목 생성"""
+    return {
+        "OFFERDT": date,
+        "MEALCLASS_NM": meal_type,
+        "FR_TM": "1120",
+        "TO_TM": "1300",
+        "CORNER": corner,
+        "CORNERNM": corner_name,
+        "MENUNM": name,
+        "MENU": "M001",
+        "SUB_MENU_INFO": [{"MENUNM": sub} for sub in subs] + [{"MENUNM": None}],
+    }
+
+
+def rate_limit_error():
+    """HTTP 응답 없이 만든 RateLimitError"""
+    error = openai.RateLimitError.__new__(openai.RateLimitError)
+    error.response = None
+    return error
+
+
+class FakeCompletions:
+    """chat.completions.create를 흉내 내는 가짜 클라이언트"""
+
+    def __init__(self, failures=0, drop_once=(), drop_lang_once=()):
+        self.calls = []
+        self.failures = failures
+        # 첫 응답에서 한 번 빠뜨릴 메뉴 이름
+        self.drop_once = set(drop_once)
+        # 다국어 응답에서 한 번 빠뜨릴 (메뉴 이름, 언어)
+        self.drop_lang_once = set(drop_lang_once)
+        self._lock = threading.Lock()
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+            if self.failures:
+                self.failures -= 1
+                raise rate_limit_error()
+        prompt = kwargs["messages"][-1]["content"]
+        items = json.loads(prompt[prompt.rindex("["):])
+        with self._lock:
+            dropped = self.drop_once & set(items)
+            self.drop_once -= dropped
+        languages = re.search(r"must contain the keys (\[.*?\])", prompt)
+        results = []
+        # 순서를 뒤집어 original 필드로 매칭되는지 확인
+        for item in reversed(items):
+            if item in dropped:
+                continue
+            if languages is None:
+                results.append({"original": item, "translated": f"T({item})", "description": None})
+                continue
+            result = {"original": item}
+            for lang in json.loads(languages.group(1)):
+                with self._lock:
+                    if (item, lang) in self.drop_lang_once:
+                        self.drop_lang_once.discard((item, lang))
+                        continue
+                result[lang] = {"translated": f"{lang}({item})", "description": None}
+            results.append(result)
+        content = json.dumps(results, ensure_ascii=False)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture(name="make_menu")
+def make_menu_fixture():
+    """메뉴 항목 생성 함수"""
+    return make_menu
+
+
+@pytest.fixture(name="fake_completions")
+def fake_completions_fixture():
+    """가짜 chat.completions 클라이언트"""
+    return FakeCompletions()
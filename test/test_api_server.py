@@ -0,0 +1,153 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from unittest import mock
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from conftest import make_menu
+from api_server import MenuApiServer
+from db_manager import MenuDatabase
+
+
+class TestMenuApiServer(unittest.TestCase):
+    def setUp(self):
+        """임시 데이터베이스와 API 서버 시작"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db = MenuDatabase(os.path.join(self.tmpdir, "menu.db"))
+        self.db.insert_menu_batch([
+            make_menu("20250106", corner="A", name="김치찌개"),
+            make_menu("20250106", corner="E", name="요거트", subs=("바나나",), corner_name="후식"),
+            make_menu("20250106", meal_type="석식", corner="A", name="산채비빔밥", subs=()),
+        ])
+        conn = self.db._get_connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO menu_translations VALUES (?, ?, ?, ?, ?, NULL, NULL)",
+                ("김치찌개", "en", "Kimchi Stew", "Spicy stew", datetime.now().isoformat())
+            )
+            conn.execute(
+                "INSERT INTO menu_translations VALUES (?, ?, ?, ?, ?, NULL, NULL)",
+                ("쌀밥", "en", "Rice", None, datetime.now().isoformat())
+            )
+
+        self.server = MenuApiServer(("127.0.0.1", 0), self.db, workers=2)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.db.close()
+        shutil.rmtree(self.tmpdir)
+
+    def _get(self, path, headers=None):
+        try:
+            with urlopen(Request(self.base_url + path, headers=headers or {})) as response:
+                return response.status, response.headers, json.loads(response.read())
+        except HTTPError as e:
+            return e.code, e.headers, None
+
+    def test_day_menu_translated(self):
+        """번역된 DayMenu 형식 응답"""
+        status, _, body = self._get("/api/menu/20250106?lang=en")
+        self.assertEqual(status, 200)
+        self.assertEqual(body["language"], "en")
+        self.assertEqual(body["lunch"][0]["name"], "Kimchi Stew")
+        self.assertEqual(body["lunch"][0]["description"], "Spicy stew")
+        self.assertEqual(sorted(body["lunch"][0]["sub_menus"]), ["Rice", "[깍두기]"])
+        self.assertEqual(body["dessert"]["name"], "[요거트]")
+        self.assertEqual(body["dinner"][0]["sub_menus"], [])
+        self.assertIsNone(body["salad"])
+
+    def test_day_menu_korean(self):
+        """언어를 지정하지 않으면 한국어 원문"""
+        status, _, body = self._get("/api/menu/2025-01-06")
+        self.assertEqual(status, 200)
+        self.assertEqual(body["lunch"][0]["name"], "김치찌개")
+        self.assertEqual(body["lunch"][0]["description"], "")
+
+    def test_not_modified_with_etag(self):
+        """같은 ETag로 다시 요청하면 304, 데이터가 바뀌면 새 응답"""
+        status, headers, _ = self._get("/api/menu/20250106?lang=en")
+        etag = headers["ETag"]
+        self.assertEqual(status, 200)
+
+        status, _, _ = self._get("/api/menu/20250106?lang=en", {"If-None-Match": etag})
+        self.assertEqual(status, 304)
+
+        self.db.insert_menu_batch([make_menu("20250106", corner="A", name="된장찌개")])
+        status, headers, body = self._get("/api/menu/20250106?lang=en", {"If-None-Match": etag})
+        self.assertEqual(status, 200)
+        self.assertNotEqual(headers["ETag"], etag)
+        self.assertEqual(body["lunch"][0]["name"], "[된장찌개]")
+
+    def test_week_menu(self):
+        """주간 메뉴는 평일 5일을 한 번에 반환 (일요일이면 월요일부터)"""
+        status, _, body = self._get("/api/menu/week/20250105?lang=en")
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            [day["date"] for day in body["days"]],
+            ["20250106", "20250107", "20250108", "20250109", "20250110"]
+        )
+        self.assertEqual(body["days"][0]["lunch"][0]["name"], "Kimchi Stew")
+        self.assertEqual(body["days"][1]["lunch"], [])
+
+    def test_invalid_requests(self):
+        """잘못된 날짜와 경로"""
+        self.assertEqual(self._get("/api/menu/2025")[0], 400)
+        self.assertEqual(self._get("/api/menu/week/20251399")[0], 400)
+        self.assertEqual(self._get("/api/unknown")[0], 404)
+
+    def test_metrics_endpoint(self):
+        """요청/캐시/DB 조회 계측 값을 Prometheus 형식으로 반환"""
+        self._get("/api/menu/20250106?lang=en")
+        self._get("/api/menu/20250106?lang=en")
+        with urlopen(self.base_url + "/metrics") as response:
+            self.assertTrue(response.headers["Content-Type"].startswith("text/plain"))
+            text = response.read().decode("utf-8")
+        self.assertIn('menu_api_cache_total{result="hit",route="day"}', text)
+        self.assertIn('menu_api_request_seconds_count{route="day",status="200"}', text)
+        self.assertIn("menu_db_menu_range_seconds_count", text)
+
+    def test_diet_filter(self):
+        """exclude/require로 식단 조건에 맞는 코너만 반환"""
+        status, _, body = self._get("/api/menu/20250106?exclude=spicy")
+        self.assertEqual(status, 200)
+        self.assertEqual(body["lunch"], [])
+        self.assertEqual(body["dessert"]["tags"], ["dairy", "vegetarian"])
+        status, _, body = self._get("/api/menu/week/20250106?require=vegetarian")
+        self.assertEqual([item["name"] for item in body["days"][0]["dinner"]], ["산채비빔밥"])
+        status, _, _ = self._get("/api/menu/20250106?exclude=gluten")
+        self.assertEqual(status, 400)
+
+    def test_search_endpoint(self):
+        """메뉴 이름 검색 결과를 번역 이름과 함께 반환"""
+        status, _, body = self._get("/api/search?q=stew&lang=en")
+        self.assertEqual(status, 200)
+        self.assertEqual([(item["menu_name"], item["translated_name"], item["date"]) for item in body["results"]],
+                         [("김치찌개", "Kimchi Stew", "20250106")])
+        status, _, _ = self._get("/api/search?q=%20")
+        self.assertEqual(status, 400)
+
+    def test_search_errors_return_json(self):
+        """따옴표만 있는 검색어에도 응답하고, 조회 오류는 JSON 500으로 반환"""
+        for query in ("%22", "%22%22%22", "%22kim%22chi%22%20OR"):
+            status, _, body = self._get(f"/api/search?q={query}&lang=en")
+            self.assertEqual((status, body["results"]), (200, []), query)
+
+        with mock.patch.object(self.db, "search", side_effect=sqlite3.OperationalError("fts5: syntax error")):
+            with self.assertRaises(HTTPError) as raised:
+                urlopen(self.base_url + "/api/search?q=kimchi")
+        self.assertEqual(raised.exception.code, 500)
+        self.assertEqual(json.loads(raised.exception.read()), {"error": "Internal server error"})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,61 @@
+import datetime
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from conftest import make_menu
+from backfill import Backfill, plan_windows
+from db_manager import MenuDatabase
+
+
+class FakeClient:
+    """FR_DT부터 7일 중 평일 메뉴를 돌려주는 가짜 OurHomeClient"""
+
+    def __init__(self, fail=()):
+        self.requested = []
+        self.fail = set(fail)
+        self._lock = threading.Lock()
+
+    def fetch_menu(self, fr_dt=None, busiplcd=None, ex_stor_cd=None):
+        with self._lock:
+            self.requested.append(fr_dt)
+        if fr_dt in self.fail:
+            return None
+        start = datetime.datetime.strptime(fr_dt, "%Y%m%d")
+        days = [start + datetime.timedelta(days=i) for i in range(7)]
+        menus = [make_menu(day.strftime("%Y%m%d"), name=f"메뉴{day:%m%d}") for day in days if day.weekday() < 5]
+        return {"return": "1", "list": menus}
+
+
+class TestBackfill(unittest.TestCase):
+    def setUp(self):
+        """임시 데이터베이스 생성"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db = MenuDatabase(os.path.join(self.tmpdir, "menu.db"))
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_plan_windows(self):
+        """구간 크기만큼 FR_DT를 옮김"""
+        self.assertEqual(plan_windows("20250106", "20250120", 7), ["20250106", "20250113", "20250120"])
+
+    def test_backfill_resumes_from_checkpoint(self):
+        """실패한 구간만 다음 실행에서 다시 요청하고, 겹치는 메뉴는 한 번만 저장"""
+        client = FakeClient(fail={"20250116"})
+        counts = Backfill(self.db, client, "FAN10", 1010, rate=0).run("20250106", "20250126")
+        # 첫 응답(월~금)으로 구간 크기 5일을 알아냄
+        self.assertEqual(sorted(client.requested), ["20250106", "20250111", "20250116", "20250121", "20250126"])
+        self.assertEqual((counts["windows"], counts["failed"]), (4, 1))
+        self.assertEqual(len(self.db.get_menu_by_range("20250106", "20250126")), 14)
+
+        client = FakeClient()
+        counts = Backfill(self.db, client, "FAN10", 1010, rate=0).run("20250106", "20250126")
+        self.assertEqual(client.requested, ["20250116"])
+        self.assertEqual((counts["windows"], counts["failed"], counts["added"]), (1, 0, 1))
+        self.assertEqual(len(self.db.get_menu_by_range("20250106", "20250126")), 15)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
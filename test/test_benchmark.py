@@ -0,0 +1,41 @@
+import unittest
+from benchmark import generate_history, run_benchmark, compare, percentile
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_generate_history_is_reproducible(self):
+        """같은 seed면 같은 이력, 주말은 제외"""
+        menus = generate_history("20250106", 7, corners=2, sub_menus=4, seed=1)
+        self.assertEqual(menus, generate_history("20250106", 7, corners=2, sub_menus=4, seed=1))
+        # 평일 5일 × 중식/석식 × 코너 2개
+        self.assertEqual(len(menus), 20)
+        self.assertEqual(sorted({menu["OFFERDT"] for menu in menus})[-1], "20250110")
+        self.assertTrue(all(len(menu["SUB_MENU_INFO"]) == 4 for menu in menus))
+
+    def test_percentile(self):
+        """nearest-rank 백분위수"""
+        samples = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(samples, 50), 50.0)
+        self.assertEqual(percentile(samples, 99), 99.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_run_and_compare(self):
+        """작은 이력으로 전체 측정 후, 느려진 지표만 회귀로 표시"""
+        report = run_benchmark(years=0.05, corners=2, sub_menus=3, queries=20, mock_latency=0)
+        results = report["results"]
+        self.assertEqual(results["translation"]["failed"], 0)
+        self.assertGreater(results["translation"]["count"], 0)
+        self.assertEqual(results["queries"]["get_menu_by_date"]["count"], 20)
+
+        baseline = {"results": {"ingest": {"insert_menu_data": {"per_sec": 100.0, "count": 10}},
+                                "queries": {"get_menu_by_date": {"p50_ms": 1.0, "max_ms": 1.0}}}}
+        current = {"results": {"ingest": {"insert_menu_data": {"per_sec": 70.0, "count": 10}},
+                               "queries": {"get_menu_by_date": {"p50_ms": 1.1, "max_ms": 9.0}}}}
+        rows = {row["name"]: row for row in compare(current, baseline)}
+        self.assertEqual(set(rows), {"ingest.insert_menu_data.per_sec", "queries.get_menu_by_date.p50_ms"})
+        self.assertTrue(rows["ingest.insert_menu_data.per_sec"]["regressed"])
+        self.assertFalse(rows["queries.get_menu_by_date.p50_ms"]["regressed"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from conftest import make_menu
+from api_server import MenuResponseCache
+from crawl import load_sites, update_menu_database
+from db_manager import MenuDatabase
+
+
+class FakeClient:
+    """사업장별 메뉴를 돌려주는 가짜 OurHomeClient"""
+
+    def __init__(self, menus):
+        self.menus = menus
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def fetch_menu(self, fr_dt=None, busiplcd=None, ex_stor_cd=None):
+        with self._lock:
+            self.threads.add(threading.current_thread().name)
+        menus = self.menus[busiplcd]
+        return None if menus is None else {"return": "1", "list": menus}
+
+
+class TestCrawl(unittest.TestCase):
+    def setUp(self):
+        """임시 데이터베이스 경로 설정"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "menu.db")
+        self.env = mock.patch.dict(os.environ, {"DB_PATH": self.db_path, "EX_STOR_CD": "1010"})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def test_load_sites(self):
+        """MENU_SITES 형식 해석 (매장 코드가 없으면 EX_STOR_CD)"""
+        self.assertEqual(load_sites("FAN10:1010, GAN20"), [
+            {"site": "FAN10", "ex_stor_cd": 1010},
+            {"site": "GAN20", "ex_stor_cd": 1010},
+        ])
+
+    def test_update_multiple_sites(self):
+        """여러 사업장을 동시에 가져와 사업장별로 저장 (실패한 사업장은 건너뜀)"""
+        client = FakeClient({
+            "FAN10": [make_menu("20250106")],
+            "GAN20": [make_menu("20250106", name="제육볶음")],
+            "HAN30": None,
+        })
+        sites = [{"site": site, "ex_stor_cd": 1010} for site in ("FAN10", "GAN20", "HAN30")]
+        update_menu_database(sites, client=client)
+
+        with MenuDatabase(self.db_path) as db:
+            lunch = db.get_menu_by_date("20250106")["중식"]
+        self.assertEqual(sorted((menu["site"], menu["main_menu"]) for menu in lunch),
+                         [("FAN10", "김치찌개"), ("GAN20", "제육볶음")])
+        self.assertNotIn(threading.current_thread().name, client.threads)
+
+    def test_unchanged_response_skips_ingest(self):
+        """응답이 지난번과 같으면 아무것도 쓰지 않아 API 캐시도 유지됨"""
+        client = FakeClient({"FAN10": [make_menu("20250106"), make_menu("20250106", corner="B")]})
+        sites = [{"site": "FAN10", "ex_stor_cd": 1010}]
+        self.assertEqual(update_menu_database(sites, client=client)["updated"], 1)
+
+        version = MenuResponseCache(self.db_path).source_version()
+        # 메뉴 순서가 달라도 같은 응답
+        client.menus["FAN10"].reverse()
+        summary = update_menu_database(sites, client=client)
+        self.assertEqual(summary, {"sites": 1, "no_change": 1, "failed": 0, "updated": 0})
+        self.assertEqual(MenuResponseCache(self.db_path).source_version(), version)
+
+        client.menus["FAN10"][0] = make_menu("20250106", name="된장찌개")
+        self.assertEqual(update_menu_database(sites, client=client)["updated"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,163 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from conftest import make_menu
+from db_manager import MenuDatabase
+from dish_tags import TAGGER_VERSION_KEY
+
+
+class TestMenuBatchInsert(unittest.TestCase):
+    def setUp(self):
+        """임시 데이터베이스 생성"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db = MenuDatabase(os.path.join(self.tmpdir, "menu.db"))
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_batch_insert_counts(self):
+        """일괄 삽입 시 추가/건너뜀 건수 확인"""
+        menus = [
+            make_menu("20250106", corner="A"),
+            make_menu("20250106", corner="B", name="제육볶음"),
+            make_menu("20250107", meal_type="석식", corner="A", name="비빔밥"),
+        ]
+        counts = self.db.insert_menu_batch(menus)
+        self.assertEqual(counts, {"added": 3, "changed": 0, "unchanged": 0, "skipped": 0})
+
+        conn = self.db._get_connection()
+        writes = conn.total_changes
+        counts = self.db.insert_menu_batch(menus)
+        self.assertEqual(counts, {"added": 0, "changed": 0, "unchanged": 3, "skipped": 0})
+        self.assertEqual(conn.total_changes, writes)
+
+        menu_data = self.db.get_menu_by_date("20250106")
+        self.assertEqual(len(menu_data["중식"]), 2)
+        self.assertEqual(sorted(menu_data["중식"][0]["sub_menus"]), ["깍두기", "쌀밥"])
+
+    def test_batch_updates_changed_menu(self):
+        """메인 메뉴나 부가 메뉴가 바뀌면 같은 행을 갱신하고 부가 메뉴를 교체"""
+        self.db.insert_menu_batch([make_menu("20250106")])
+        menu_id = self.db.get_menu_by_date("20250106")["중식"][0]["id"]
+
+        counts = self.db.insert_menu_batch([make_menu("20250106", name="된장찌개")])
+        self.assertEqual(counts["changed"], 1)
+        counts = self.db.insert_menu_batch([make_menu("20250106", name="된장찌개", subs=("잡곡밥",))])
+        self.assertEqual(counts["changed"], 1)
+
+        lunch = self.db.get_menu_by_date("20250106")["중식"]
+        self.assertEqual((lunch[0]["id"], lunch[0]["main_menu"]), (menu_id, "된장찌개"))
+        self.assertEqual(lunch[0]["sub_menus"], ["잡곡밥"])
+
+    def test_salad_drink_main_menu_replaced(self):
+        """샐러드 코너의 음료 메인 메뉴는 실제 샐러드로 교체"""
+        menu = make_menu("20250106", corner="S", name="두유", subs=("두유", "닭가슴살샐러드"), corner_name="샐러드")
+        self.assertTrue(self.db.insert_menu_data(menu))
+
+        lunch = self.db.get_menu_by_date("20250106")["중식"]
+        self.assertEqual(lunch[0]["main_menu"], "닭가슴살샐러드")
+        self.assertIn("두유", lunch[0]["sub_menus"])
+
+    def test_missing_fields_skipped(self):
+        """필수 필드가 없는 항목은 건너뜀"""
+        counts = self.db.insert_menu_batch([{"OFFERDT": "20250106"}, make_menu("20250106")])
+        self.assertEqual(counts, {"added": 1, "changed": 0, "unchanged": 0, "skipped": 1})
+
+    def test_get_menu_by_range(self):
+        """기간 조회는 날짜별로 묶어서 반환"""
+        self.db.insert_menu_batch([
+            make_menu("20250106"),
+            make_menu("20250107", name="제육볶음"),
+            make_menu("20250110", name="비빔밥"),
+        ])
+        menus = self.db.get_menu_by_range("20250106", "20250109")
+        self.assertEqual(sorted(menus), ["20250106", "20250107"])
+        self.assertEqual(menus["20250107"]["중식"][0]["main_menu"], "제육볶음")
+        self.assertEqual(menus["20250107"]["석식"], [])
+
+    def test_translated_sub_menus_paired_by_name(self):
+        """부가 메뉴 번역은 이름과 짝지어 저장 순서대로 반환 (번역에 '|'가 있어도 밀리지 않음)"""
+        self.db.insert_menu_batch([make_menu("20250106", subs=("쌀밥", "깍두기", "김"))])
+        conn = self.db._get_connection()
+        with conn:
+            conn.executemany("INSERT INTO menu_translations (menu_name, language, translated_name, created_at) "
+                             "VALUES (?, 'en', ?, '')", [("쌀밥", "Rice | Steamed"), ("김", "Laver")])
+        menu = self.db.get_menu_by_date("20250106", lang="en")["중식"][0]
+        self.assertEqual(menu["sub_menus"], ["쌀밥", "깍두기", "김"])
+        self.assertEqual(menu["translated_sub_menus"], ["Rice | Steamed", None, "Laver"])
+        self.assertEqual(self.db.get_menu_by_date("20250106")["중식"][0]["sub_menus"], ["쌀밥", "깍두기", "김"])
+
+    def test_sites_stored_separately(self):
+        """같은 날짜/코너라도 사업장이 다르면 별도로 저장하고, 사업장별로 조회 가능"""
+        self.db.insert_menu_batch([make_menu("20250106")], site="FAN10")
+        counts = self.db.insert_menu_batch([make_menu("20250106", name="제육볶음")], site="GAN20")
+        self.assertEqual(counts["added"], 1)
+
+        self.assertEqual(len(self.db.get_menu_by_date("20250106")["중식"]), 2)
+        lunch = self.db.get_menu_by_date("20250106", site="GAN20")["중식"]
+        self.assertEqual([(menu["site"], menu["main_menu"]) for menu in lunch], [("GAN20", "제육볶음")])
+
+
+class TestMenuConnection(unittest.TestCase):
+    def setUp(self):
+        """임시 데이터베이스 생성"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "menu.db")
+        self.db = MenuDatabase(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_connection_reused_per_thread(self):
+        """같은 스레드에서는 연결을 재사용하고 다른 스레드는 별도 연결 사용"""
+        conn = self.db._get_connection()
+        self.assertIs(conn, self.db._get_connection())
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(self.db._get_connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(conn, other[0])
+
+    def test_reconnect_skips_refresh_until_version_changes(self):
+        """다시 연결해도 태그를 다시 계산하지 않고, 규칙 버전이 바뀌었을 때만 계산"""
+        self.db.insert_menu_batch([make_menu("20250106")])
+        conn = self.db._get_connection()
+        with conn:
+            conn.execute("UPDATE dish_names SET tags = NULL")
+        self.db.close()
+
+        self.db = MenuDatabase(self.db_path)
+        conn = self.db._get_connection()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM dish_names WHERE tags IS NULL").fetchone()[0], 3)
+        with conn:
+            conn.execute("UPDATE sync_state SET value = 0 WHERE name = ?", (TAGGER_VERSION_KEY,))
+        self.db.close()
+
+        self.db = MenuDatabase(self.db_path)
+        conn = self.db._get_connection()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM dish_names WHERE tags IS NULL").fetchone()[0], 0)
+
+    def test_read_during_write_transaction(self):
+        """다른 연결이 쓰기 트랜잭션 중이어도 읽기가 막히지 않음"""
+        self.db.insert_menu_batch([make_menu("20250106")])
+
+        writer = sqlite3.connect(self.db_path)
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute("UPDATE main_menu SET main_menu = '된장찌개'")
+        try:
+            lunch = self.db.get_menu_by_date("20250106")["중식"]
+            self.assertEqual(lunch[0]["main_menu"], "김치찌개")
+        finally:
+            writer.rollback()
+            writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+from conftest import make_menu
+from db_manager import MenuDatabase
+from dish_tags import TAG_BITS, tag_dish, corner_tags, tag_names, parse_tags, refresh_tags
+
+
+class TestDishTags(unittest.TestCase):
+    def test_tag_dish(self):
+        """키워드로 메뉴 이름의 속성 판단"""
+        self.assertEqual(tag_names(tag_dish("제육볶음")), ["pork", "spicy"])
+        self.assertEqual(tag_names(tag_dish("새우튀김")), ["seafood", "wheat"])
+        self.assertEqual(tag_names(tag_dish("쌀밥")), ["vegetarian"])
+        # 예외 단어: 햄버거는 햄(돼지고기)으로 보지 않음
+        self.assertNotIn("pork", tag_names(tag_dish("햄버거스테이크")))
+
+    def test_vegetarian_needs_positive_evidence(self):
+        """이름에 고기 키워드가 없는 고기 요리와 모르는 메뉴는 vegetarian이 아님"""
+        for name in ("부대찌개", "감자탕", "김치찌개", "미역국", "잡채", "카레라이스", "된장찌개", "비빔밥"):
+            self.assertNotIn("vegetarian", tag_names(tag_dish(name)), name)
+        self.assertIn("pork", tag_names(tag_dish("부대찌개")))
+        for name in ("쌀밥", "두부조림", "시금치나물", "산채 비빔밥(국내산)", "쌀밥/두부조림"):
+            self.assertIn("vegetarian", tag_names(tag_dish(name)), name)
+
+    def test_corner_vegetarian_only_when_all_dishes_are(self):
+        """코너는 모든 메뉴가 채식일 때만 vegetarian"""
+        self.assertEqual(tag_names(corner_tags("두부조림", ["쌀밥", "콩나물무침"])), ["vegetarian"])
+        self.assertEqual(tag_names(corner_tags("두부조림", ["쌀밥", "어묵볶음"])), ["seafood"])
+        # 깍두기는 젓갈이 들어갈 수 있어 채식으로 보지 않음
+        self.assertEqual(tag_names(corner_tags("두부조림", ["쌀밥", "깍두기"])), ["spicy"])
+        self.assertEqual(parse_tags("Pork, nuts"), TAG_BITS["pork"] | TAG_BITS["nuts"])
+        with self.assertRaises(ValueError):
+            parse_tags("gluten")
+
+
+class TestMenuTagFilter(unittest.TestCase):
+    def setUp(self):
+        """돼지고기/해산물/채식 코너가 있는 임시 데이터베이스"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db = MenuDatabase(os.path.join(self.tmpdir, "menu.db"))
+        self.db.insert_menu_batch([
+            make_menu("20250106", corner="A", name="제육볶음", subs=("쌀밥",)),
+            make_menu("20250106", corner="B", name="고등어구이", subs=("쌀밥",)),
+            make_menu("20250106", corner="C", name="두부조림", subs=("쌀밥", "땅콩조림")),
+        ])
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmpdir)
+
+    def _corners(self, **filters):
+        menus = self.db.get_menu_by_date("20250106", **filters)
+        return [menu["corner"] for menu in menus.get("중식", [])]
+
+    def test_filter_by_tags(self):
+        """제외/필수 태그로 코너를 거름"""
+        self.assertEqual(self._corners(), ["A", "B", "C"])
+        self.assertEqual(self._corners(exclude_tags=parse_tags("pork")), ["B", "C"])
+        self.assertEqual(self._corners(exclude_tags=parse_tags("pork,nuts")), ["B"])
+        self.assertEqual(self._corners(require_tags=parse_tags("vegetarian")), ["C"])
+
+    def test_changed_menu_retagged(self):
+        """메뉴가 바뀌면 코너 태그와 새 메뉴 이름의 태그를 다시 계산"""
+        self.db.insert_menu_batch([make_menu("20250106", corner="A", name="산채비빔밥", subs=("쌀밥",))])
+        self.assertEqual(self._corners(require_tags=parse_tags("vegetarian")), ["A", "C"])
+        conn = self.db._get_connection()
+        self.assertEqual(conn.execute("SELECT tags FROM dish_names WHERE name = '산채비빔밥'").fetchone()[0],
+                         tag_dish("산채비빔밥"))
+
+    def test_refresh_fills_missing_tags(self):
+        """태그가 없는 행(마이그레이션 직후)은 refresh_tags가 채움"""
+        conn = self.db._get_connection()
+        with conn:
+            conn.execute("UPDATE main_menu SET tags = NULL")
+            conn.execute("UPDATE dish_names SET tags = NULL WHERE name = '제육볶음'")
+        self.assertEqual(refresh_tags(conn), {"dishes": 1, "corners": 3})
+        self.assertEqual(self._corners(exclude_tags=parse_tags("seafood")), ["A", "C"])
+        self.assertEqual(refresh_tags(conn), {"dishes": 0, "corners": 0})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
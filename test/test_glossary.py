@@ -0,0 +1,122 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from conftest import make_menu, FakeCompletions
+from db_manager import MenuDatabase
+from glossary import Glossary
+from metrics import METRICS
+from translate_service import TranslationService
+
+
+class TestGlossary(unittest.TestCase):
+    def test_compositional_names(self):
+        """구성 요소로만 이루어진 이름은 나눠서 번역을 이어 붙임"""
+        glossary = Glossary()
+        self.assertEqual(glossary.translate("팝콘치킨샐러드", "en")["translated"], "Popcorn Chicken Salad")
+        self.assertEqual(glossary.translate("팝콘치킨샐러드", "zh")["translated"], "爆米花鸡肉沙拉")
+        # 조리법은 앞 구성 요소를 감싸는 틀, 긴 용어(볶음밥)가 우선
+        self.assertEqual(glossary.translate("고등어구이", "en")["translated"], "Grilled Mackerel")
+        self.assertEqual(glossary.translate("고등어구이", "sv")["translated"], "Grillad makrill")
+        self.assertEqual(glossary.translate("김치볶음밥", "en")["translated"], "Kimchi Fried Rice")
+        # 모르는 부분이 있거나, 조리법으로 시작하거나, 한글이 아니면 번역하지 않음
+        self.assertIsNone(glossary.translate("비빔밥", "en"))
+        self.assertIsNone(glossary.translate("구이", "en"))
+        self.assertIsNone(glossary.translate("caesar salad", "en"))
+
+    def test_single_syllable_cannot_end_name(self):
+        """한 글자 용어(탕, 국, 밥 등)로 끝나는 이름은 글자 그대로 번역하지 않음"""
+        glossary = Glossary()
+        for name in ("감자탕", "닭볶음탕", "국밥", "계란찜", "밥"):
+            self.assertIsNone(glossary.translate(name, "en"), name)
+        # 하나의 음식 이름으로 굳어진 메뉴가 들어 있으면 나누지 않음
+        for name in ("두부김치", "닭갈비볶음밥"):
+            self.assertIsNone(glossary.translate(name, "en"), name)
+        # 한 글자 용어도 앞부분에는 쓰임
+        self.assertEqual(glossary.translate("닭볶음", "en")["translated"], "Stir-fried Chicken")
+
+    def test_learned_terms(self):
+        """저장된 번역을 학습하되, 직접 정리한 구성 요소가 우선"""
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE menu_translations (menu_name, language, translated_name, source)")
+        conn.executemany("INSERT INTO menu_translations VALUES (?, ?, ?, ?)", [
+            ("잡채", "en", "Japchae", None), ("치킨", "en", "Fried Chicken", None),
+            ("쌀밥/잡곡밥", "en", "Rice / Multigrain Rice", None),
+            # 용어집으로 만든 번역은 학습하지 않음
+            ("감자국", "en", "Potato Soup", "glossary"),
+        ])
+        glossary = Glossary()
+        self.assertEqual(glossary.load(conn), 2)
+        self.assertEqual(glossary.translate("잡채덮밥", "en")["translated"], "Japchae Rice Bowl")
+        self.assertEqual(glossary.translate("치킨샐러드", "en")["translated"], "Chicken Salad")
+        self.assertIsNone(glossary.translate("잡채덮밥", "zh"))
+        self.assertIsNone(glossary.translate("감자국", "en"))
+
+
+class TestGlossaryTranslation(unittest.TestCase):
+    def setUp(self):
+        """임시 데이터베이스와 가짜 API 클라이언트로 번역 서비스 생성"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "menu.db")
+        self.env = mock.patch.dict(os.environ, {"DEEPSEEK_API_KEY": "test-key", "DB_PATH": self.db_path})
+        self.env.start()
+        self.db = MenuDatabase(self.db_path)
+        self.service = TranslationService()
+        self.completions = FakeCompletions()
+        self.service.client = SimpleNamespace(chat=SimpleNamespace(completions=self.completions))
+        METRICS.reset()
+
+    def tearDown(self):
+        self.db.close()
+        self.env.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def test_only_novel_names_sent(self):
+        """용어집으로 번역할 수 없는 이름만 API로 보내고 적중률을 기록"""
+        self.db.insert_menu_batch([make_menu("20250106", name="고등어구이", subs=("비빔밥",))])
+        counts = self.service.translate_new()
+        self.assertEqual(counts["glossary"], 3)
+        self.assertEqual(counts["translated"], 3)
+        self.assertEqual(len(self.completions.calls), 1)
+        self.assertNotIn("고등어구이", self.completions.calls[0]["messages"][-1]["content"])
+
+        menu = self.db.get_menu_by_date("20250106", lang="en")["중식"][0]
+        self.assertEqual((menu["translated_name"], menu["translated_sub_menus"]),
+                         ("Grilled Mackerel", ["en(비빔밥)"]))
+        counters = {counter["labels"]["result"]: counter["value"]
+                    for counter in METRICS.snapshot()["counters"] if counter["name"] == "glossary"}
+        self.assertEqual(counters, {"hit": 3, "miss": 3})
+
+        # 번역된 메뉴는 다음 실행에서 구성 요소로 쓰임
+        self.db.insert_menu_batch([make_menu("20250107", name="비빔밥샐러드", subs=())])
+        counts = self.service.translate_new()
+        self.assertEqual((counts["glossary"], len(self.completions.calls)), (3, 1))
+        menu = self.db.get_menu_by_date("20250107", lang="zh")["중식"][0]
+        self.assertEqual(menu["translated_name"], "zh(비빔밥)沙拉")
+
+    def test_glossary_rows_marked_and_replaced_by_llm(self):
+        """용어집 번역(세트 메뉴 포함)은 source로 표시되고, LLM 번역만 덮어쓸 수 있음"""
+        self.db.insert_menu_batch([make_menu("20250106", name="고등어구이", subs=("팝콘치킨/비빔밥",))])
+        self.service.translate_new()
+        conn = sqlite3.connect(self.db_path)
+        self.addCleanup(conn.close)
+        sources = dict(conn.execute(
+            "SELECT menu_name, source FROM menu_translations WHERE language = 'en'").fetchall())
+        self.assertEqual(sources, {"고등어구이": "glossary", "팝콘치킨": "glossary", "팝콘치킨/비빔밥": "glossary",
+                                   "비빔밥": None})
+
+        llm = {"translated": "Grilled Mackerel Fillet", "description": "Salted mackerel grilled whole"}
+        self.service._save_translations(conn, [("고등어구이", "en", llm)])
+        self.service._save_translations(conn, [("비빔밥", "en", {"translated": "Rice"})], "glossary")
+        rows = dict((name, row) for name, *row in conn.execute(
+            "SELECT menu_name, translated_name, description, source FROM menu_translations "
+            "WHERE language = 'en' AND menu_name IN ('고등어구이', '비빔밥')"))
+        self.assertEqual(rows, {"고등어구이": ["Grilled Mackerel Fillet", "Salted mackerel grilled whole", None],
+                                "비빔밥": ["en(비빔밥)", None, None]})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,31 @@
+import unittest
+from json_stream import JsonArrayParser, parse_json_array
+
+
+class TestJsonArrayParser(unittest.TestCase):
+    def test_objects_yielded_as_they_close(self):
+        """조각 경계와 관계없이 객체가 닫히는 즉시 반환"""
+        text = 'Here you go:\n```json\n[{"original": "a]}", "en": {"translated": "A \\"x\\""}}, "note", 3, {"original": "b"}]\n```'
+        parser = JsonArrayParser()
+        items = []
+        for i in range(0, len(text), 7):
+            items.extend(parser.feed(text[i:i + 7]))
+        self.assertEqual(items, [{"original": "a]}", "en": {"translated": 'A "x"'}}, {"original": "b"}])
+        self.assertTrue(parser.closed)
+        self.assertFalse(parser.pending)
+
+    def test_truncated_response_keeps_complete_items(self):
+        """중간에 잘린 응답은 닫힌 객체까지만 반환"""
+        parser = JsonArrayParser()
+        items = parser.feed('[{"original": "a"}, {"original": "b", "translated": "B"}, {"original": "c", "transl')
+        self.assertEqual([item["original"] for item in items], ["a", "b"])
+        self.assertTrue(parser.pending)
+        self.assertFalse(parser.closed)
+
+        self.assertEqual(parse_json_array('[{"a": 1}, {bad}, {"b": 2}]'), [{"a": 1}, {"b": 2}])
+        with self.assertRaises(ValueError):
+            parse_json_array("no array here")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,108 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from conftest import make_menu, FakeCompletions
+from db_manager import MenuDatabase
+from menu_names import canonical_key, split_key, combine_translations, refresh_canonical, NORMALIZER_VERSION_KEY
+from translate_service import TranslationService
+
+
+class TestCanonicalKey(unittest.TestCase):
+    def test_variants_share_key(self):
+        """띄어쓰기, 괄호 설명, 장식 기호, 표시 단어만 다른 이름은 같은 키"""
+        for name in ["김치찌개", "김치 찌개", "김치찌개(국내산)", "★김치찌개 NEW", "[추천] 김치찌개"]:
+            self.assertEqual(canonical_key(name), "김치찌개", name)
+        self.assertEqual(canonical_key("Caesar  Salad*"), "caesar salad")
+        self.assertEqual(canonical_key("1/2"), "1/2")
+
+    def test_combo_split(self):
+        """세트 메뉴는 구성 메뉴 키를 '/'로 이은 키"""
+        key = canonical_key("돈까스 + 우동(소)")
+        self.assertEqual(key, "돈까스/우동")
+        self.assertEqual(canonical_key(key), key)
+        self.assertEqual(split_key(key), ["돈까스", "우동"])
+        self.assertEqual(split_key("치킨 1/2"), ["치킨 1/2"])
+        self.assertEqual(
+            combine_translations([{"translated": "Pork Cutlet", "description": "Fried"},
+                                  {"translated": "Udon", "description": None}]),
+            {"translated": "Pork Cutlet / Udon", "description": "Fried"},
+        )
+
+
+class TestNormalizedTranslations(unittest.TestCase):
+    def setUp(self):
+        """임시 데이터베이스와 가짜 API 클라이언트로 번역 서비스 생성"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "menu.db")
+        self.env = mock.patch.dict(os.environ, {"DEEPSEEK_API_KEY": "test-key", "DB_PATH": self.db_path})
+        self.env.start()
+        self.db = MenuDatabase(self.db_path)
+        self.service = TranslationService()
+        self.completions = FakeCompletions()
+        self.service.client = SimpleNamespace(chat=SimpleNamespace(completions=self.completions))
+        # 용어집 없이 모든 이름을 API로 보냄 (용어집은 test_glossary.py)
+        self.service.glossary = None
+
+    def tearDown(self):
+        self.db.close()
+        self.env.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def _requested(self):
+        """가짜 API에 보낸 메뉴 이름"""
+        names = set()
+        for call in self.completions.calls:
+            prompt = call["messages"][-1]["content"]
+            names.update(json.loads(prompt[prompt.rindex("["):]))
+        return names
+
+    def test_variants_translated_once(self):
+        """변형 이름은 한 번만 번역하고, 세트 메뉴는 구성 메뉴 번역을 이어 만듦"""
+        self.db.insert_menu_batch([
+            make_menu("20250106", corner="A", name="김치 찌개(국내산)", subs=("쌀밥",)),
+            make_menu("20250106", corner="B", name="돈까스+우동", subs=("쌀밥 ",)),
+        ])
+        counts = self.service.translate_new()
+        self.assertEqual(self._requested(), {"김치찌개", "쌀밥", "돈까스", "우동"})
+        self.assertEqual(counts["combined"], 3)
+
+        lunch = self.db.get_menu_by_date("20250106", lang="en")["중식"]
+        self.assertEqual(lunch[0]["translated_name"], "en(김치찌개)")
+        self.assertEqual(lunch[1]["translated_name"], "en(돈까스) / en(우동)")
+        self.assertEqual(lunch[1]["translated_sub_menus"], ["en(쌀밥)"])
+
+        # 이미 번역된 메뉴의 변형과 구성 메뉴가 같은 세트 메뉴는 API를 호출하지 않음
+        calls = len(self.completions.calls)
+        self.db.insert_menu_batch([make_menu("20250107", name="김치찌개 NEW", subs=("우동 & 돈까스",))])
+        counts = self.service.translate_new()
+        self.assertEqual(len(self.completions.calls), calls)
+        self.assertEqual(counts["combined"], 3)
+        day = self.db.get_menu_by_date("20250107", lang="zh")["중식"][0]
+        self.assertEqual((day["translated_name"], day["translated_sub_menus"]),
+                         ("zh(김치찌개)", ["zh(우동) / zh(돈까스)"]))
+
+    def test_refresh_moves_raw_translations(self):
+        """정규화 전 이름으로 저장된 번역은 키로 옮겨지고 변형 이름에도 쓰임"""
+        self.db.insert_menu_batch([make_menu("20250106", name="김치 찌개", subs=("김치찌개(국내산)",))])
+        conn = self.db._get_connection()
+        with conn:
+            conn.execute("INSERT INTO menu_translations VALUES ('김치 찌개', 'en', 'Kimchi Stew', NULL, '', NULL, NULL)")
+            conn.execute("UPDATE dish_names SET canonical = NULL")
+            conn.execute("DELETE FROM sync_state WHERE name = ?", (NORMALIZER_VERSION_KEY,))
+
+        self.assertEqual(refresh_canonical(conn), {"dishes": 2, "translations": 1})
+        rows = conn.execute("SELECT menu_name, translated_name FROM menu_translations").fetchall()
+        self.assertEqual([tuple(row) for row in rows], [("김치찌개", "Kimchi Stew")])
+        menu = self.db.get_menu_by_date("20250106", lang="en")["중식"][0]
+        self.assertEqual((menu["translated_name"], menu["translated_sub_menus"]), ("Kimchi Stew", ["Kimchi Stew"]))
+        self.assertEqual([item["menu_name"] for item in self.db.search("Kimchi Stew", lang="en")],
+                         ["김치 찌개", "김치찌개(국내산)"])
+        self.assertEqual(refresh_canonical(conn), {"dishes": 0, "translations": 0})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
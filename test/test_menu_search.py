@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import unittest
+from conftest import make_menu
+from db_manager import MenuDatabase
+
+
+class TestMenuSearch(unittest.TestCase):
+    def setUp(self):
+        """메뉴와 번역이 있는 임시 데이터베이스"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db = MenuDatabase(os.path.join(self.tmpdir, "menu.db"))
+        self.db.insert_menu_batch([
+            make_menu("20250106", name="김치찌개", subs=("쌀밥", "깍두기")),
+            make_menu("20250113", name="된장찌개", subs=("쌀밥", "김치전")),
+            make_menu("20250120", name="김치찌개", subs=("잡곡밥",)),
+            make_menu("20250127", name="비빔밥", subs=("미소국",)),
+        ])
+        conn = self.db._get_connection()
+        with conn:
+            conn.executemany("INSERT INTO menu_translations VALUES (?, ?, ?, ?, '', NULL, NULL)", [
+                ("김치찌개", "en", "Kimchi Stew", "Spicy stew with pork"),
+                ("된장찌개", "en", "Soybean Paste Stew", None),
+                ("김치찌개", "zh", "泡菜汤", None),
+            ])
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_search_korean_orders_upcoming_then_past(self):
+        """한국어 부분 문자열 검색, 다가오는 날짜(가까운 순) 다음 지난 날짜(최근 순)"""
+        results = self.db.search("김치찌개", today="20250110")
+        self.assertEqual([(item["date"], item["is_main"]) for item in results],
+                         [("20250120", True), ("20250106", True)])
+
+        # 부가 메뉴도 검색되고, 기간으로 거를 수 있음
+        results = self.db.search("쌀밥", date_range=("20250110", "20250131"))
+        self.assertEqual([(item["date"], item["main_menu"], item["is_main"]) for item in results],
+                         [("20250113", "된장찌개", False)])
+
+    def test_search_translations(self):
+        """번역 이름/설명으로 검색하고 지정한 언어의 번역 이름을 함께 반환"""
+        results = self.db.search("stew", lang="en", today="20250101")
+        self.assertEqual({item["menu_name"] for item in results}, {"김치찌개", "된장찌개"})
+        self.assertEqual(results[0]["translated_name"],
+                         {"김치찌개": "Kimchi Stew", "된장찌개": "Soybean Paste Stew"}[results[0]["menu_name"]])
+        self.assertEqual([item["menu_name"] for item in self.db.search("kimchi pork", lang="en")],
+                         ["김치찌개", "김치찌개"])
+        self.assertEqual(self.db.search("泡菜汤", lang="en"), [])
+        self.assertEqual(self.db.search("泡菜汤", lang="zh")[0]["translated_name"], "泡菜汤")
+
+    def test_index_follows_translation_changes(self):
+        """번역 저장/삭제 시 색인이 함께 갱신됨"""
+        conn = self.db._get_connection()
+        with conn:
+            conn.execute("INSERT INTO menu_translations VALUES ('비빔밥', 'sv', 'Blandat ris', NULL, '', NULL, NULL)")
+        self.assertEqual(self.db.search("blandat")[0]["menu_name"], "비빔밥")
+        with conn:
+            conn.execute("DELETE FROM menu_translations WHERE menu_name = '비빔밥'")
+        self.assertEqual(self.db.search("blandat"), [])
+
+    def test_short_query_uses_like(self):
+        """3글자 미만 검색어는 LIKE로 찾고, 짧은(가까운) 이름을 먼저 반환"""
+        results = self.db.search("김치")
+        self.assertEqual([item["menu_name"] for item in results][:2], ["김치전", "김치찌개"])
+        self.assertEqual(self.db.search("%"), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
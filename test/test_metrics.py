@@ -0,0 +1,58 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from metrics import Metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        """JSON lines 파일 경로"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.jsonl_path = os.path.join(self.tmpdir, "metrics.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_spans_and_counters(self):
+        """span 소요 시간과 카운터를 (이름, 라벨)별로 모음"""
+        metrics = Metrics()
+
+        @metrics.timed("work")
+        def work():
+            return 1
+
+        work()
+        work()
+        with self.assertRaises(KeyError):
+            with metrics.span("lookup", table="menu"):
+                raise KeyError("x")
+        metrics.inc("llm_tokens", 120, kind="prompt")
+        metrics.inc("llm_tokens", 30, kind="prompt")
+
+        snapshot = metrics.snapshot()
+        spans = {(span["name"], tuple(sorted(span["labels"].items()))): span["count"] for span in snapshot["spans"]}
+        self.assertEqual(spans[("work", ())], 2)
+        self.assertEqual(spans[("lookup", (("error", "KeyError"), ("table", "menu")))], 1)
+        self.assertEqual(snapshot["counters"], [{"name": "llm_tokens", "labels": {"kind": "prompt"}, "value": 150}])
+
+    def test_exports(self):
+        """Prometheus 텍스트와 JSON lines로 내보내기"""
+        metrics = Metrics(self.jsonl_path)
+        metrics.observe("db_insert_batch", 0.25, site="FAN10")
+        metrics.inc("menus", 3, result="added")
+
+        text = metrics.render_prometheus()
+        self.assertIn("# TYPE menu_db_insert_batch_seconds summary", text)
+        self.assertIn('menu_db_insert_batch_seconds_count{site="FAN10"} 1', text)
+        self.assertIn('menu_menus_total{result="added"} 3', text)
+
+        with open(self.jsonl_path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record["type"] for record in records], ["span", "counter"])
+        self.assertEqual(records[0]["seconds"], 0.25)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
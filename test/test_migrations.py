@@ -0,0 +1,75 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from migrations import apply_migrations, MIGRATIONS
+from db_manager import MenuDatabase
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        """기존(마이그레이션 이전) 스키마의 데이터베이스 생성"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "menu.db")
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript('''
+            CREATE TABLE main_menu (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT, meal_type TEXT, meal_time TEXT, corner TEXT,
+                corner_name TEXT, main_menu TEXT, menu_code TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(date, meal_type, corner)
+            );
+            CREATE TABLE sub_menu (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                main_menu_id INTEGER,
+                menu_name TEXT,
+                FOREIGN KEY (main_menu_id) REFERENCES main_menu(id)
+            );
+            INSERT INTO main_menu (date, meal_type, corner, main_menu)
+            VALUES ('20250106', '중식', 'A', '김치찌개');
+            INSERT INTO sub_menu (main_menu_id, menu_name) VALUES (1, '쌀밥');
+            INSERT INTO sub_menu (main_menu_id, menu_name) VALUES (99, '고아메뉴');
+        ''')
+        conn.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_upgrade_existing_database(self):
+        """기존 데이터를 유지하며 최신 버전으로 업그레이드"""
+        conn = sqlite3.connect(self.db_path)
+        version = apply_migrations(conn)
+        self.assertEqual(version, MIGRATIONS[-1][0])
+
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn("idx_sub_menu_main_menu_id", indexes)
+        self.assertIn("idx_menu_translations_language", indexes)
+
+        # 기존 메뉴는 기본 사업장으로 채워짐
+        self.assertEqual(conn.execute("SELECT id, site FROM main_menu").fetchall(), [(1, "FAN10")])
+
+        # 고아 부가 메뉴는 제거되고 나머지는 유지
+        self.assertEqual(conn.execute("SELECT menu_name FROM sub_menu").fetchall(), [("쌀밥",)])
+
+        # 기존 메뉴 이름이 검색 색인에 들어감
+        self.assertEqual(conn.execute(
+            "SELECT ko FROM menu_search WHERE menu_search MATCH '\"치찌개\"'").fetchall(), [("김치찌개",)])
+
+        # 다시 적용해도 변화 없음
+        self.assertEqual(apply_migrations(conn), version)
+        conn.close()
+
+    def test_cascade_delete(self):
+        """메인 메뉴 삭제 시 부가 메뉴도 함께 삭제"""
+        db = MenuDatabase(self.db_path)
+        conn = db._get_connection()
+        with conn:
+            conn.execute("DELETE FROM main_menu WHERE id = 1")
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM sub_menu").fetchone()[0], 0)
+        db.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,77 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from db_manager import MenuDatabase
+from metrics import METRICS
+from mock_llm_server import start_server
+from translate_service import TranslationService
+
+
+class TestMockLLMServer(unittest.TestCase):
+    def setUp(self):
+        """임시 데이터베이스와 요청 제한/오류를 섞어 응답하는 가짜 서버"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "menu.db")
+        MenuDatabase(self.db_path).close()
+        self.server = start_server(rate_limit_rate=0.3, error_rate=0.2, retry_after=0.01, seed=3)
+        self.env = mock.patch.dict(os.environ, {"DB_PATH": self.db_path})
+        self.env.start()
+        os.environ.pop("DEEPSEEK_API_KEY", None)
+
+    def tearDown(self):
+        self.env.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_api_key_required_only_for_deepseek(self):
+        """DeepSeek 주소에는 API 키가 필요하고, 다른 주소는 키 없이 시작"""
+        with mock.patch.dict(os.environ, {"DEEPSEEK_BASE_URL": ""}):
+            with self.assertRaises(ValueError):
+                TranslationService()
+        with mock.patch.dict(os.environ, {"DEEPSEEK_BASE_URL": self.server.url}):
+            service = TranslationService()
+        self.assertEqual(str(service.client.base_url).rstrip("/"), self.server.url)
+
+    @mock.patch("translate_service.time.sleep")
+    def test_translate_with_retries_over_http(self, sleep):
+        """429/500 응답은 재시도되고 모든 번역이 저장됨"""
+        service = TranslationService(base_url=self.server.url)
+        names = [f"메뉴{i}" for i in range(30)]
+        counts = service.translate_pending({name: ["en", "zh"] for name in names}, concurrency=4)
+        self.assertEqual(counts["failed"], 0)
+
+        stats = self.server.snapshot()
+        self.assertGreater(stats["rate_limited"] + stats["errors"], 0)
+        self.assertEqual(stats["requests"], stats["ok"] + stats["rate_limited"] + stats["errors"])
+        with sqlite3.connect(self.db_path) as conn:
+            rows = dict(conn.execute(
+                "SELECT menu_name || ':' || language, translated_name FROM menu_translations").fetchall())
+        self.assertEqual(len(rows), 60)
+        self.assertEqual(rows["메뉴7:zh"], "zh(메뉴7)")
+
+    def test_streamed_truncated_responses(self):
+        """SSE 스트리밍 응답이 max_tokens에서 잘려도 받은 번역은 저장되고 나머지만 다시 요청"""
+        server = start_server()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        service = TranslationService(base_url=server.url)
+        service.stream = True
+        METRICS.reset()
+        names = [f"메뉴{i}" for i in range(12)]
+        with mock.patch("translate_service.completion_token_limit", return_value=400):
+            counts = service.translate_pending({name: ["en", "zh"] for name in names})
+        self.assertEqual((counts["translated"], counts["failed"]), (24, 0))
+        self.assertGreater(counts["requests"], 1)
+        truncated = [counter for counter in METRICS.snapshot()["counters"] if counter["name"] == "llm_truncated"]
+        self.assertGreater(truncated[0]["value"], 0)
+        tokens = {counter["labels"]["kind"]: counter["value"]
+                  for counter in METRICS.snapshot()["counters"] if counter["name"] == "llm_tokens"}
+        self.assertGreater(tokens["completion"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,69 @@
+import unittest
+from unittest import mock
+import requests
+from ourhome_client import OurHomeClient
+
+
+def make_response(status, payload=None, headers=None):
+    """requests.Response 생성"""
+    response = requests.Response()
+    response.status_code = status
+    response._content = (payload or '{"return": "1", "list": []}').encode('utf-8')
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeSession:
+    """미리 정한 응답/예외를 순서대로 돌려주는 세션"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def post(self, url, json=None, timeout=None):
+        self.calls.append({"url": url, "json": json, "timeout": timeout})
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def close(self):
+        pass
+
+
+class TestOurHomeClient(unittest.TestCase):
+    def make_client(self, *outcomes):
+        return OurHomeClient(base_url="https://example.com", ex_stor_cd=1010, access_token="token",
+                             seed_key=62, busiplcd="FAN10", max_retries=2, session=FakeSession(*outcomes))
+
+    @mock.patch("ourhome_client.time.sleep")
+    def test_retry_on_server_error_and_timeout(self, sleep):
+        """5xx/타임아웃은 재시도하고, 시도마다 인증 값을 새로 만들어 요청"""
+        client = self.make_client(make_response(503), requests.exceptions.ReadTimeout(), make_response(200))
+        result = client.fetch_menu("20250106")
+
+        self.assertEqual(result["return"], "1")
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual(client.last_call["attempts"], 3)
+        self.assertTrue(client.last_call["ok"])
+
+        calls = client.session.calls
+        self.assertEqual(calls[0]["url"], "https://example.com/Ex/Stor/MenuInfo")
+        self.assertEqual(calls[0]["timeout"], client.timeout)
+        self.assertEqual(calls[-1]["json"]["REQ_PARAMS"]["FR_DT"], "20250106")
+
+    @mock.patch("ourhome_client.time.sleep")
+    def test_gives_up_after_max_retries(self, sleep):
+        """재시도 횟수를 넘거나 4xx면 None을 반환하고 실패로 기록"""
+        client = self.make_client(*[make_response(500)] * 3)
+        self.assertIsNone(client.fetch_menu())
+        self.assertEqual(client.last_call["attempts"], 3)
+
+        client.session = FakeSession(make_response(400))
+        self.assertIsNone(client.fetch_menu())
+        self.assertEqual(client.last_call["attempts"], 1)
+        self.assertEqual(client.stats["failures"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
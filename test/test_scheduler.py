@@ -0,0 +1,75 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from scheduler import CronSchedule, Job, RunLock, Scheduler
+
+
+class TestCronSchedule(unittest.TestCase):
+    def test_next_after(self):
+        """분/시/요일 조건에 맞는 다음 시각"""
+        schedule = CronSchedule("*/30 7-19 * * 1-5")
+        # 금요일 19:45 -> 월요일 07:00
+        self.assertEqual(schedule.next_after(datetime.datetime(2025, 1, 10, 19, 45)),
+                         datetime.datetime(2025, 1, 13, 7, 0))
+        self.assertEqual(schedule.next_after(datetime.datetime(2025, 1, 13, 7, 0)),
+                         datetime.datetime(2025, 1, 13, 7, 30))
+        self.assertEqual(CronSchedule("0 9 * * 7").next_after(datetime.datetime(2025, 1, 13)),
+                         datetime.datetime(2025, 1, 19, 9, 0))
+
+    def test_invalid_expression(self):
+        """필드 수나 범위가 잘못되면 ValueError"""
+        for expression in ("* * * *", "60 * * * *", "* 5-3 * * *"):
+            with self.assertRaises(ValueError):
+                CronSchedule(expression)
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        """임시 잠금/상태 파일 경로"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.lock_path = os.path.join(self.tmpdir, "scheduler.lock")
+        self.status_path = os.path.join(self.tmpdir, "status.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_failures_back_off(self):
+        """연속 실패 시 다음 실행을 백오프 시간 이후로 미루고, 성공하면 초기화"""
+        results = [False, False, True]
+        job = Job("crawl", CronSchedule("* * * * *"), lambda: results.pop(0))
+        scheduler = Scheduler([job], RunLock(self.lock_path), self.status_path)
+        now = datetime.datetime(2025, 1, 13, 9, 0)
+
+        scheduler.run_job(job)
+        scheduler.run_job(job)
+        job.plan(now, jitter=0)
+        self.assertEqual(job.consecutive_failures, 2)
+        self.assertEqual(job.next_run, now + datetime.timedelta(minutes=2))
+
+        scheduler.run_job(job)
+        job.plan(now, jitter=0)
+        self.assertEqual(job.next_run, now + datetime.timedelta(minutes=1))
+        self.assertTrue(job.last_run["ok"])
+
+    def test_overlapping_run_skipped(self):
+        """다른 프로세스가 잠금을 잡고 있으면 실행하지 않음"""
+        run = mock.Mock(return_value=True)
+        scheduler = Scheduler([Job("crawl", CronSchedule("* * * * *"), run)], RunLock(self.lock_path), self.status_path)
+        other = RunLock(self.lock_path)
+        self.assertTrue(other.acquire())
+        try:
+            self.assertIsNone(scheduler.run_job(scheduler.jobs[0]))
+        finally:
+            other.release()
+        run.assert_not_called()
+
+        scheduler.run_once()
+        run.assert_called_once()
+        self.assertTrue(os.path.exists(self.status_path))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,98 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from conftest import make_menu
+from api_server import MenuApiServer
+from db_manager import MenuDatabase
+from snapshots import build_snapshots, render_day
+
+
+class TestMenuSnapshots(unittest.TestCase):
+    def setUp(self):
+        """이틀치 메뉴가 있는 임시 데이터베이스"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db = MenuDatabase(os.path.join(self.tmpdir, "menu.db"))
+        self.db.insert_menu_batch([
+            make_menu("20250106", name="김치찌개"),
+            make_menu("20250107", name="비빔밥", subs=("쌀밥",)),
+        ])
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmpdir)
+
+    def _translate(self, name, lang, translated):
+        conn = self.db._get_connection()
+        with conn:
+            conn.execute("INSERT INTO menu_translations VALUES (?, ?, ?, NULL, ?, NULL, NULL)",
+                         (name, lang, translated, datetime.now().isoformat()))
+
+    def test_snapshot_matches_live_response(self):
+        """스냅샷 본문은 실시간으로 만든 응답과 같음"""
+        counts = build_snapshots(self.db, languages=("ko", "en"))
+        self.assertEqual(counts, {"dates": 4, "written": 4, "unchanged": 0})
+        snapshots = self.db.get_snapshots(["20250106", "20250107", "20250108"], "en")
+        self.assertEqual(sorted(snapshots), ["20250106", "20250107"])
+        live = render_day("20250106", self.db.get_menu_by_date("20250106", "en"), "en")
+        self.assertEqual(snapshots["20250106"][1], live)
+
+    def test_rebuilds_only_changed_dates(self):
+        """바뀐 메뉴의 날짜와 새 번역을 쓰는 날짜만 다시 만듦"""
+        build_snapshots(self.db, languages=("ko", "en"))
+        self.assertEqual(build_snapshots(self.db, languages=("ko", "en"))["dates"], 0)
+
+        # 메뉴가 바뀌면 그 날짜의 스냅샷은 저장과 함께 지워짐
+        self.db.insert_menu_batch([make_menu("20250106", name="된장찌개")])
+        self.assertEqual(self.db.get_snapshot_etags(["20250106", "20250107"], "ko").keys(), {"20250107"})
+        self._translate("비빔밥", "en", "Bibimbap")
+
+        counts = build_snapshots(self.db, languages=("ko", "en"))
+        self.assertEqual(counts, {"dates": 3, "written": 3, "unchanged": 0})
+        body = json.loads(self.db.get_snapshots(["20250107"], "en")["20250107"][1])
+        self.assertEqual(body["lunch"][0]["name"], "Bibimbap")
+        self.assertEqual(json.loads(self.db.get_snapshots(["20250106"], "ko")["20250106"][1])["lunch"][0]["name"],
+                         "된장찌개")
+
+    def test_rebuilds_dates_of_updated_translation(self):
+        """기존 번역이 바뀌면(같은 rowid로 갱신) 그 번역을 쓰는 날짜를 다시 만듦"""
+        self._translate("비빔밥", "en", "Mixed Rice")
+        build_snapshots(self.db, languages=("en",))
+        conn = self.db._get_connection()
+        with conn:
+            conn.execute("""
+                INSERT INTO menu_translations (menu_name, language, translated_name, created_at) VALUES (?, ?, ?, '')
+                ON CONFLICT(menu_name, language) DO UPDATE SET translated_name = excluded.translated_name
+            """, ("비빔밥", "en", "Bibimbap"))
+
+        counts = build_snapshots(self.db, languages=("en",))
+        self.assertEqual(counts, {"dates": 1, "written": 1, "unchanged": 0})
+        body = json.loads(self.db.get_snapshots(["20250107"], "en")["20250107"][1])
+        self.assertEqual(body["lunch"][0]["name"], "Bibimbap")
+
+    def test_server_reads_snapshots(self):
+        """API 서버는 스냅샷이 있으면 그대로 응답하고, 없는 날짜는 직접 조회"""
+        build_snapshots(self.db, languages=("en",))
+        # 스냅샷에서 읽었는지 알 수 있도록 본문을 바꿔 둠
+        self.db.save_snapshots("en", [("20250106", "etag", b'{"snapshot": true}')])
+        server = MenuApiServer(("127.0.0.1", 0), self.db, workers=1)
+        try:
+            self.assertEqual(server.get_day_menu("20250106", "en").body, b'{"snapshot": true}')
+            # 사업장을 지정하거나 날짜 형식이 다르면 직접 조회
+            self.assertEqual(json.loads(server.get_day_menu("2025-01-06", "en").body)["date"], "2025-01-06")
+
+            week = json.loads(server.get_week_menu("20250106", "en").body)
+            self.assertEqual([day.get("date") for day in week["days"]],
+                             [None, "20250107", "20250108", "20250109", "20250110"])
+            self.assertEqual(week["days"][0], {"snapshot": True})
+            self.assertEqual(week["days"][2]["lunch"], [])
+            self.assertEqual(week["days"][1], json.loads(render_day(
+                "20250107", self.db.get_menu_by_date("20250107", "en"), "en")))
+        finally:
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
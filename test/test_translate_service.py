@@ -0,0 +1,256 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from conftest import make_menu, FakeCompletions
+from db_manager import MenuDatabase
+from translate_service import TranslationService, TranslationCache, LANGUAGES, plan_batches, completion_token_limit
+
+
+class TestTranslationService(unittest.TestCase):
+    def setUp(self):
+        """임시 데이터베이스와 가짜 API 클라이언트로 번역 서비스 생성"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "menu.db")
+        self.env = mock.patch.dict(os.environ, {"DEEPSEEK_API_KEY": "test-key", "DB_PATH": self.db_path})
+        self.env.start()
+        MenuDatabase(self.db_path).close()
+        self.service = TranslationService()
+        self.completions = FakeCompletions()
+        self.service.client = SimpleNamespace(chat=SimpleNamespace(completions=self.completions))
+        # 용어집 없이 모든 이름을 API로 보냄 (용어집은 test_glossary.py)
+        self.service.glossary = None
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def _translations(self):
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("SELECT menu_name, language, translated_name FROM menu_translations").fetchall()
+        return {(name, lang): translated for name, lang, translated in rows}
+
+    def test_translate_pending_concurrently(self):
+        """누락된 번역만 요청하고 저장"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT INTO menu_translations VALUES ('김치찌개', 'en', 'Kimchi Stew', NULL, '', NULL, NULL)")
+
+        pending = self.service.find_missing_translations(["김치찌개", "비빔밥"], ["en", "zh"])
+        self.assertEqual(pending, {"김치찌개": ["zh"], "비빔밥": ["en", "zh"]})
+
+        counts = self.service.translate_pending(pending, concurrency=3)
+        self.assertEqual(counts["failed"], 0)
+        translations = self._translations()
+        self.assertEqual(translations[("김치찌개", "en")], "Kimchi Stew")
+        self.assertEqual(translations[("김치찌개", "zh")], "T(김치찌개)")
+        self.assertEqual(translations[("비빔밥", "zh")], "zh(비빔밥)")
+        self.assertEqual(len(translations), 4)
+
+    def test_batches_requeue_missing_items(self):
+        """여러 메뉴를 한 번에 요청하고, 응답에서 빠진 메뉴만 다시 요청"""
+        names = [f"메뉴{i}" for i in range(10)]
+        self.completions.drop_once = {"메뉴3"}
+        counts = self.service.translate_pending({name: ["en"] for name in names})
+        self.assertEqual(counts, {"translated": 10, "failed": 0, "requests": 2})
+        self.assertEqual(len(self.completions.calls), 2)
+        self.assertEqual(self._translations()[("메뉴3", "en")], "T(메뉴3)")
+
+    def test_multi_target_falls_back_for_gaps(self):
+        """한 번의 요청으로 모든 언어를 받고, 빠진 언어만 개별 요청"""
+        names = ["비빔밥", "제육볶음", "된장찌개"]
+        self.completions.drop_lang_once = {("제육볶음", "sv")}
+        counts = self.service.translate_pending({name: ["en", "zh", "sv"] for name in names})
+        self.assertEqual(counts, {"translated": 9, "failed": 0, "requests": 2})
+        translations = self._translations()
+        self.assertEqual(translations[("된장찌개", "sv")], "sv(된장찌개)")
+        self.assertEqual(translations[("제육볶음", "sv")], "T(제육볶음)")
+
+        calls = [call["messages"][-1]["content"] for call in self.completions.calls]
+        self.assertIn("must contain the keys", calls[0])
+        self.assertNotIn("must contain the keys", calls[1])
+
+    def test_run_sees_parts_translated_by_other_process(self):
+        """이전 실행에서 번역이 없던 이름도 다른 프로세스가 번역했으면 다시 요청하지 않음"""
+        self.assertEqual(self.service.find_missing_translations(["우동"], LANGUAGES), {"우동": LANGUAGES})
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany("INSERT INTO menu_translations VALUES ('우동', ?, 'Udon', NULL, '', NULL, NULL)",
+                             [(lang,) for lang in LANGUAGES])
+        with MenuDatabase(self.db_path) as db:
+            db.insert_menu_batch([make_menu("20250106", name="돈까스/우동", subs=())])
+        self.service.translate_new()
+        requested = [call["messages"][-1]["content"] for call in self.completions.calls]
+        self.assertTrue(all("우동" not in prompt for prompt in requested))
+        self.assertEqual(self._translations()[("돈까스/우동", "en")], "en(돈까스) / Udon")
+
+    def test_plan_batches(self):
+        """배치는 항목 수와 토큰 예산을 넘지 않음"""
+        names = [f"메뉴{i}" for i in range(45)]
+        batches = plan_batches(names, max_items=20)
+        self.assertEqual([len(batch) for batch in batches], [20, 20, 5])
+        self.assertEqual(sum(batches, []), names)
+        self.assertEqual(len(plan_batches(names, token_budget=500)[0]), 5)
+        self.assertGreater(completion_token_limit(batches[0]), completion_token_limit(batches[2]))
+
+    def test_translate_new_only_scans_added_menus(self):
+        """두 번째 실행에서는 새로 추가된 메뉴 이름만 번역"""
+        db = MenuDatabase(self.db_path)
+        db.insert_menu_batch([make_menu("20250106", name="김치찌개", subs=["쌀밥", "1/2"])])
+        counts = self.service.translate_new(multi_target=False)
+        self.assertEqual(counts["names"], 2)
+        self.assertEqual(self.service.get_high_water_mark()[:2], (1, 2))
+
+        db.insert_menu_batch([make_menu("20250107", name="비빔밥", subs=["쌀밥"])])
+        db.close()
+        pending = self.service.find_untranslated(["en"], self.service.get_high_water_mark())
+        self.assertEqual(pending, {"비빔밥": ["en"]})
+
+        calls = len(self.completions.calls)
+        counts = self.service.translate_new(multi_target=False)
+        self.assertEqual(counts["names"], 1)
+        self.assertEqual(len(self.completions.calls) - calls, 3)
+        self.assertEqual(self._translations()[("비빔밥", "sv")], "T(비빔밥)")
+
+        # 이미 저장된 메뉴가 바뀌면 (ID는 그대로) 다음 실행에서 번역
+        with MenuDatabase(self.db_path) as db:
+            db.insert_menu_batch([make_menu("20250106", name="된장찌개", subs=["쌀밥", "1/2"])])
+        self.assertEqual(self.service.translate_new(multi_target=False)["names"], 1)
+        self.assertEqual(self._translations()[("된장찌개", "en")], "T(된장찌개)")
+
+    def test_stream_saves_items_as_they_arrive(self):
+        """스트리밍 응답은 객체가 닫히는 대로 저장하고, 잘린 응답에서 빠진 메뉴만 다시 요청"""
+        persisted_early = []
+        requested = []
+
+        def is_saved(name):
+            with sqlite3.connect(self.db_path) as conn:
+                return conn.execute("SELECT 1 FROM menu_translations WHERE menu_name = ?", (name,)).fetchone()
+
+        def chunk(text, finish_reason=None):
+            return SimpleNamespace(usage=None, choices=[
+                SimpleNamespace(delta=SimpleNamespace(content=text), finish_reason=finish_reason)])
+
+        def create(**kwargs):
+            self.assertTrue(kwargs["stream"])
+            prompt = kwargs["messages"][-1]["content"]
+            items = json.loads(prompt[prompt.rindex("["):])
+            requested.append(items)
+            body = json.dumps([{"original": item, "translated": f"S({item})", "description": None}
+                               for item in items], ensure_ascii=False)
+            # 여러 메뉴를 요청하면 마지막 메뉴 중간에서 잘림
+            truncated = len(items) > 1
+            if truncated:
+                body = body[:body.rindex('{"original"') + 20]
+            first = body.index("}") + 1
+
+            def stream():
+                yield chunk(body[:first])
+                # 응답이 끝나기 전에 첫 메뉴가 저장되는지 확인
+                deadline = time.monotonic() + 5
+                while not is_saved(items[0]) and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                persisted_early.append(bool(is_saved(items[0])))
+                yield chunk(body[first:], "length" if truncated else "stop")
+            return stream()
+
+        self.service.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        self.service.stream = True
+        counts = self.service.translate_pending({name: ["en"] for name in ["비빔밥", "잡채", "제육볶음"]})
+        self.assertEqual(counts, {"translated": 3, "failed": 0, "requests": 2})
+        self.assertEqual(requested, [["비빔밥", "잡채", "제육볶음"], ["제육볶음"]])
+        self.assertEqual(persisted_early, [True, True])
+        self.assertEqual(self._translations()[("제육볶음", "en")], "S(제육볶음)")
+
+    def test_broken_stream_requeues_only_missing(self):
+        """배열 중간에서 스트림이 깨지면 받은 메뉴는 저장하고 나머지만 다시 요청"""
+        requested = []
+
+        def create(**kwargs):
+            prompt = kwargs["messages"][-1]["content"]
+            items = json.loads(prompt[prompt.rindex("["):])
+            requested.append(items)
+            body = json.dumps([{"original": item, "translated": f"S({item})", "description": None}
+                               for item in items], ensure_ascii=False)
+
+            def stream():
+                # 마지막 메뉴 중간까지 보낸 뒤 오류
+                cut = body.rindex('{"original"') + 5 if len(items) > 1 else len(body)
+                yield SimpleNamespace(usage=None, choices=[
+                    SimpleNamespace(delta=SimpleNamespace(content=body[:cut]), finish_reason=None)])
+                if cut < len(body):
+                    raise ValueError("malformed chunk")
+                yield SimpleNamespace(usage=None, choices=[
+                    SimpleNamespace(delta=SimpleNamespace(content=""), finish_reason="stop")])
+            return stream()
+
+        self.service.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        self.service.stream = True
+        counts = self.service.translate_pending({name: ["en"] for name in ["비빔밥", "잡채", "제육볶음"]})
+        self.assertEqual(counts, {"translated": 3, "failed": 0, "requests": 2})
+        self.assertEqual(requested, [["비빔밥", "잡채", "제육볶음"], ["제육볶음"]])
+
+    @mock.patch("translate_service.time.sleep")
+    def test_rate_limit_retried(self, sleep):
+        """레이트 리밋 응답은 백오프 후 재시도"""
+        self.completions.failures = 2
+        result = self.service._translate_batch(["비빔밥"], "en")
+        self.assertEqual(result[0]["translated"], "T(비빔밥)")
+        self.assertEqual(sleep.call_count, 2)
+
+
+class TestTranslationCache(unittest.TestCase):
+    def setUp(self):
+        """번역이 저장된 임시 데이터베이스 생성"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "menu.db")
+        MenuDatabase(self.db_path).close()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany("INSERT INTO menu_translations VALUES (?, ?, ?, NULL, ?, NULL, NULL)", [
+                ("쌀밥", "en", "Rice", "2025-01-01"),
+                ("김치", "en", "Kimchi", "2025-01-02"),
+                ("김치", "zh", "泡菜", "2025-01-02"),
+            ])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_get_many_resolves_misses_in_one_query(self):
+        """캐시에 없는 이름은 한 번에 조회해서 캐시에 추가"""
+        cache = TranslationCache(self.db_path)
+        result = cache.get_many(["쌀밥", "김치", "국수"], "en")
+        self.assertEqual({name: item["translated"] for name, item in result.items()}, {"쌀밥": "Rice", "김치": "Kimchi"})
+        self.assertEqual(len(cache), 2)
+
+        cache.get_many(["쌀밥"], "en")
+        self.assertEqual(cache.hits, 1)
+
+    def test_missing_names_visible_after_forget(self):
+        """번역이 없는 이름은 기억해 두지만, 다른 프로세스가 저장한 번역은 forget_missing 뒤에 보임"""
+        cache = TranslationCache(self.db_path)
+        self.assertEqual(cache.get_many(["국수"], "en"), {})
+        cache.get_many(["국수"], "en")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT INTO menu_translations VALUES ('국수', 'en', 'Noodles', NULL, '', NULL, NULL)")
+        cache.forget_missing()
+        self.assertEqual(cache.get_many(["국수"], "en")["국수"]["translated"], "Noodles")
+
+    def test_lru_eviction_and_invalidation(self):
+        """최대 크기를 넘으면 오래된 항목을 제거하고, 무효화된 항목은 다시 조회"""
+        cache = TranslationCache(self.db_path, max_size=2)
+        self.assertEqual(cache.preload(), 2)
+        self.assertEqual(len(cache), 2)
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE menu_translations SET translated_name = 'Napa Kimchi' WHERE menu_name = '김치' AND language = 'en'")
+        self.assertEqual(cache.get_many(["김치"], "en")["김치"]["translated"], "Kimchi")
+        cache.invalidate([("김치", "en")])
+        self.assertEqual(cache.get_many(["김치"], "en")["김치"]["translated"], "Napa Kimchi")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)